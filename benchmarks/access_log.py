@@ -0,0 +1,172 @@
+"""
+Пропускная способность журнала запросов: прежний LoggingMiddleware (BaseHTTPMiddleware, чтение тела,
+синхронная запись лога) против AccessLogMiddleware (чистый ASGI) с записью лога через очередь.
+
+Приложение вызывается напрямую по ASGI, без сети и сервера, так что измеряется только
+стоимость middleware и логирования. Лог пишется в os.devnull; `--write-latency-us` добавляет
+задержку на каждую запись, как у заполненного pipe или медленного сборщика логов.
+
+Запуск (БД не нужна):
+    python -m benchmarks.access_log --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.infrastructure.observability.log_pipeline import JsonFormatter, start_queue_logging, stop_queue_logging
+from src.interfaces.http.middleware.access_log import AccessLogMiddleware
+
+baseline_logger = logging.getLogger("benchmarks.baseline")
+
+
+class BaselineLoggingMiddleware(BaseHTTPMiddleware):
+    """Копия LoggingMiddleware, который был в src/app.py до перехода на AccessLogMiddleware."""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        body_str = ""
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            try:
+                body = await request.body()
+                body_str = f"| Body: {body.decode('utf-8')[:200]}" if body else ""
+
+                async def receive():
+                    return {"type": "http.request", "body": body}
+                request._receive = receive
+            except Exception:
+                body_str = "| Body: <unable to read>"
+        baseline_logger.info(
+            f"→ {request.method} {request.url.path} "
+            f"| Client: {request.client.host if request.client else 'unknown'} "
+            f"| Query: {dict(request.query_params)}"
+            f"{body_str}"
+        )
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        baseline_logger.info(
+            f"← {request.method} {request.url.path} "
+            f"| Status: {response.status_code} "
+            f"| Time: {process_time:.3f}s"
+        )
+        return response
+
+
+def _build_app(middleware, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tours")
+    async def tours(limit: int = 20):
+        return {"items": [], "limit": limit}
+
+    @app.post("/auth/magic/start")
+    async def magic_start(payload: dict):
+        return {"ok": True}
+
+    app.add_middleware(middleware, **options)
+    return app
+
+
+async def _request(app, method: str, path: str, body: bytes) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"limit=20" if method == "GET" else b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _run(app, requests: int, concurrency: int) -> float:
+    body = b'{"email": "user@example.com"}'
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(("POST", "/auth/magic/start", body) if i % 4 == 0 else ("GET", "/tours", b""))
+
+    async def worker():
+        while not queue.empty():
+            await _request(app, *queue.get_nowait())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+class _SlowStream:
+    def __init__(self, stream, latency_seconds: float) -> None:
+        self.stream = stream
+        self.latency_seconds = latency_seconds
+
+    def write(self, data: str) -> int:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _configure(logger: logging.Logger, formatter: logging.Formatter, stream) -> None:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(formatter)
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sample-2xx", type=float, default=1.0)
+    parser.add_argument("--write-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    access_logger = logging.getLogger("benchmarks.access")
+    with open(os.devnull, "w") as sink:
+        devnull = _SlowStream(sink, args.write_latency_us / 1_000_000)
+        _configure(baseline_logger, logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"), devnull)
+        _configure(access_logger, JsonFormatter(), devnull)
+
+        baseline = _build_app(BaselineLoggingMiddleware)
+        rps = asyncio.run(_run(baseline, args.requests, args.concurrency))
+        print(f"{'BaseHTTPMiddleware, sync log':<34} {rps:10.0f} req/s")
+
+        current = _build_app(AccessLogMiddleware, sample_2xx=args.sample_2xx, logger=access_logger)
+        rps = asyncio.run(_run(current, args.requests, args.concurrency))
+        print(f"{'AccessLogMiddleware, sync log':<34} {rps:10.0f} req/s")
+
+        started = start_queue_logging((access_logger.name,))
+        try:
+            rps = asyncio.run(_run(current, args.requests, args.concurrency))
+        finally:
+            stop_queue_logging(started)
+        print(f"{'AccessLogMiddleware, queued log':<34} {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Стоимость проверки access-токена на запрос: полный decode python-jose против кэша проверенных токенов.
+
+Запуск (БД не нужна):
+    python -m benchmarks.jwt_verify --tokens 100 --requests 20000
+
+`--tokens` - сколько разных пользователей (токенов) одновременно активно; каждый запрос
+проверяет случайный из них, как SPA, повторно присылающая один и тот же токен.
+"""
+import argparse
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from src.infrastructure.auth.jwt_token_service import JoseJWTTokenService
+from src.infrastructure.cache.lru_cache import LRUCache
+
+
+def _measure(service: JoseJWTTokenService, tokens, requests: int):
+    rnd = random.Random(0)
+    timings = []
+    for _ in range(requests):
+        token = rnd.choice(tokens)
+        started = time.perf_counter()
+        service.verify_access_token(token)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.95) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    params = dict(secret="benchmark", issuer="benchmark", access_ttl_minutes=30, refresh_ttl_days=30)
+    plain = JoseJWTTokenService(**params)
+    cached = JoseJWTTokenService(**params, verify_cache=LRUCache(max_size=10000))
+    tokens = [plain.issue_access_token(user_id=uuid4()) for _ in range(args.tokens)]
+
+    for title, service in (("jose decode", plain), ("verify cache", cached)):
+        avg, p50, p95 = _measure(service, tokens, args.requests)
+        print(f"{title:<14} avg={avg:8.2f}us  p50={p50:8.2f}us  p95={p95:8.2f}us")
+
+    stats = cached.verify_cache.stats()
+    print(f"cache hit ratio: {stats.hit_ratio:.3f} ({stats.hits} hits, {stats.misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
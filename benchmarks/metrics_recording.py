@@ -0,0 +1,64 @@
+"""
+Стоимость записи метрик на запрос: то, что MetricsMiddleware делает для каждого HTTP-запроса
+(gauge +1/-1, observe в гистограмму, inc счетчика статусов), против того же с threading.Lock
+вокруг каждого обновления, как в реестрах, рассчитанных на запись из нескольких потоков.
+
+Запуск (БД не нужна):
+    python -m benchmarks.metrics_recording --requests 200000
+"""
+import argparse
+import random
+import threading
+import time
+
+from src.infrastructure.observability.metrics import MetricsRegistry
+
+ROUTES = ("/tours", "/tours/{tour_id}", "/tours/aggregates", "/auth/refresh", "/users/me")
+
+
+def _record(registry: MetricsRegistry, samples, lock=None) -> float:
+    in_flight = registry.gauge("http_requests_in_flight", "")
+    duration = registry.histogram("http_request_duration_seconds", "", ("method", "route"))
+    responses = registry.counter("http_responses_total", "", ("method", "route", "status"))
+    started = time.perf_counter()
+    if lock is None:
+        for labels, value, status in samples:
+            in_flight.inc()
+            in_flight.dec()
+            duration.observe(value, labels)
+            responses.inc(labels + (status,))
+    else:
+        for labels, value, status in samples:
+            with lock:
+                in_flight.inc()
+            with lock:
+                in_flight.dec()
+            with lock:
+                duration.observe(value, labels)
+            with lock:
+                responses.inc(labels + (status,))
+    return (time.perf_counter() - started) / len(samples) * 1_000_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    samples = [
+        (("GET", rnd.choice(ROUTES)), rnd.expovariate(1 / 0.03), rnd.choice(("200", "200", "200", "404")))
+        for _ in range(args.requests)
+    ]
+    print(f"{'lock-free':<12} {_record(MetricsRegistry(), samples):8.0f} ns/request")
+    print(f"{'with lock':<12} {_record(MetricsRegistry(), samples, threading.Lock()):8.0f} ns/request")
+
+    registry = MetricsRegistry()
+    _record(registry, samples)
+    started = time.perf_counter()
+    body = registry.render()
+    print(f"render: {(time.perf_counter() - started) * 1000:.2f} ms, {len(body.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Сравнение сборки карточек туров: ORM + selectinload против одного запроса с jsonb_agg.
+
+Запуск (нужна БД с примененными миграциями и мок-данными):
+    python -m benchmarks.tour_cards --ids 20 --iterations 200
+
+Для каждого пути выводит число round trip-ов на вызов и латентность (avg / p50 / p95).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+from src.infrastructure.db.models.flights import Flights, FlightDirection
+from src.infrastructure.db.models.tours import Tours
+from src.infrastructure.db.reference_data import ReferenceData, ReferenceDataRegistry
+from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository
+from src.infrastructure.di.container import create_container
+
+
+class RoundTripCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+async def get_by_id_orm(session: AsyncSession, tour_ids: List[UUID]) -> List[TourSearchReadModel]:
+    """
+    Прежняя сборка карточек через ORM и selectinload (до семи запросов)
+    """
+    if not tour_ids:
+        return []
+
+    stmt = (
+        select(Flights)
+        .join(Flights.tour)
+        .where(Flights.id.in_(tour_ids), Tours.is_published)
+        .options(
+            selectinload(Flights.tour).selectinload(Tours.type),
+            selectinload(Flights.tour).selectinload(Tours.tarif),
+            selectinload(Flights.tour).selectinload(Tours.price_currency),
+            selectinload(Flights.tour).selectinload(Tours.hotels),
+            selectinload(Flights.availability_status),
+            selectinload(Flights.directions).selectinload(FlightDirection.flight_nodes),
+        )
+    )
+    result = await session.execute(stmt)
+    flights = result.scalars().unique().all()
+
+    # Используем ту же логику, что и в search для создания read model
+    return [
+        TourSearchReadModel(
+            id=flight.id,
+            operator_name=flight.tour.operator_name,
+            operator_logo=flight.tour.operator_logo,
+            operator_foundation_year=flight.tour.operator_foundation_year,
+            operator_verified=flight.tour.operator_verified,
+            operator_features=flight.tour.operator_features,
+            title=flight.tour.title,
+            type=flight.tour.type.value,  # Получаем значение через relationship
+            tarif=flight.tour.tarif.value,  # Получаем значение через relationship
+            price=int(flight.price),
+            original_price=None,
+            duration=flight.tour.duration,
+            location=flight.tour.location,
+            visa_included=flight.tour.visa_included,
+            availability=flight.availability_status.value,  # Получаем значение через relationship
+            flights=[
+                {
+                    "id": direction.id,
+                    "direction": direction.direction,
+                    "departure_date": direction.departure_date,
+                    "inclusions": direction.inclusions,
+                    "nodes": [
+                        {
+                            "id": node.id,
+                            "iata": node.iata,
+                            "city": node.city,
+                            "layover_minutes": node.layover_minutes,
+                        }
+                        for node in direction.flight_nodes
+                    ],
+                }
+                for direction in flight.directions
+            ],
+            hotels=[
+                {
+                    "id": hotel.id,
+                    "city": hotel.city,
+                    "name": hotel.name,
+                    "stars": hotel.stars,
+                    "rating": hotel.rating,
+                    "reviews_count": hotel.reviews_count,
+                    "distance_text": hotel.distance_text,
+                    "maps_url": hotel.maps_url,
+                    "amenities": hotel.amenities,
+                }
+                for hotel in flight.tour.hotels
+            ],
+        ) for flight in flights
+    ]
+
+
+async def get_by_id(session: AsyncSession, reference: ReferenceData, tour_ids: List[UUID]) -> List[TourSearchReadModel]:
+    return await SqlAlchemyTourRepository(session, reference).get_by_id(tour_ids)
+
+
+PATHS = (
+    ("orm/selectin", lambda session, reference, ids: get_by_id_orm(session, ids)),
+    ("jsonb_agg", get_by_id),
+)
+
+
+async def _measure(
+    session_factory, reference: ReferenceData, counter: RoundTripCounter, fetch, ids, iterations: int
+):
+    timings = []
+    round_trips = []
+    for _ in range(iterations):
+        async with session_factory() as session:
+            counter.count = 0
+            started = time.perf_counter()
+            await fetch(session, reference, ids)
+            timings.append((time.perf_counter() - started) * 1000)
+            round_trips.append(counter.count)
+    timings.sort()
+    return {
+        "round_trips": statistics.mean(round_trips),
+        "avg_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+async def main(ids_count: int, iterations: int) -> None:
+    container = create_container()
+    engine = await container.get(AsyncEngine)
+    session_factory = await container.get(async_sessionmaker[AsyncSession])
+    reference = await (await container.get(ReferenceDataRegistry)).reload()
+    counter = RoundTripCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    async with session_factory() as session:
+        ids = list((await session.execute(select(Flights.id).limit(ids_count))).scalars().all())
+
+    # Прогрев обоих путей (кэш планов, соединения в пуле)
+    for _, fetch in PATHS:
+        await _measure(session_factory, reference, counter, fetch, ids, 5)
+
+    print(f"flights per call: {len(ids)}, iterations: {iterations}")
+    print(f"{'path':<16}{'round trips':>12}{'avg ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for title, fetch in PATHS:
+        res = await _measure(session_factory, reference, counter, fetch, ids, iterations)
+        print(
+            f"{title:<16}{res['round_trips']:>12.1f}{res['avg_ms']:>10.2f}"
+            f"{res['p50_ms']:>10.2f}{res['p95_ms']:>10.2f}"
+        )
+
+    await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=20, help="Количество вылетов в одном вызове")
+    parser.add_argument("--iterations", type=int, default=200, help="Количество замеров на каждый путь")
+    args = parser.parse_args()
+    asyncio.run(main(args.ids, args.iterations))
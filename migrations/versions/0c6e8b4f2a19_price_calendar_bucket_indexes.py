@@ -0,0 +1,36 @@
+"""price_calendar_bucket_indexes
+
+Revision ID: 0c6e8b4f2a19
+Revises: f5a8c3d7e912
+Create Date: 2026-10-18 10:58:26.114702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6e8b4f2a19'
+down_revision: Union[str, None] = 'f5a8c3d7e912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Выражения должны совпадать с _calendar_bucket в tour_repo (date_trunc от timestamp - IMMUTABLE)
+    for granularity in ('week', 'month'):
+        op.create_index(
+            f'ix_tour_price_calendar_daily_{granularity}',
+            'tour_price_calendar_daily',
+            [sa.text(f"date_trunc('{granularity}', CAST(day AS TIMESTAMP WITHOUT TIME ZONE))")],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for granularity in ('month', 'week'):
+        op.drop_index(f'ix_tour_price_calendar_daily_{granularity}', table_name='tour_price_calendar_daily')
@@ -0,0 +1,55 @@
+"""search_projection_refresh_locks
+
+Revision ID: 0ec92afa74c6
+Revises: 3e7b9c1d5a24
+Create Date: 2026-10-18 16:21:07.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ec92afa74c6'
+down_revision: Union[str, None] = '3e7b9c1d5a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Пересборка (DELETE + INSERT) без блокировок гоняется между конкурентными триггерами:
+# обе транзакции удаляют строку вылета, обе вставляют - вторая падает на первичном ключе
+# или оставляет устаревшую карточку. Тело пересборки остается прежним (переименовано),
+# а tour_search_projection_refresh сначала берет блокировки:
+#  - по вылетам - advisory-блокировки транзакции в порядке id (как в tour_price_calendar_refresh);
+#    после ожидания следующий оператор (READ COMMITTED) видит зафиксированную соседом строку;
+#  - полная пересборка (NULL) - блокировка таблицы, несовместимая с записью в нее.
+REFRESH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_search_projection_refresh(p_flight_ids uuid[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_flight_ids IS NULL THEN
+        LOCK TABLE tour_search_projection IN SHARE ROW EXCLUSIVE MODE;
+    ELSE
+        PERFORM pg_advisory_xact_lock(hashtextextended(id::text, 0))
+        FROM (SELECT DISTINCT id FROM unnest(p_flight_ids) AS id WHERE id IS NOT NULL ORDER BY id) AS s;
+    END IF;
+
+    RETURN tour_search_projection_rebuild(p_flight_ids);
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER FUNCTION tour_search_projection_refresh(uuid[]) RENAME TO tour_search_projection_rebuild")
+    op.execute(REFRESH_FUNCTION_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS tour_search_projection_refresh(uuid[])")
+    op.execute("ALTER FUNCTION tour_search_projection_rebuild(uuid[]) RENAME TO tour_search_projection_refresh")
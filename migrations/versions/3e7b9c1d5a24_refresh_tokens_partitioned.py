@@ -0,0 +1,128 @@
+"""refresh_tokens_partitioned
+
+Revision ID: 3e7b9c1d5a24
+Revises: 0c6e8b4f2a19
+Create Date: 2026-10-18 13:42:10.507311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7b9c1d5a24'
+down_revision: Union[str, None] = '0c6e8b4f2a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Месячные партиции refresh_tokens_pYYYY_MM с границами по UTC; возвращает число созданных
+ENSURE_PARTITIONS_SQL = """
+CREATE OR REPLACE FUNCTION refresh_tokens_ensure_partitions(from_month date, to_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= to_month LOOP
+        partition_name := 'refresh_tokens_p' || to_char(month_start, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF refresh_tokens FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start::timestamp AT TIME ZONE 'UTC',
+                (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+
+def _create_refresh_tokens(partitioned: bool) -> None:
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', PG_UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', PG_UUID(as_uuid=True), nullable=False),
+        sa.Column('token_hash', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('request_ip', sa.String(), nullable=True),
+        sa.Column('user_agent', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        # Уникальность на партиционированной таблице должна включать ключ партиционирования
+        sa.PrimaryKeyConstraint(*(('id', 'expires_at') if partitioned else ('id',))),
+        **({'postgresql_partition_by': 'RANGE (expires_at)'} if partitioned else {}),
+    )
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index('ix_refresh_tokens_created_at', 'refresh_tokens', ['created_at'], unique=False)
+    op.create_index(
+        'ux_refresh_tokens_hash',
+        'refresh_tokens',
+        ['token_hash', 'expires_at'] if partitioned else ['token_hash'],
+        unique=True,
+    )
+
+
+def _detach_old_table(old_name: str) -> None:
+    op.rename_table('refresh_tokens', old_name)
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT refresh_tokens_pkey TO {old_name}_pkey')
+    for index in ('ix_refresh_tokens_user_id', 'ix_refresh_tokens_expires_at', 'ix_refresh_tokens_created_at', 'ux_refresh_tokens_hash'):
+        op.drop_index(index, table_name=old_name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _detach_old_table('refresh_tokens_unpartitioned')
+    _create_refresh_tokens(partitioned=True)
+    op.execute(ENSURE_PARTITIONS_SQL)
+
+    # Партиции под существующие токены и на несколько месяцев вперед; дальше их создает janitor
+    op.execute(
+        """
+        SELECT refresh_tokens_ensure_partitions(
+            LEAST(
+                COALESCE((SELECT min(expires_at AT TIME ZONE 'UTC')::date FROM refresh_tokens_unpartitioned), current_date),
+                current_date
+            ),
+            GREATEST(
+                COALESCE((SELECT max(expires_at AT TIME ZONE 'UTC')::date FROM refresh_tokens_unpartitioned), current_date),
+                (current_date + interval '3 months')::date
+            )
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO refresh_tokens (id, user_id, token_hash, expires_at, created_at, used_at, request_ip, user_agent)
+        SELECT id, user_id, token_hash, expires_at, created_at, used_at, request_ip, user_agent
+        FROM refresh_tokens_unpartitioned
+        """
+    )
+    op.drop_table('refresh_tokens_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _detach_old_table('refresh_tokens_partitioned')
+    _create_refresh_tokens(partitioned=False)
+    op.execute(
+        """
+        INSERT INTO refresh_tokens (id, user_id, token_hash, expires_at, created_at, used_at, request_ip, user_agent)
+        SELECT id, user_id, token_hash, expires_at, created_at, used_at, request_ip, user_agent
+        FROM refresh_tokens_partitioned
+        """
+    )
+    op.drop_table('refresh_tokens_partitioned')
+    op.execute('DROP FUNCTION refresh_tokens_ensure_partitions(date, date)')
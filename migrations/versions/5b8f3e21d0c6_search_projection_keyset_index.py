@@ -0,0 +1,36 @@
+"""search_projection_keyset_index
+
+Revision ID: 5b8f3e21d0c6
+Revises: c71e0a9d2f34
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f3e21d0c6'
+down_revision: Union[str, None] = 'c71e0a9d2f34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Составной индекс под сортировку (departure_date, flight_id) и keyset-пагинацию;
+    # одиночный индекс по departure_date им покрывается
+    op.create_index(
+        'ix_tour_search_projection_departure_date_flight_id',
+        'tour_search_projection',
+        ['departure_date', 'flight_id'],
+        unique=False,
+    )
+    op.drop_index('ix_tour_search_projection_departure_date', table_name='tour_search_projection')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tour_search_projection_departure_date', 'tour_search_projection', ['departure_date'], unique=False)
+    op.drop_index('ix_tour_search_projection_departure_date_flight_id', table_name='tour_search_projection')
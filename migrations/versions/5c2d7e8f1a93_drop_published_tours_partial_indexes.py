@@ -0,0 +1,52 @@
+"""drop_published_tours_partial_indexes
+
+Revision ID: 5c2d7e8f1a93
+Revises: b3e85d1f0c69
+Create Date: 2026-10-18 19:40:12.584317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d7e8f1a93'
+down_revision: Union[str, None] = 'b3e85d1f0c69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Частичные индексы из d94e2b6c1f30 остались без читателей: поиск читает tour_search_projection
+# (черновики отсекает ее пересборка), сводка - tour_price_calendar_daily, а карточки по ID
+# идут по первичному ключу flights. Без читателей они только замедляют запись в tours.
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tours_published_operator_id', table_name='tours', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tours_published', table_name='tours', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tours_published',
+            'tours',
+            ['id'],
+            unique=False,
+            postgresql_include=['type_id', 'tarif_id', 'operator_id'],
+            postgresql_where=sa.text('is_published'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tours_published_operator_id',
+            'tours',
+            ['operator_id'],
+            unique=False,
+            postgresql_where=sa.text('is_published'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
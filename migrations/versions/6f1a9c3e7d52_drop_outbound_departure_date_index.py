@@ -0,0 +1,44 @@
+"""drop_outbound_departure_date_index
+
+Revision ID: 6f1a9c3e7d52
+Revises: 8d2f6a0b4c17
+Create Date: 2026-10-18 17:30:48.215634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1a9c3e7d52'
+down_revision: Union[str, None] = '8d2f6a0b4c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Индекс обслуживал сводку цен по flight_directions; сводка теперь читает tour_price_calendar_daily,
+# а проекция берет первый outbound по ix_flight_directions_flight_id_direction_departure_date.
+# Без читателей он только замедляет запись в flight_directions.
+INDEX_NAME = 'ix_flight_directions_outbound_departure_date'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='flight_directions', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            'flight_directions',
+            ['departure_date', 'flight_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("direction = 'outbound'"),
+            if_not_exists=True,
+        )
@@ -0,0 +1,38 @@
+"""tours_catalog_version
+
+Revision ID: 7a0c5e93d4f1
+Revises: e2d94c7a1b58
+Create Date: 2026-10-17 14:02:51.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a0c5e93d4f1'
+down_revision: Union[str, None] = 'e2d94c7a1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Любое изменение проекции поиска (а значит туров, вылетов, перелетов и отелей,
+    # см. триггеры tour_search_projection_sync) увеличивает версию каталога `catalog`,
+    # по которой сбрасываются кэши выдачи
+    op.execute(
+        """
+        CREATE TRIGGER trg_tour_search_projection_catalog_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tour_search_projection
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('catalog')
+        """
+    )
+    op.execute("INSERT INTO catalog_versions (name, version) VALUES ('catalog', 1) ON CONFLICT (name) DO NOTHING")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_tour_search_projection_catalog_version ON tour_search_projection")
+    op.execute("DELETE FROM catalog_versions WHERE name = 'catalog'")
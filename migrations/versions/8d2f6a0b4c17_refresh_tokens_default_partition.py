@@ -0,0 +1,133 @@
+"""refresh_tokens_default_partition
+
+Revision ID: 8d2f6a0b4c17
+Revises: 0ec92afa74c6
+Create Date: 2026-10-18 16:54:32.960184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a0b4c17'
+down_revision: Union[str, None] = '0ec92afa74c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Месячные партиции refresh_tokens_pYYYY_MM с границами по UTC; возвращает число созданных.
+# - Одновременный вызов из нескольких воркеров: партицию, созданную соседом, пропускаем
+#   (duplicate_table, а в гонке каталога - unique_violation по pg_type).
+# - Строки, попавшие в DEFAULT-партицию за месяц, для которого партиции еще не было,
+#   переносятся в новую партицию перед ATTACH (иначе ее создание упадет на проверке DEFAULT).
+ENSURE_PARTITIONS_SQL = """
+CREATE OR REPLACE FUNCTION refresh_tokens_ensure_partitions(from_month date, to_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    partition_name text;
+    lower_bound timestamptz;
+    upper_bound timestamptz;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= to_month LOOP
+        partition_name := 'refresh_tokens_p' || to_char(month_start, 'YYYY_MM');
+        lower_bound := month_start::timestamp AT TIME ZONE 'UTC';
+        upper_bound := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+        IF to_regclass(partition_name) IS NULL THEN
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM refresh_tokens_default
+                    WHERE expires_at >= lower_bound AND expires_at < upper_bound
+                ) THEN
+                    EXECUTE format('CREATE TABLE %I (LIKE refresh_tokens INCLUDING DEFAULTS)', partition_name);
+                    EXECUTE format(
+                        'WITH moved AS (
+                             DELETE FROM refresh_tokens_default
+                             WHERE expires_at >= %L AND expires_at < %L
+                             RETURNING *
+                         )
+                         INSERT INTO %I SELECT * FROM moved',
+                        lower_bound, upper_bound, partition_name
+                    );
+                    EXECUTE format(
+                        'ALTER TABLE refresh_tokens ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, lower_bound, upper_bound
+                    );
+                ELSE
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF refresh_tokens FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, lower_bound, upper_bound
+                    );
+                END IF;
+                created := created + 1;
+            EXCEPTION WHEN duplicate_table OR unique_violation THEN
+                NULL;
+            END;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+# Прежняя версия функции (для downgrade)
+OLD_ENSURE_PARTITIONS_SQL = """
+CREATE OR REPLACE FUNCTION refresh_tokens_ensure_partitions(from_month date, to_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= to_month LOOP
+        partition_name := 'refresh_tokens_p' || to_char(month_start, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF refresh_tokens FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start::timestamp AT TIME ZONE 'UTC',
+                (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Страховка на случай, если janitor не успел создать партицию месяца: вставка токена не падает
+    op.execute('CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT')
+    op.execute(ENSURE_PARTITIONS_SQL)
+    op.execute(
+        "SELECT refresh_tokens_ensure_partitions(current_date, (current_date + interval '3 months')::date)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(OLD_ENSURE_PARTITIONS_SQL)
+    # Без DEFAULT-партиции ее строкам негде жить: отсоединяем, создаем партиции их месяцев и переносим
+    op.execute('ALTER TABLE refresh_tokens DETACH PARTITION refresh_tokens_default')
+    op.execute(
+        """
+        SELECT refresh_tokens_ensure_partitions(
+            min(expires_at AT TIME ZONE 'UTC')::date,
+            max(expires_at AT TIME ZONE 'UTC')::date
+        )
+        FROM refresh_tokens_default
+        HAVING count(*) > 0
+        """
+    )
+    op.execute('INSERT INTO refresh_tokens SELECT * FROM refresh_tokens_default')
+    op.execute('DROP TABLE refresh_tokens_default')
@@ -0,0 +1,169 @@
+"""search_projection_reference_sync
+
+Revision ID: b3e85d1f0c69
+Revises: 6f1a9c3e7d52
+Create Date: 2026-10-18 19:12:40.731206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e85d1f0c69'
+down_revision: Union[str, None] = '6f1a9c3e7d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# В проекции денормализованы type_value, tarif_value/tarif_label и availability_value:
+# переименование значения в справочнике должно пересобирать строки затронутых вылетов,
+# иначе поиск фильтрует и отдает устаревшие значения. Вставка строки справочника
+# проекцию не меняет, а удаление используемой строки запрещает внешний ключ,
+# поэтому триггеры справочников срабатывают только на UPDATE.
+REFERENCE_SYNC_TABLES = ('tour_types', 'tour_tarifs', 'availability')
+
+SYNC_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_search_projection_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    old_row jsonb;
+    new_row jsonb;
+    flight_ids uuid[];
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_TABLE_NAME = 'flights' THEN
+        flight_ids := ARRAY[(old_row->>'id')::uuid, (new_row->>'id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_directions' THEN
+        flight_ids := ARRAY[(old_row->>'flight_id')::uuid, (new_row->>'flight_id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_layovers' THEN
+        flight_ids := ARRAY(
+            SELECT d.flight_id
+            FROM flight_directions d
+            WHERE d.id IN ((old_row->>'flight_direction_id')::int, (new_row->>'flight_direction_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'hotels' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'tour_id')::int, (new_row->>'tour_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'tours' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'tour_types' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            JOIN tours t ON t.id = f.tour_id
+            WHERE t.type_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'tour_tarifs' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            JOIN tours t ON t.id = f.tour_id
+            WHERE t.tarif_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'availability' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.availability_status_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    END IF;
+
+    IF flight_ids IS NOT NULL AND cardinality(flight_ids) > 0 THEN
+        PERFORM tour_search_projection_refresh(flight_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# Прежняя версия функции (для downgrade)
+OLD_SYNC_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_search_projection_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    old_row jsonb;
+    new_row jsonb;
+    flight_ids uuid[];
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_TABLE_NAME = 'flights' THEN
+        flight_ids := ARRAY[(old_row->>'id')::uuid, (new_row->>'id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_directions' THEN
+        flight_ids := ARRAY[(old_row->>'flight_id')::uuid, (new_row->>'flight_id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_layovers' THEN
+        flight_ids := ARRAY(
+            SELECT d.flight_id
+            FROM flight_directions d
+            WHERE d.id IN ((old_row->>'flight_direction_id')::int, (new_row->>'flight_direction_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'hotels' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'tour_id')::int, (new_row->>'tour_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'tours' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    END IF;
+
+    IF flight_ids IS NOT NULL AND cardinality(flight_ids) > 0 THEN
+        PERFORM tour_search_projection_refresh(flight_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(SYNC_FUNCTION_SQL)
+
+    for table in REFERENCE_SYNC_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_search_projection
+            AFTER UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION tour_search_projection_sync()
+            """
+        )
+
+    # Значения, переименованные до появления триггеров
+    op.execute("SELECT tour_search_projection_refresh(NULL)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in REFERENCE_SYNC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_projection ON {table}")
+
+    op.execute(OLD_SYNC_FUNCTION_SQL)
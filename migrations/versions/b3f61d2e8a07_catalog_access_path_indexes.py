@@ -0,0 +1,57 @@
+"""catalog_access_path_indexes
+
+Revision ID: b3f61d2e8a07
+Revises: 7a0c5e93d4f1
+Create Date: 2026-10-17 15:20:13.902447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f61d2e8a07'
+down_revision: Union[str, None] = '7a0c5e93d4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя, таблица, колонки, условие частичного индекса)
+INDEXES = (
+    # Карточки (by_ids) и проекция поиска: перелеты вылета, первый outbound по дате (LATERAL)
+    ('ix_flight_directions_flight_id_direction_departure_date', 'flight_directions',
+     ['flight_id', 'direction', 'departure_date'], None),
+    # Точки перелета по направлению (+ город первой точки для проекции)
+    ('ix_flight_layovers_flight_direction_id_city', 'flight_layovers', ['flight_direction_id', 'city'], None),
+    ('ix_flights_tour_id', 'flights', ['tour_id'], None),
+    ('ix_flights_availability_status_id', 'flights', ['availability_status_id'], None),
+    ('ix_hotels_tour_id', 'hotels', ['tour_id'], None),
+    # Сводка цен (/tours/aggregates): диапазон дат только по outbound
+    ('ix_flight_directions_outbound_departure_date', 'flight_directions',
+     ['departure_date', 'flight_id'], "direction = 'outbound'"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY не работает внутри транзакции и не блокирует запись в таблицы
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
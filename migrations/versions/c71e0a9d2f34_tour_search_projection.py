@@ -0,0 +1,243 @@
+"""tour_search_projection
+
+Revision ID: c71e0a9d2f34
+Revises: a4b3548eb075
+Create Date: 2026-10-17 10:12:41.118206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e0a9d2f34'
+down_revision: Union[str, None] = 'a4b3548eb075'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Таблицы, изменение которых должно обновлять проекцию
+SYNC_TABLES = ('tours', 'flights', 'flight_directions', 'flight_layovers', 'hotels')
+
+
+# Пересборка проекции для указанных вылетов (NULL - для всех вылетов)
+REFRESH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_search_projection_refresh(p_flight_ids uuid[] DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    affected integer;
+BEGIN
+    IF p_flight_ids IS NULL THEN
+        DELETE FROM tour_search_projection;
+    ELSE
+        DELETE FROM tour_search_projection WHERE flight_id = ANY(p_flight_ids);
+    END IF;
+
+    INSERT INTO tour_search_projection (
+        flight_id, tour_id, operator_id,
+        type_id, type_value,
+        tarif_id, tarif_value, tarif_label,
+        availability_status_id, availability_value,
+        price, departure_date, departure_city,
+        card, refreshed_at
+    )
+    SELECT
+        f.id, t.id, t.operator_id,
+        t.type_id, tt.value,
+        t.tarif_id, tr.value, tr.label,
+        f.availability_status_id, a.value,
+        f.price, outbound.departure_date, outbound.departure_city,
+        jsonb_build_object(
+            'operator_name', t.operator_name,
+            'operator_logo', t.operator_logo,
+            'operator_foundation_year', t.operator_foundation_year,
+            'operator_verified', t.operator_verified,
+            'operator_features', t.operator_features,
+            'title', t.title,
+            'duration', t.duration,
+            'location', t.location,
+            'visa_included', t.visa_included,
+            'flights', COALESCE((
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', d.id,
+                        'direction', d.direction,
+                        'departure_date', d.departure_date,
+                        'inclusions', d.inclusions,
+                        'nodes', COALESCE((
+                            SELECT jsonb_agg(
+                                jsonb_build_object(
+                                    'id', n.id,
+                                    'iata', n.iata,
+                                    'city', n.city,
+                                    'layover_minutes', n.layover_minutes
+                                ) ORDER BY n.id
+                            )
+                            FROM flight_layovers n
+                            WHERE n.flight_direction_id = d.id
+                        ), '[]'::jsonb)
+                    ) ORDER BY d.id
+                )
+                FROM flight_directions d
+                WHERE d.flight_id = f.id
+            ), '[]'::jsonb),
+            'hotels', COALESCE((
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', h.id,
+                        'city', h.city,
+                        'name', h.name,
+                        'stars', h.stars,
+                        'rating', h.rating,
+                        'reviews_count', h.reviews_count,
+                        'distance_text', h.distance_text,
+                        'maps_url', h.maps_url,
+                        'amenities', h.amenities
+                    ) ORDER BY h.id
+                )
+                FROM hotels h
+                WHERE h.tour_id = t.id
+            ), '[]'::jsonb)
+        ),
+        now()
+    FROM flights f
+    JOIN tours t ON t.id = f.tour_id
+    JOIN tour_types tt ON tt.id = t.type_id
+    JOIN tour_tarifs tr ON tr.id = t.tarif_id
+    JOIN availability a ON a.id = f.availability_status_id
+    JOIN LATERAL (
+        SELECT
+            d.departure_date,
+            (
+                SELECT n.city
+                FROM flight_layovers n
+                WHERE n.flight_direction_id = d.id
+                ORDER BY n.id
+                LIMIT 1
+            ) AS departure_city
+        FROM flight_directions d
+        WHERE d.flight_id = f.id AND d.direction = 'outbound'
+        ORDER BY d.departure_date, d.id
+        LIMIT 1
+    ) outbound ON true
+    WHERE t.is_published
+      AND (p_flight_ids IS NULL OR f.id = ANY(p_flight_ids));
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$;
+"""
+
+# Триггерная функция: определяет затронутые вылеты по таблице-источнику
+SYNC_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_search_projection_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    old_row jsonb;
+    new_row jsonb;
+    flight_ids uuid[];
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_TABLE_NAME = 'flights' THEN
+        flight_ids := ARRAY[(old_row->>'id')::uuid, (new_row->>'id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_directions' THEN
+        flight_ids := ARRAY[(old_row->>'flight_id')::uuid, (new_row->>'flight_id')::uuid];
+    ELSIF TG_TABLE_NAME = 'flight_layovers' THEN
+        flight_ids := ARRAY(
+            SELECT d.flight_id
+            FROM flight_directions d
+            WHERE d.id IN ((old_row->>'flight_direction_id')::int, (new_row->>'flight_direction_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'hotels' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'tour_id')::int, (new_row->>'tour_id')::int)
+        );
+    ELSIF TG_TABLE_NAME = 'tours' THEN
+        flight_ids := ARRAY(
+            SELECT f.id
+            FROM flights f
+            WHERE f.tour_id IN ((old_row->>'id')::int, (new_row->>'id')::int)
+        );
+    END IF;
+
+    IF flight_ids IS NOT NULL AND cardinality(flight_ids) > 0 THEN
+        PERFORM tour_search_projection_refresh(flight_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tour_search_projection',
+        sa.Column('flight_id', PG_UUID(as_uuid=True), nullable=False),
+        sa.Column('tour_id', sa.Integer(), nullable=False),
+        sa.Column('operator_id', sa.Integer(), nullable=False),
+        sa.Column('type_id', sa.Integer(), nullable=False),
+        sa.Column('type_value', sa.String(), nullable=False),
+        sa.Column('tarif_id', sa.Integer(), nullable=False),
+        sa.Column('tarif_value', sa.String(), nullable=False),
+        sa.Column('tarif_label', sa.String(), nullable=False),
+        sa.Column('availability_status_id', sa.Integer(), nullable=False),
+        sa.Column('availability_value', sa.String(), nullable=False),
+        sa.Column('price', sa.Numeric(), nullable=False),
+        sa.Column('departure_date', sa.DateTime(), nullable=False),
+        sa.Column('departure_city', sa.String(), nullable=True),
+        sa.Column('card', JSONB(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint('flight_id'),
+    )
+    op.create_index('ix_tour_search_projection_operator_id', 'tour_search_projection', ['operator_id'], unique=False)
+    op.create_index('ix_tour_search_projection_type_value', 'tour_search_projection', ['type_value'], unique=False)
+    op.create_index('ix_tour_search_projection_tarif_value', 'tour_search_projection', ['tarif_value'], unique=False)
+    op.create_index('ix_tour_search_projection_departure_date', 'tour_search_projection', ['departure_date'], unique=False)
+    op.create_index('ix_tour_search_projection_departure_city', 'tour_search_projection', ['departure_city'], unique=False)
+
+    op.execute(REFRESH_FUNCTION_SQL)
+    op.execute(SYNC_FUNCTION_SQL)
+
+    for table in SYNC_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_search_projection
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION tour_search_projection_sync()
+            """
+        )
+
+    # Первичное заполнение проекции
+    op.execute("SELECT tour_search_projection_refresh(NULL)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_projection ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS tour_search_projection_sync()")
+    op.execute("DROP FUNCTION IF EXISTS tour_search_projection_refresh(uuid[])")
+
+    op.drop_index('ix_tour_search_projection_departure_city', table_name='tour_search_projection')
+    op.drop_index('ix_tour_search_projection_departure_date', table_name='tour_search_projection')
+    op.drop_index('ix_tour_search_projection_tarif_value', table_name='tour_search_projection')
+    op.drop_index('ix_tour_search_projection_type_value', table_name='tour_search_projection')
+    op.drop_index('ix_tour_search_projection_operator_id', table_name='tour_search_projection')
+    op.drop_table('tour_search_projection')
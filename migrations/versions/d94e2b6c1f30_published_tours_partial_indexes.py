@@ -0,0 +1,50 @@
+"""published_tours_partial_indexes
+
+Revision ID: d94e2b6c1f30
+Revises: b3f61d2e8a07
+Create Date: 2026-10-17 16:11:45.208563
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94e2b6c1f30'
+down_revision: Union[str, None] = 'b3f61d2e8a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Публичные пути каталога фильтруют `tours.is_published`; черновики в индексы не попадают
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tours_published',
+            'tours',
+            ['id'],
+            unique=False,
+            postgresql_include=['type_id', 'tarif_id', 'operator_id'],
+            postgresql_where=sa.text('is_published'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tours_published_operator_id',
+            'tours',
+            ['operator_id'],
+            unique=False,
+            postgresql_where=sa.text('is_published'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tours_published_operator_id', table_name='tours', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tours_published', table_name='tours', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,66 @@
+"""reference_data_versions
+
+Revision ID: e2d94c7a1b58
+Revises: 5b8f3e21d0c6
+Create Date: 2026-10-17 12:41:09.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d94c7a1b58'
+down_revision: Union[str, None] = '5b8f3e21d0c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Справочники, которые приложение держит в памяти (ReferenceDataRegistry)
+REFERENCE_TABLES = ("tour_types", "tour_tarifs", "availability", "currencies", "departure_cities")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'catalog_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # Имя каталога передается аргументом триггера: одна функция на все справочники
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO catalog_versions (name, version)
+            VALUES (TG_ARGV[0], 1)
+            ON CONFLICT (name) DO UPDATE SET version = catalog_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+
+    for table in REFERENCE_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_reference_data_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('reference_data')
+            """
+        )
+
+    op.execute("INSERT INTO catalog_versions (name, version) VALUES ('reference_data', 1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in REFERENCE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_reference_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.drop_table('catalog_versions')
@@ -0,0 +1,191 @@
+"""tour_price_calendar_daily
+
+Revision ID: f5a8c3d7e912
+Revises: d94e2b6c1f30
+Create Date: 2026-10-18 09:37:02.651190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a8c3d7e912'
+down_revision: Union[str, None] = 'd94e2b6c1f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Ключ строки календаря (город вылета NULL хранится как '')
+KEY_TYPE_SQL = """
+CREATE TYPE tour_price_calendar_key AS (
+    day date,
+    type_id integer,
+    tarif_id integer,
+    operator_id integer,
+    departure_city text
+);
+"""
+
+# Точный пересчет строк календаря по списку ключей из tour_search_projection.
+# Advisory-блокировки по ключам сериализуют конкурентные пересчеты одного дня:
+# следующий оператор (в READ COMMITTED) видит уже зафиксированные изменения соседней транзакции
+REFRESH_KEYS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_price_calendar_refresh(p_keys tour_price_calendar_key[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtextextended(k::text, 0))
+    FROM (SELECT DISTINCT k FROM unnest(p_keys) AS k ORDER BY k) AS s;
+
+    WITH keys AS (
+        SELECT DISTINCT * FROM unnest(p_keys)
+    ),
+    fresh AS (
+        SELECT
+            k.day, k.type_id, k.tarif_id, k.operator_id, k.departure_city,
+            min(p.price) AS min_price,
+            sum(p.price) AS sum_price,
+            count(*) AS flights_count
+        FROM keys k
+        JOIN tour_search_projection p
+          ON p.departure_date >= k.day
+         AND p.departure_date < k.day + 1
+         AND p.type_id = k.type_id
+         AND p.tarif_id = k.tarif_id
+         AND p.operator_id = k.operator_id
+         AND coalesce(p.departure_city, '') = k.departure_city
+        WHERE p.availability_value <> 'sold_out'
+        GROUP BY k.day, k.type_id, k.tarif_id, k.operator_id, k.departure_city
+    ),
+    upserted AS (
+        INSERT INTO tour_price_calendar_daily AS c (
+            day, type_id, tarif_id, operator_id, departure_city, min_price, sum_price, flights_count
+        )
+        SELECT day, type_id, tarif_id, operator_id, departure_city, min_price, sum_price, flights_count
+        FROM fresh
+        ON CONFLICT (day, type_id, tarif_id, operator_id, departure_city) DO UPDATE
+        SET min_price = EXCLUDED.min_price,
+            sum_price = EXCLUDED.sum_price,
+            flights_count = EXCLUDED.flights_count
+        RETURNING 1
+    )
+    DELETE FROM tour_price_calendar_daily c
+    USING keys k
+    WHERE c.day = k.day
+      AND c.type_id = k.type_id
+      AND c.tarif_id = k.tarif_id
+      AND c.operator_id = k.operator_id
+      AND c.departure_city = k.departure_city
+      AND NOT EXISTS (
+          SELECT 1 FROM fresh f
+          WHERE f.day = k.day
+            AND f.type_id = k.type_id
+            AND f.tarif_id = k.tarif_id
+            AND f.operator_id = k.operator_id
+            AND f.departure_city = k.departure_city
+      );
+END;
+$$;
+"""
+
+# Statement-level триггер на проекции: ключи затронутых дней берутся из transition-таблиц
+SYNC_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION tour_price_calendar_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    keys tour_price_calendar_key[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT ROW(departure_date::date, type_id, tarif_id, operator_id,
+                                      coalesce(departure_city, ''))::tour_price_calendar_key)
+        INTO keys FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT ROW(departure_date::date, type_id, tarif_id, operator_id,
+                                      coalesce(departure_city, ''))::tour_price_calendar_key)
+        INTO keys FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT ROW(departure_date::date, type_id, tarif_id, operator_id,
+                                      coalesce(departure_city, ''))::tour_price_calendar_key)
+        INTO keys
+        FROM (
+            SELECT departure_date, type_id, tarif_id, operator_id, departure_city FROM old_rows
+            UNION ALL
+            SELECT departure_date, type_id, tarif_id, operator_id, departure_city FROM new_rows
+        ) AS changed;
+    END IF;
+
+    IF keys IS NOT NULL THEN
+        PERFORM tour_price_calendar_refresh(keys);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+# Триггер с transition-таблицами допускает только одно событие - по триггеру на каждое
+TRIGGERS = (
+    ('trg_tour_search_projection_calendar_ins', 'INSERT', 'REFERENCING NEW TABLE AS new_rows'),
+    ('trg_tour_search_projection_calendar_upd', 'UPDATE', 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('trg_tour_search_projection_calendar_del', 'DELETE', 'REFERENCING OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tour_price_calendar_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('type_id', sa.Integer(), nullable=False),
+        sa.Column('tarif_id', sa.Integer(), nullable=False),
+        sa.Column('operator_id', sa.Integer(), nullable=False),
+        sa.Column('departure_city', sa.String(), nullable=False, server_default=''),
+        sa.Column('min_price', sa.Numeric(), nullable=False),
+        sa.Column('sum_price', sa.Numeric(), nullable=False),
+        sa.Column('flights_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            'day', 'type_id', 'tarif_id', 'operator_id', 'departure_city', name='tour_price_calendar_daily_pkey'
+        ),
+    )
+
+    op.execute(KEY_TYPE_SQL)
+    op.execute(REFRESH_KEYS_FUNCTION_SQL)
+    op.execute(SYNC_FUNCTION_SQL)
+    for name, event, referencing in TRIGGERS:
+        op.execute(
+            f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON tour_search_projection
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION tour_price_calendar_sync()
+            """
+        )
+
+    # Первичное заполнение
+    op.execute(
+        """
+        INSERT INTO tour_price_calendar_daily (
+            day, type_id, tarif_id, operator_id, departure_city, min_price, sum_price, flights_count
+        )
+        SELECT departure_date::date, type_id, tarif_id, operator_id, coalesce(departure_city, ''),
+               min(price), sum(price), count(*)
+        FROM tour_search_projection
+        WHERE availability_value <> 'sold_out'
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tour_search_projection")
+    op.execute("DROP FUNCTION IF EXISTS tour_price_calendar_sync()")
+    op.execute("DROP FUNCTION IF EXISTS tour_price_calendar_refresh(tour_price_calendar_key[])")
+    op.execute("DROP TYPE IF EXISTS tour_price_calendar_key")
+    op.drop_table('tour_price_calendar_daily')
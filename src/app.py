@@ -1,70 +1,50 @@
 import logging
-import time
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from dishka.integrations.fastapi import setup_dishka
 
+from src.core.auth.ports.email_sender import EmailSender
+from src.infrastructure.db.pool_admission import PoolSaturatedError
+from src.infrastructure.db.reference_data import ReferenceDataRegistry
+from src.infrastructure.db.token_janitor import TokenJanitor
 from src.infrastructure.di.container import create_container
+from src.infrastructure.di.providers.config import get_settings
+from src.infrastructure.observability.log_pipeline import start_queue_logging, stop_queue_logging
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.interfaces.http.middleware.access_log import AccessLogMiddleware, access_logger
+from src.interfaces.http.middleware.metrics import MetricsMiddleware
+from src.interfaces.http.middleware.query_budget import QueryBudgetMiddleware
+from src.interfaces.http.middleware.route_group import RouteGroupMiddleware
 from src.interfaces.http.routers.tour_router import tour_router
 from src.interfaces.http.routers.operator_router import operators_router
 from src.interfaces.http.routers.auth_router import auth_router
 from src.interfaces.http.routers.user_router import user_router
+from src.interfaces.http.routers.system_router import system_router
+from src.interfaces.http.routers.metrics_router import metrics_router
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware для логирования HTTP запросов и ответов."""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # Безопасно читаем body только если это не GET/HEAD/OPTIONS запрос
-        body_str = ""
-        if request.method not in ("GET", "HEAD", "OPTIONS"):
-            try:
-                body = await request.body()
-                body_str = f"| Body: {body.decode('utf-8')[:200]}" if body else ""
-                # Восстанавливаем body для дальнейшей обработки
-                async def receive():
-                    return {"type": "http.request", "body": body}
-                request._receive = receive
-            except Exception:
-                body_str = "| Body: <unable to read>"
-        
-        # Логируем входящий запрос
-        logger.info(
-            f"→ {request.method} {request.url.path} "
-            f"| Client: {request.client.host if request.client else 'unknown'} "
-            f"| Query: {dict(request.query_params)}"
-            f"{body_str}"
-        )
-        
-        # Выполняем запрос
-        response = await call_next(request)
-        
-        # Вычисляем время выполнения
-        process_time = time.time() - start_time
-        
-        # Логируем ответ
-        logger.info(
-            f"← {request.method} {request.url.path} "
-            f"| Status: {response.status_code} "
-            f"| Time: {process_time:.3f}s"
-        )
-        
-        return response
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 🔹 Инициализация
+    # Запись логов (вывод в поток/файл) уходит в отдельный поток, event loop ее не ждет
+    log_queues = start_queue_logging(("", access_logger.name))
+    reference_registry = await app.container.get(ReferenceDataRegistry)
+    await reference_registry.reload()
+    # Запускает воркеров очереди писем; при закрытии контейнера очередь дорабатывает
+    await app.container.get(EmailSender)
+    # Фоновая очистка истекших auth-токенов
+    await app.container.get(TokenJanitor)
+    # Подписывает метрики запросов к БД и коллекторы пула/кэшей
+    await app.container.get(MetricsRegistry)
     logger.info("✅ Application started")
 
     yield  # 🔸 приложение работает
@@ -72,10 +52,23 @@ async def lifespan(app: FastAPI):
     # 🔻 Завершение
     await app.container.close()
     logger.info("🛑 Application stopped")
+    stop_queue_logging(log_queues)
 
 
 def create_app() -> FastAPI:
-    container = create_container()
+    settings = get_settings()
+
+    # Реестр метрик у каждого воркера свой: при нескольких воркерах ряды различаются меткой pid
+    metrics_labels = {}
+    if int(settings.get("WORKERS", 1)) > 1:
+        metrics_labels = {"worker": str(os.getpid())}
+        logger.warning(
+            "WORKERS > 1: each /metrics scrape shows only the worker that served it (label worker=%s), "
+            "sum series by worker in Prometheus",
+            os.getpid(),
+        )
+    metrics = MetricsRegistry(const_labels=metrics_labels)
+    container = create_container(metrics=metrics)
     app = FastAPI(lifespan=lifespan)
     
     # Сохраняем контейнер для доступа в lifespan
@@ -83,9 +76,27 @@ def create_app() -> FastAPI:
     
     # Настройка dishka должна быть до подключения роутеров
     setup_dishka(container, app)
-    
-    # Middleware для логирования запросов
-    app.add_middleware(LoggingMiddleware)
+
+    # Группа маршрутов (auth, catalog) определяет приоритет запроса в очереди к пулу БД
+    app.add_middleware(
+        RouteGroupMiddleware,
+        prefixes={
+            name: list(conf.get("prefixes") or [])
+            for name, conf in (settings.get("DB_ADMISSION_GROUPS") or {}).items()
+        },
+    )
+
+    # Латентность по маршрутам, статусы и запросы в обработке для /metrics
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
+    # Журнал запросов (чистый ASGI, тела не читает); успешные ответы можно сэмплировать
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_2xx=float(settings.get("ACCESS_LOG_SAMPLE_2XX", 1.0)),
+    )
+
+    # Число и время SQL-запросов на запрос: заголовок Server-Timing, журнал запросов, предупреждение о N+1
+    app.add_middleware(QueryBudgetMiddleware, budget=int(settings.get("DB_REQUEST_QUERY_BUDGET", 20)))
     
     # CORS middleware ДОЛЖЕН быть добавлен последним, чтобы выполниться первым
     # (в FastAPI порядок выполнения middleware обратный порядку добавления)
@@ -119,6 +130,29 @@ def create_app() -> FastAPI:
         
         return response
 
+    # Пул соединений с БД занят: просим клиента повторить позже вместо 500
+    @app.exception_handler(PoolSaturatedError)
+    @app.exception_handler(PoolTimeoutError)
+    async def pool_saturated_exception_handler(request: Request, exc: Exception):
+        """Обработчик переполнения пула БД: 503 с Retry-After и CORS заголовками."""
+        retry_after = getattr(exc, "retry_after_seconds", None) or int(settings.get("DB_ADMISSION_RETRY_AFTER_SECONDS", 1))
+        logger.warning(f"DB pool saturated on {request.method} {request.url.path}: {exc}")
+        response = JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Service is temporarily overloaded, retry later"},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+        # Добавляем CORS заголовки
+        origin = request.headers.get("origin")
+        if origin and origin == "http://localhost:3000":
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+            response.headers["Access-Control-Allow-Methods"] = "*"
+            response.headers["Access-Control-Allow-Headers"] = "*"
+
+        return response
+
     # Обработчик HTTP исключений (400, 401, 404 и т.д.)
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -162,8 +196,7 @@ def create_app() -> FastAPI:
     app.include_router(operators_router)
     app.include_router(auth_router)
     app.include_router(user_router)
+    app.include_router(system_router)
+    app.include_router(metrics_router)
     
     return app
-
-
-app = create_app()
\ No newline at end of file
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Аутентифицированный пользователь по данным access-токена, без обращения к БД."""
+    user_id: UUID
@@ -5,6 +5,7 @@ from datetime import datetime
 from uuid import UUID
 
 from src.core.auth.entities.refresh_token import RefreshToken
+from src.core.user.entities.user import User
 
 
 class RefreshTokenRepository(ABC):
@@ -26,6 +27,25 @@ class RefreshTokenRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def rotate_token(
+        self,
+        *,
+        old_token_hash: str,
+        user_id: UUID,
+        new_token_hash: str,
+        expires_at: datetime,
+        now: datetime,
+        request_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> User | None:
+        """
+        Ротация одним запросом: пометить старый токен использованным, проверить владельца
+        и сохранить новый токен. Возвращает пользователя-владельца или None, если старый токен
+        не найден, уже использован, истек, принадлежит другому пользователю или пользователя нет.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def revoke_all_for_user(self, *, user_id: UUID, now: datetime) -> int:
         """
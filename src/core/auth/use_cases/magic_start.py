@@ -7,6 +7,7 @@ from uuid import uuid4
 from src.core.auth.entities.magic_link_token import MagicLinkToken
 from src.core.auth.ports.email_sender import EmailSender
 from src.core.auth.ports.magic_link_repository import MagicLinkRepository
+from src.core.common.rate_limiter import RateLimiter
 
 
 @dataclass(frozen=True)
@@ -23,12 +24,16 @@ class MagicStartUseCase:
         token_ttl_minutes: int,
         rate_limit_per_hour: int,
         frontend_base_url: str,
+        rate_limiter: RateLimiter | None = None,
+        ip_rate_limit_per_hour: int = 20,
     ) -> None:
         self.magic_repo = magic_repo
         self.email_sender = email_sender
         self.token_ttl_minutes = token_ttl_minutes
         self.rate_limit_per_hour = rate_limit_per_hour
         self.frontend_base_url = frontend_base_url.rstrip("/")
+        self.rate_limiter = rate_limiter
+        self.ip_rate_limit_per_hour = ip_rate_limit_per_hour
 
     async def execute(
         self,
@@ -40,6 +45,10 @@ class MagicStartUseCase:
         user_agent: str | None = None,
         now: datetime | None = None,
     ) -> MagicStartResult:
+        # Быстрый отсев до обращения к БД; счетчик в БД остается надежной проверкой между процессами
+        if not await self._within_rate_limit(email=email, request_ip=request_ip):
+            return MagicStartResult(ok=True)
+
         now = now or datetime.utcnow()
         since = now - timedelta(hours=1)
         recent = await self.magic_repo.count_recent_requests(email=email, since=since)
@@ -64,4 +73,14 @@ class MagicStartUseCase:
         await self.email_sender.send_magic_link(to_email=email, magic_link_url=magic_link_url)
         return MagicStartResult(ok=True)
 
+    async def _within_rate_limit(self, *, email: str, request_ip: str | None) -> bool:
+        if self.rate_limiter is None:
+            return True
+        # Лимит по IP не дает одному клиенту рассылать ссылки на множество адресов
+        if request_ip and not await self.rate_limiter.hit(
+            f"magic_start_ip:{request_ip}", self.ip_rate_limit_per_hour, 3600
+        ):
+            return False
+        return await self.rate_limiter.hit(f"magic_start:{email}", self.rate_limit_per_hour, 3600)
+
 
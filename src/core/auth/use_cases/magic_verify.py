@@ -11,6 +11,7 @@ from src.core.auth.ports.refresh_token_repository import RefreshTokenRepository
 from src.core.auth.ports.token_service import TokenService
 from src.core.user.entities.user import User
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 from src.core.auth.use_cases.oauth_exchange import TokensPair
 
 
@@ -31,6 +32,7 @@ class MagicVerifyUseCase:
         refresh_token_repo: RefreshTokenRepository,
         refresh_token_pepper: str,
         refresh_ttl_days: int,
+        user_cache: UserSnapshotCache | None = None,
     ) -> None:
         self.magic_repo = magic_repo
         self.identity_repo = identity_repo
@@ -39,6 +41,7 @@ class MagicVerifyUseCase:
         self.refresh_token_repo = refresh_token_repo
         self.refresh_token_pepper = refresh_token_pepper
         self.refresh_ttl_days = refresh_ttl_days
+        self.user_cache = user_cache
 
     async def execute(
         self,
@@ -76,11 +79,13 @@ class MagicVerifyUseCase:
                 if user is None:
                     raise RuntimeError("auth identity points to missing user")
 
+            user_updated = False
             # Email подтверждён кликом по magic-link
             if user.email != email or user.email_verified_at is None:
                 user.email = email
                 user.email_verified_at = now
                 user = await self.user_repo.update(user)
+                user_updated = True
 
             tokens = TokensPair(
                 access=self.token_service.issue_access_token(user_id=user.id),
@@ -98,6 +103,9 @@ class MagicVerifyUseCase:
                 created_at=now,
             )
             await self.refresh_token_repo.session.commit()
+            # Сбрасываем снимок после фиксации, иначе /users/me отдаст старый email до истечения TTL
+            if user_updated and self.user_cache is not None:
+                await self.user_cache.invalidate(user.id)
         except Exception as e:
             await self.refresh_token_repo.session.rollback()
             raise e
@@ -11,6 +11,7 @@ from src.core.auth.ports.refresh_token_repository import RefreshTokenRepository
 from src.core.auth.ports.token_service import TokenService
 from src.core.user.entities.user import User
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 
 
 @dataclass(frozen=True)
@@ -40,6 +41,7 @@ class OAuthExchangeUseCase:
         refresh_token_repo: RefreshTokenRepository,
         refresh_token_pepper: str,
         refresh_ttl_days: int,
+        user_cache: UserSnapshotCache | None = None,
     ) -> None:
         self.oauth_validator = oauth_validator
         self.identity_repo = identity_repo
@@ -48,6 +50,7 @@ class OAuthExchangeUseCase:
         self.refresh_token_repo = refresh_token_repo
         self.refresh_token_pepper = refresh_token_pepper
         self.refresh_ttl_days = refresh_ttl_days
+        self.user_cache = user_cache
 
     async def execute(
         self,
@@ -90,11 +93,13 @@ class OAuthExchangeUseCase:
 
             now = datetime.now(timezone.utc)
 
+            user_updated = False
             # Если провайдер вернул подтверждённый email — можем заполнить и сразу отметить verified_at.
             if profile.email and (profile.email_verified is True) and (user.email != profile.email or user.email_verified_at is None):
                 user.email = profile.email
                 user.email_verified_at = now
                 user = await self.user_repo.update(user)
+                user_updated = True
 
             required_actions: list[str] = []
             if user.email is None:
@@ -117,9 +122,14 @@ class OAuthExchangeUseCase:
                 user_agent=user_agent,
                 created_at=now,
             )
+            await self.refresh_token_repo.session.commit()
         except Exception as e:
             await self.refresh_token_repo.session.rollback()
             raise e
+
+        # Сбрасываем снимок после фиксации, иначе /users/me отдаст старый email до истечения TTL
+        if user_updated and self.user_cache is not None:
+            await self.user_cache.invalidate(user.id)
         
         suggested_email = None
         # suggested_email заполним на уровне роутера через email_hint,
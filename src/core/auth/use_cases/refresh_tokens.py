@@ -6,7 +6,6 @@ from datetime import datetime, timedelta, timezone
 from src.core.auth.ports.refresh_token_repository import RefreshTokenRepository
 from src.core.auth.ports.token_service import TokenService
 from src.core.user.entities.user import User
-from src.core.user.ports.user_repository import UserRepository
 from src.core.auth.use_cases.oauth_exchange import TokensPair
 from src.infrastructure.auth.magic_tokens import hash_token
 
@@ -22,13 +21,11 @@ class RefreshTokensUseCase:
         self,
         *,
         token_service: TokenService,
-        user_repo: UserRepository,
         refresh_token_repo: RefreshTokenRepository,
         refresh_token_pepper: str,
         refresh_ttl_days: int,
     ) -> None:
         self.token_service = token_service
-        self.user_repo = user_repo
         self.refresh_token_repo = refresh_token_repo
         self.refresh_token_pepper = refresh_token_pepper
         self.refresh_ttl_days = refresh_ttl_days
@@ -49,34 +46,22 @@ class RefreshTokensUseCase:
             
             # Хешируем токен для поиска в БД
             token_hash = hash_token(token=refresh_token, pepper=self.refresh_token_pepper)
-            
-            # Атомарно помечаем старый токен как использованный
-            old_token = await self.refresh_token_repo.consume_token(token_hash=token_hash, now=now)
-            if old_token is None:
-                raise ValueError("invalid or expired refresh token")
-            
-            # Проверяем, что токен принадлежит правильному пользователю
-            if old_token.user_id != user_id:
-                raise ValueError("token user mismatch")
-            
-            user = await self.user_repo.get_by_id(user_id)
-            if user is None:
-                raise ValueError("user not found")
-            
-            # Выдаём новые токены
-            new_access_token = self.token_service.issue_access_token(user_id=user.id)
-            new_refresh_token = self.token_service.issue_refresh_token(user_id=user.id)
-            
-            # Сохраняем новый refresh токен в БД
-            await self.refresh_token_repo.create_from_raw_token(
-                raw_token=new_refresh_token,
-                user_id=user.id,
-                token_pepper=self.refresh_token_pepper,
+            new_access_token = self.token_service.issue_access_token(user_id=user_id)
+            new_refresh_token = self.token_service.issue_refresh_token(user_id=user_id)
+
+            # Одним запросом: помечаем старый токен использованным (только если он принадлежит user_id),
+            # читаем пользователя и сохраняем новый токен
+            user = await self.refresh_token_repo.rotate_token(
+                old_token_hash=token_hash,
+                user_id=user_id,
+                new_token_hash=hash_token(token=new_refresh_token, pepper=self.refresh_token_pepper),
                 expires_at=now + timedelta(days=self.refresh_ttl_days),
+                now=now,
                 request_ip=request_ip,
                 user_agent=user_agent,
-                created_at=now,  # Используем timezone-aware UTC datetime для корректного времени создания
             )
+            if user is None:
+                raise ValueError("invalid or expired refresh token")
             await self.refresh_token_repo.session.commit()
         
         except Exception as e:
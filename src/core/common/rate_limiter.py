@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+
+class RateLimiter(ABC):
+    """
+    Порт: ограничение частоты операций по ключу (email, user_id, ip ...).
+    Реализации предоставляются в infrastructure/rate_limit/...; in-process реализация считает
+    только в пределах одного процесса, общий бэкенд можно подключить через этот же порт
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        """
+        Учесть попытку и сообщить, укладывается ли она в лимит
+        :param key: Ключ ограничения
+        :param limit: Сколько попыток разрешено за окно
+        :param window_seconds: Длина скользящего окна
+        :return: True - попытка разрешена (и учтена), False - лимит исчерпан
+        """
+        raise NotImplementedError
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых конкурентных вызовов: пока выполняется вызов с ключом `key`,
+    остальные вызовы с тем же ключом не запускают свой, а ждут и получают его результат (или исключение).
+
+    Экземпляр должен быть общим на приложение; работает в пределах одного event loop
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                break
+            self.shared += 1
+            # asyncio.wait не отменяет общий future при отмене ожидающего и бросает CancelledError,
+            # только если отменили сам ожидающий запрос (в том числе вместе с ведущим)
+            await asyncio.wait((in_flight,))
+            if in_flight.cancelled():
+                # Отменили ведущий запрос, а не нас - выполняем вызов заново
+                continue
+            return in_flight.result()
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Помечаем исключение прочитанным: ожидающих может и не быть
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
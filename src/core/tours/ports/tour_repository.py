@@ -5,6 +5,7 @@ from uuid import UUID
 
 from src.core.tours.read_models.get_tarifs_read_model import TourTarifReadModel
 from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor
 from src.core.tours.read_models.tours_aggregates_read_model import ToursAggregatesReadModel
 from src.core.tours.read_models.tours_departure_cities_read_model import ToursDepartureCitiesReadModel
 
@@ -29,9 +30,11 @@ class TourRepository(ABC):
         pilgrims: Optional[int],
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[TourSearchCursor] = None,
     ) -> List[TourSearchReadModel]:
         """
-        Получение списка туров по фильтрам
+        Получение списка туров по фильтрам.
+        Выдача отсортирована по (дате вылета, ID вылета)
         :param tour_type:            Тип тура
         :param tarif:                Тариф
         :param operator_id:          Id туроператора
@@ -42,7 +45,8 @@ class TourRepository(ABC):
         :param departure_date_end:   Конец диапазона даты вылета (для `single`)
         :param pilgrims:             Количество путешественников
         :param limit:                Кол-во записей
-        :param offset:               Смещение
+        :param offset:               Смещение (игнорируется, если передан `cursor`)
+        :param cursor:               Позиция, после которой начинается страница (keyset-пагинация)
         :return:                     Детальный список туров
         """
         raise NotImplementedError
@@ -64,7 +68,20 @@ class TourRepository(ABC):
         tour_type: Optional[str],
         tarif: Optional[str],
         operator_id: Optional[int],
+        departure_city: Optional[str] = None,
+        granularity: Literal["day", "week", "month"] = "day",
     ) -> List[ToursAggregatesReadModel]:
+        """
+        Сводка цен по дням, неделям или месяцам: средняя и минимальная цена, количество вылетов
+        :param from_date:      Начало диапазона (по дню)
+        :param to_date:        Конец диапазона (по дню, включительно)
+        :param tour_type:      Тип тура
+        :param tarif:          Тариф
+        :param operator_id:    Id туроператора
+        :param departure_city: Город отправления
+        :param granularity:    Шаг календаря (`day`, `week` или `month`); дата точки - начало периода
+        :return:               Точки календаря, отсортированные по дате
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -0,0 +1,21 @@
+from uuid import UUID
+from datetime import datetime
+from typing import List, Optional
+from dataclasses import dataclass
+
+from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+
+
+@dataclass(frozen=True)
+class TourSearchCursor:
+    """
+    Позиция в выдаче поиска: ключ сортировки (дата вылета) и ID вылета
+    """
+    departure_date: datetime
+    flight_id: UUID
+
+
+@dataclass(frozen=True)
+class TourSearchPageReadModel:
+    items: List[TourSearchReadModel]
+    next_cursor: Optional[TourSearchCursor]
@@ -1,4 +1,5 @@
 from uuid import UUID
+from datetime import datetime
 from typing import List, Optional
 from dataclasses import dataclass
 
@@ -25,3 +26,6 @@ class TourSearchReadModel:
 
     flights: List[dict]
     hotels: List[dict]
+
+    # Дата вылета outbound (ключ сортировки поиска)
+    departure_date: Optional[datetime] = None
@@ -1,13 +1,16 @@
-from typing import Optional, List
+import json
+from typing import Optional, List, Literal
 from datetime import datetime
 
+from src.core.common.single_flight import SingleFlight
 from src.core.tours.read_models.tours_aggregates_read_model import ToursAggregatesReadModel
 from src.core.tours.ports.tour_repository import TourRepository
 
 
 class GetToursAggregatesUseCase:
-    def __init__(self, tour_repo: TourRepository):
+    def __init__(self, tour_repo: TourRepository, single_flight: Optional[SingleFlight] = None):
         self.repo = tour_repo
+        self.single_flight = single_flight
 
     async def execute(
         self,
@@ -16,11 +19,27 @@ class GetToursAggregatesUseCase:
         tour_type: Optional[str],
         tarif: Optional[str],
         operator_id: Optional[int],
-        pilgrims: Optional[int]
+        pilgrims: Optional[int],
+        departure_city: Optional[str] = None,
+        granularity: Literal["day", "week", "month"] = "day",
     ) -> List[ToursAggregatesReadModel]:
-        aggregates_read_models: List[ToursAggregatesReadModel] = await self.repo.get_tours_aggregates(
-            from_date, to_date, tour_type, tarif, operator_id
-        )
+        async def load() -> List[ToursAggregatesReadModel]:
+            return await self.repo.get_tours_aggregates(
+                from_date, to_date, tour_type, tarif, operator_id, departure_city, granularity
+            )
+
+        if self.single_flight is not None:
+            # pilgrims на сводку не влияет и в ключ не входит
+            key = "tours:aggregates:" + json.dumps(
+                [
+                    from_date.isoformat(), to_date.isoformat(), tour_type, tarif, operator_id,
+                    departure_city or None, granularity,
+                ],
+                separators=(",", ":"),
+            )
+            aggregates_read_models = await self.single_flight.do(key, load)
+        else:
+            aggregates_read_models = await load()
         # Business rules
         result = aggregates_read_models
 
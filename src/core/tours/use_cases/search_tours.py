@@ -1,7 +1,11 @@
+import json
 from datetime import datetime
 from typing import List, Optional, Literal
 
+from src.core.common.cache import CacheBackend
+from src.core.common.single_flight import SingleFlight
 from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor, TourSearchPageReadModel
 from src.core.tours.ports.tour_repository import TourRepository
 
 
@@ -9,8 +13,17 @@ class SearchToursUseCase:
     """
     UseCase для поиска туров
     """
-    def __init__(self, repo: TourRepository):
+    def __init__(
+        self,
+        repo: TourRepository,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         self.repo = repo
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.single_flight = single_flight
 
     async def execute(
         self,
@@ -32,7 +45,7 @@ class SearchToursUseCase:
         # application-level validation can be added here
         if limit <= 0 or offset < 0:
             raise ValueError("invalid pagination")
-        return await self.repo.search(
+        return await self._search(
             tour_type,
             tarif,
             operator_id,
@@ -45,3 +58,128 @@ class SearchToursUseCase:
             limit,
             offset,
         )
+
+    async def execute_page(
+        self,
+        tour_type: Optional[str],
+        tarif: Optional[str],
+        operator_id: Optional[int],
+        departure_city: Optional[str],
+        departure_date_mode: Literal["single", "range"],
+        departure_date: Optional[datetime],
+        departure_date_start: Optional[datetime],
+        departure_date_end: Optional[datetime],
+        pilgrims: Optional[int],
+        limit: int = 20,
+        cursor: Optional[TourSearchCursor] = None,
+    ) -> TourSearchPageReadModel:
+        """
+        Поиск туров с keyset-пагинацией: стоимость любой страницы равна стоимости первой
+        """
+        if limit <= 0:
+            raise ValueError("invalid pagination")
+        # Запрашиваем на один элемент больше, чтобы понять, есть ли следующая страница
+        items = await self._search(
+            tour_type,
+            tarif,
+            operator_id,
+            departure_city,
+            departure_date_mode,
+            departure_date,
+            departure_date_start,
+            departure_date_end,
+            pilgrims,
+            limit + 1,
+            0,
+            cursor,
+        )
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = TourSearchCursor(departure_date=last.departure_date, flight_id=last.id)
+        return TourSearchPageReadModel(items=items, next_cursor=next_cursor)
+
+    async def _search(
+        self,
+        tour_type: Optional[str],
+        tarif: Optional[str],
+        operator_id: Optional[int],
+        departure_city: Optional[str],
+        departure_date_mode: Literal["single", "range"],
+        departure_date: Optional[datetime],
+        departure_date_start: Optional[datetime],
+        departure_date_end: Optional[datetime],
+        pilgrims: Optional[int],
+        limit: int,
+        offset: int,
+        cursor: Optional[TourSearchCursor] = None,
+    ) -> List[TourSearchReadModel]:
+        """
+        Поиск через кэш и single-flight (если они подключены)
+        """
+        async def load() -> List[TourSearchReadModel]:
+            return await self.repo.search(
+                tour_type, tarif, operator_id, departure_city, departure_date_mode, departure_date,
+                departure_date_start, departure_date_end, pilgrims, limit, offset, cursor,
+            )
+
+        if self.cache is None and self.single_flight is None:
+            return await load()
+
+        key = search_cache_key(
+            tour_type, tarif, operator_id, departure_city, departure_date_mode, departure_date,
+            departure_date_start, departure_date_end, limit, offset, cursor,
+        )
+        if self.cache is not None:
+            items = await self.cache.get(key)
+            if items is not None:
+                return items
+
+        async def load_and_store() -> List[TourSearchReadModel]:
+            items = await load()
+            if self.cache is not None:
+                await self.cache.set(key, items, self.cache_ttl_seconds)
+            return items
+
+        # Одинаковые конкурентные запросы ждут один запрос в БД
+        if self.single_flight is not None:
+            return await self.single_flight.do(key, load_and_store)
+        return await load_and_store()
+
+
+def search_cache_key(
+    tour_type: Optional[str],
+    tarif: Optional[str],
+    operator_id: Optional[int],
+    departure_city: Optional[str],
+    departure_date_mode: Literal["single", "range"],
+    departure_date: Optional[datetime],
+    departure_date_start: Optional[datetime],
+    departure_date_end: Optional[datetime],
+    limit: int,
+    offset: int,
+    cursor: Optional[TourSearchCursor],
+) -> str:
+    """
+    Ключ кэша поиска по нормализованным параметрам: в ключ попадает только то, что влияет на выдачу.
+    `pilgrims` в фильтрации не участвует; для `single` важен только день вылета,
+    для `range` - только границы диапазона
+    """
+    dates = None
+    if departure_date_mode == "single" and departure_date:
+        dates = departure_date.date().isoformat()
+    elif departure_date_mode == "range" and departure_date_start and departure_date_end:
+        dates = [departure_date_start.isoformat(), departure_date_end.isoformat()]
+
+    normalized = {
+        "type": tour_type or None,
+        "tarif": tarif or None,
+        "operator": operator_id or None,
+        "city": departure_city or None,
+        "dates": dates,
+        "limit": limit,
+        "offset": offset if cursor is None else 0,
+        "cursor": [cursor.departure_date.isoformat(), str(cursor.flight_id)] if cursor else None,
+    }
+    return "tours:search:" + json.dumps(normalized, sort_keys=True, separators=(",", ":"))
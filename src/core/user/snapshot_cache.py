@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from uuid import UUID
+
+from src.core.common.cache import CacheBackend
+from src.core.user.entities.user import User
+
+
+class UserSnapshotCache:
+    """
+    Кэш снимков `User` по id поверх порта CacheBackend.
+    User изменяемый, поэтому и в кэш, и из кэша отдаются копии: правки в use case-ах
+    не портят закэшированный снимок. Use case-ы, меняющие профиль или списки пользователя,
+    обязаны вызывать `invalidate`
+    """
+
+    def __init__(self, cache: CacheBackend, ttl_seconds: float | None = None) -> None:
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _copy(user: User) -> User:
+        return replace(
+            user,
+            favorite_tour_ids=list(user.favorite_tour_ids),
+            comparison_tour_ids=list(user.comparison_tour_ids),
+        )
+
+    async def get(self, user_id: UUID) -> User | None:
+        user = await self.cache.get(self._key(user_id))
+        return self._copy(user) if user is not None else None
+
+    async def set(self, user: User) -> None:
+        await self.cache.set(self._key(user.id), self._copy(user), self.ttl_seconds)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await self.cache.delete(self._key(user_id))
@@ -1,11 +1,13 @@
 from uuid import UUID
 
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 
 
 class DeleteFromFavoritesUseCase:
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, user_cache: UserSnapshotCache | None = None):
         self.repo = repo
+        self.user_cache = user_cache
 
     async def execute(self, user_id: UUID, tour_id: UUID) -> bool:
         try:
@@ -15,4 +17,6 @@ class DeleteFromFavoritesUseCase:
             await self.repo.session.rollback()
             result = False
 
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user_id)
         return result
@@ -7,6 +7,7 @@ from datetime import datetime
 from src.core.user.entities.user import User
 from src.core.user.ports.email_change_repository import EmailChangeRepository
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 
 
 logger = logging.getLogger(__name__)
@@ -18,9 +19,16 @@ class EmailChangeConfirmResult:
 
 
 class EmailChangeConfirmUseCase:
-    def __init__(self, *, repo: EmailChangeRepository, user_repo: UserRepository) -> None:
+    def __init__(
+        self,
+        *,
+        repo: EmailChangeRepository,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache | None = None,
+    ) -> None:
         self.repo = repo
         self.user_repo = user_repo
+        self.user_cache = user_cache
 
     async def execute(
         self,
@@ -44,7 +52,16 @@ class EmailChangeConfirmUseCase:
         old_email = user.email
         user.email = new_email
         user.email_verified_at = now
-        user = await self.user_repo.update(user)
+        try:
+            user = await self.user_repo.update(user)
+            await self.user_repo.session.commit()
+        except Exception:
+            await self.user_repo.session.rollback()
+            raise
+
+        # Снимок сбрасываем после фиксации: иначе параллельный /users/me закэширует старый email
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user.id)
 
         logger.info(
             "email_change_confirmed user_id=%s old_email=%s new_email=%s request_ip=%s user_agent=%s",
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from uuid import uuid4
 
 from src.core.auth.ports.email_sender import EmailSender
+from src.core.common.rate_limiter import RateLimiter
 from src.core.user.entities.user import User
 from src.core.user.ports.email_change_repository import EmailChangeRepository
 from src.core.user.ports.user_repository import UserRepository
@@ -25,6 +26,8 @@ class EmailChangeStartUseCase:
         frontend_base_url: str,
         token_ttl_minutes: int,
         rate_limit_per_hour: int,
+        rate_limiter: RateLimiter | None = None,
+        ip_rate_limit_per_hour: int = 20,
     ) -> None:
         self.repo = repo
         self.user_repo = user_repo
@@ -32,6 +35,8 @@ class EmailChangeStartUseCase:
         self.frontend_base_url = frontend_base_url.rstrip("/")
         self.token_ttl_minutes = token_ttl_minutes
         self.rate_limit_per_hour = rate_limit_per_hour
+        self.rate_limiter = rate_limiter
+        self.ip_rate_limit_per_hour = ip_rate_limit_per_hour
 
     async def execute(
         self,
@@ -44,6 +49,10 @@ class EmailChangeStartUseCase:
         user_agent: str | None = None,
         now: datetime | None = None,
     ) -> EmailChangeStartResult:
+        # Быстрый отсев до обращения к БД; счетчик в БД остается надежной проверкой между процессами
+        if not await self._within_rate_limit(user=user, request_ip=request_ip):
+            return EmailChangeStartResult(ok=True)
+
         # Проверяем, что новый email не занят другим пользователем
         existing_user = await self.user_repo.get_by_email(new_email)
         if existing_user is not None and existing_user.id != user.id:
@@ -77,3 +86,13 @@ class EmailChangeStartUseCase:
         return EmailChangeStartResult(ok=True)
 
 
+
+    async def _within_rate_limit(self, *, user: User, request_ip: str | None) -> bool:
+        if self.rate_limiter is None:
+            return True
+        # Лимит по IP ограничивает клиента, который перебирает учетные записи
+        if request_ip and not await self.rate_limiter.hit(
+            f"email_change_start_ip:{request_ip}", self.ip_rate_limit_per_hour, 3600
+        ):
+            return False
+        return await self.rate_limiter.hit(f"email_change_start:{user.id}", self.rate_limit_per_hour, 3600)
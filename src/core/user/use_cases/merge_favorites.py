@@ -2,11 +2,23 @@ from uuid import UUID
 from typing import List
 
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 
 
 class MergeFavoritesUseCase:
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, user_cache: UserSnapshotCache | None = None):
         self.repo = repo
+        self.user_cache = user_cache
 
     async def execute(self, tour_ids: List[UUID], user_id: UUID) -> bool:
-        return await self.repo.merge_favorite_tours(tour_ids, user_id)
+        try:
+            result = await self.repo.merge_favorite_tours(tour_ids, user_id)
+            await self.repo.session.commit()
+        except Exception:
+            await self.repo.session.rollback()
+            result = False
+
+        # Снимок сбрасываем после фиксации: иначе параллельный /users/me закэширует старый список
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user_id)
+        return result
@@ -5,11 +5,13 @@ from datetime import date
 
 from src.core.user.entities.user import User
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 
 
 class UpdateMeUseCase:
-    def __init__(self, user_repo: UserRepository) -> None:
+    def __init__(self, user_repo: UserRepository, user_cache: UserSnapshotCache | None = None) -> None:
         self.user_repo = user_repo
+        self.user_cache = user_cache
 
     async def execute(
         self,
@@ -33,6 +35,16 @@ class UpdateMeUseCase:
             email_notification=email_notification if email_notification is not None else user.email_notification,
             sms_notification=sms_notification if sms_notification is not None else user.sms_notification,
         )
-        return await self.user_repo.update(updated)
+        try:
+            result = await self.user_repo.update(updated)
+            await self.user_repo.session.commit()
+        except Exception:
+            await self.user_repo.session.rollback()
+            raise
+
+        # Снимок сбрасываем после фиксации: иначе параллельный /users/me закэширует старый профиль
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user.id)
+        return result
 
 
@@ -0,0 +1,88 @@
+"""
+Кэш публичных ключей подписи (JWKS) внешнего провайдера, например Google.
+
+Ключи живут столько, сколько разрешает `Cache-Control: max-age` ответа; неизвестный `kid`
+вызывает внеочередное обновление (не чаще `min_refresh_interval_seconds`), потому что
+провайдер мог ротировать ключи раньше срока.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSUnavailableError(RuntimeError):
+    """Ключи получить не удалось, а закэшированных нет."""
+
+
+class JWKSCache:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        *,
+        timeout_seconds: float = 5.0,
+        default_max_age_seconds: float = 3600.0,
+        min_refresh_interval_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+        self.default_max_age_seconds = default_max_age_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._clock = clock
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._expires_at = 0.0
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        """
+        JWK по `kid` или None, если такого ключа у провайдера нет.
+        :raises JWKSUnavailableError: ключи не загружены и провайдер недоступен
+        """
+        if self._clock() >= self._expires_at:
+            await self._refresh(force=False)
+        elif kid not in self._keys:
+            await self._refresh(force=True)
+        return self._keys.get(kid)
+
+    async def _refresh(self, *, force: bool) -> None:
+        async with self._lock:
+            now = self._clock()
+            # Пока ждали блокировку, ключи мог обновить другой запрос
+            if not force and now < self._expires_at:
+                return
+            if force and self._fetched_at is not None and now - self._fetched_at < self.min_refresh_interval_seconds:
+                return
+
+            try:
+                resp = await self.client.get(self.url, timeout=self.timeout_seconds)
+                resp.raise_for_status()
+                keys = {key["kid"]: key for key in resp.json()["keys"] if "kid" in key}
+            except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+                if not self._keys:
+                    raise JWKSUnavailableError(f"cannot fetch JWKS from {self.url}") from e
+                # Продолжаем работать на старых ключах и повторим попытку позже
+                logger.warning("JWKS refresh failed, keeping %s cached keys: %s", len(self._keys), e)
+                self._fetched_at = now
+                self._expires_at = now + self.min_refresh_interval_seconds
+                return
+
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + self._max_age(resp.headers.get("cache-control"))
+            self.refreshes += 1
+
+    def _max_age(self, cache_control: Optional[str]) -> float:
+        match = _MAX_AGE_RE.search(cache_control or "")
+        return float(match.group(1)) if match else self.default_max_age_seconds
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
-from uuid import UUID
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
 
 from jose import jwt
 from jose.exceptions import JWTError
 
 from src.core.auth.ports.token_service import TokenService
+from src.infrastructure.cache.lru_cache import LRUCache
 
 
 class TokenError(ValueError):
@@ -14,6 +18,12 @@ class TokenError(ValueError):
 
 
 class JoseJWTTokenService(TokenService):
+    """
+    Выпуск и проверка JWT (HS256).
+    Если передан `verify_cache`, успешно проверенные access-токены кэшируются по sha256 от токена:
+    хранятся только `sub` и `exp`, запись живет не дольше самого токена
+    """
+
     def __init__(
         self,
         *,
@@ -21,12 +31,16 @@ class JoseJWTTokenService(TokenService):
         issuer: str,
         access_ttl_minutes: int,
         refresh_ttl_days: int,
+        verify_cache: Optional[LRUCache] = None,
+        clock=time.time,
     ) -> None:
         self.secret = secret
         self.issuer = issuer
         self.access_ttl_minutes = access_ttl_minutes
         self.refresh_ttl_days = refresh_ttl_days
         self.algorithm = "HS256"
+        self.verify_cache = verify_cache
+        self._clock = clock
 
     def issue_access_token(self, *, user_id: UUID) -> str:
         now = datetime.now(timezone.utc)
@@ -45,6 +59,9 @@ class JoseJWTTokenService(TokenService):
         payload = {
             "sub": str(user_id),
             "typ": "refresh",
+            # jti: два refresh-токена одного пользователя, выданные в одну секунду, не должны совпадать
+            # (хеш токена уникален в refresh_tokens)
+            "jti": uuid4().hex,
             "iss": self.issuer,
             "iat": int(now.timestamp()),
             "exp": int((now + timedelta(days=self.refresh_ttl_days)).timestamp()),
@@ -52,6 +69,22 @@ class JoseJWTTokenService(TokenService):
         return jwt.encode(payload, self.secret, algorithm=self.algorithm)
 
     def verify_access_token(self, token: str) -> UUID:
+        if self.verify_cache is None:
+            return self._decode_access_token(token)[0]
+
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached: Optional[Tuple[UUID, int]] = self.verify_cache.get(key)
+        now = self._clock()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        user_id, exp = self._decode_access_token(token)
+        if exp is not None and exp > now:
+            # TTL записи отсчитывается от текущего момента: запись истекает не позже токена
+            self.verify_cache.set(key, (user_id, exp), ttl_seconds=exp - now)
+        return user_id
+
+    def _decode_access_token(self, token: str) -> Tuple[UUID, Optional[int]]:
         try:
             payload = jwt.decode(token, self.secret, algorithms=[self.algorithm], issuer=self.issuer)
         except JWTError as e:
@@ -62,9 +95,11 @@ class JoseJWTTokenService(TokenService):
         if not sub:
             raise TokenError("missing sub")
         try:
-            return UUID(sub)
+            user_id = UUID(sub)
         except ValueError as e:
             raise TokenError("invalid sub") from e
+        exp = payload.get("exp")
+        return user_id, int(exp) if isinstance(exp, (int, float)) else None
 
     def verify_refresh_token(self, token: str) -> UUID:
         try:
@@ -1,28 +1,87 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
 
 import httpx
+from jose import jwt
+from jose.exceptions import JWTError
 
 from src.core.auth.entities.oauth_profile import OAuthProfile
 from src.core.auth.ports.oauth_validator import OAuthValidator
+from src.infrastructure.auth.jwks_cache import JWKSCache, JWKSUnavailableError
+
+logger = logging.getLogger(__name__)
 
 
 class OAuthValidationError(ValueError):
     pass
 
 
+DEFAULT_ENDPOINTS: Dict[str, str] = {
+    "google_userinfo": "https://openidconnect.googleapis.com/v1/userinfo",
+    "google_tokeninfo": "https://oauth2.googleapis.com/tokeninfo",
+    "google_jwks": "https://www.googleapis.com/oauth2/v3/certs",
+    "yandex_info": "https://login.yandex.ru/info",
+    "vk_users_get": "https://api.vk.com/method/users.get",
+}
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+
+@dataclass(frozen=True)
+class OAuthProviderLimits:
+    """Ограничения на запросы к одному провайдеру: таймаут и число одновременных запросов."""
+    timeout_seconds: float = 10.0
+    max_concurrency: int = 20
+
+
 class HttpxOAuthValidator(OAuthValidator):
     """
     MVP: поддерживаем только Google, потому что фронт может присылать access_token или id_token.
     Для остальных провайдеров пока возвращаем ошибку (можно расширить позже).
+
+    Все запросы идут через общий на приложение `httpx.AsyncClient` (пул соединений и keep-alive);
+    клиент создается и закрывается DI-контейнером. Для каждого провайдера свои таймаут
+    и семафор, чтобы медленный провайдер не занял весь пул.
+
+    Google id_token проверяется локально по закэшированным JWKS; tokeninfo вызывается,
+    только если ключи получить не удалось. `aud` сверяется, если задан `google_client_id`
     """
 
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        limits: Mapping[str, OAuthProviderLimits] | None = None,
+        endpoints: Mapping[str, str] | None = None,
+        google_client_id: str | None = None,
+    ) -> None:
+        self.client = client
+        self.limits = {provider: OAuthProviderLimits() for provider in ("google", "yandex", "vk")}
+        self.limits.update(limits or {})
+        self.endpoints = {**DEFAULT_ENDPOINTS, **(endpoints or {})}
+        self._semaphores = {
+            provider: asyncio.Semaphore(limit.max_concurrency) for provider, limit in self.limits.items()
+        }
+        self.google_client_id = google_client_id or None
+        self.google_jwks = JWKSCache(
+            client, self.endpoints["google_jwks"], timeout_seconds=self.limits["google"].timeout_seconds
+        )
+
+    async def _get(self, provider: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphores[provider]:
+            return await self.client.get(
+                self.endpoints[endpoint], timeout=self.limits[provider].timeout_seconds, **kwargs
+            )
+
     async def validate(self, *, provider: str, access_token: str, id_token: str | None = None) -> OAuthProfile:
         provider = provider.lower().strip()
         if provider == "google":
             if id_token:
-                data = await self._google_tokeninfo(id_token=id_token)
+                data = await self._google_id_token(id_token=id_token)
             else:
                 data = await self._google_userinfo(access_token=access_token)
 
@@ -79,40 +138,59 @@ class HttpxOAuthValidator(OAuthValidator):
         raise OAuthValidationError(f"provider '{provider}' is not supported")
 
     async def _google_userinfo(self, *, access_token: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                "https://openidconnect.googleapis.com/v1/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        resp = await self._get("google", "google_userinfo", headers={"Authorization": f"Bearer {access_token}"})
         if resp.status_code != 200:
             raise OAuthValidationError("invalid google access_token")
         return resp.json()
 
+    async def _google_id_token(self, *, id_token: str) -> dict[str, Any]:
+        try:
+            kid = jwt.get_unverified_header(id_token).get("kid")
+        except JWTError as e:
+            raise OAuthValidationError("invalid google id_token") from e
+        try:
+            key = await self.google_jwks.get_key(kid) if kid else None
+        except JWKSUnavailableError:
+            logger.warning("Google JWKS is unavailable, falling back to tokeninfo")
+            data = await self._google_tokeninfo(id_token=id_token)
+            if self.google_client_id and data.get("aud") != self.google_client_id:
+                raise OAuthValidationError("google id_token was issued for another client")
+            return data
+        if key is None:
+            raise OAuthValidationError("google id_token is signed with an unknown key")
+        try:
+            return jwt.decode(
+                id_token,
+                key,
+                algorithms=["RS256"],
+                audience=self.google_client_id,
+                issuer=GOOGLE_ISSUERS,
+                # at_hash сверять не с чем: access_token для этого пути не обязателен
+                options={"verify_aud": self.google_client_id is not None, "verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise OAuthValidationError("invalid google id_token") from e
+
     async def _google_tokeninfo(self, *, id_token: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get("https://oauth2.googleapis.com/tokeninfo", params={"id_token": id_token})
+        resp = await self._get("google", "google_tokeninfo", params={"id_token": id_token})
         if resp.status_code != 200:
             raise OAuthValidationError("invalid google id_token")
         return resp.json()
 
     async def _yandex_info(self, *, access_token: str) -> dict[str, Any]:
         # https://login.yandex.ru/info
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                "https://login.yandex.ru/info",
-                params={"format": "json"},
-                headers={"Authorization": f"OAuth {access_token}"},
-            )
+        resp = await self._get(
+            "yandex",
+            "yandex_info",
+            params={"format": "json"},
+            headers={"Authorization": f"OAuth {access_token}"},
+        )
         if resp.status_code != 200:
             raise OAuthValidationError("invalid yandex access_token")
         return resp.json()
 
     async def _vk_users_get(self, *, access_token: str) -> dict[str, Any]:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                "https://api.vk.com/method/users.get",
-                params={"v": "5.131", "access_token": access_token},
-            )
+        resp = await self._get("vk", "vk_users_get", params={"v": "5.131", "access_token": access_token})
         if resp.status_code != 200:
             raise OAuthValidationError("invalid vk access_token")
         data = resp.json()
@@ -0,0 +1 @@
+"""In-process cache adapters (LRU + TTL, catalog-version invalidation)."""
@@ -0,0 +1,22 @@
+from typing import Dict
+
+from src.core.common.cache import CacheBackend, CacheStats
+
+
+class CacheRegistry:
+    """Именованные кэши приложения: единая точка для выдачи статистики."""
+
+    def __init__(self) -> None:
+        self._caches: Dict[str, CacheBackend] = {}
+
+    def register(self, name: str, cache: CacheBackend) -> CacheBackend:
+        if name in self._caches:
+            raise ValueError(f"Cache {name!r} is already registered")
+        self._caches[name] = cache
+        return cache
+
+    def get(self, name: str) -> CacheBackend:
+        return self._caches[name]
+
+    def stats(self) -> Dict[str, CacheStats]:
+        return {name: cache.stats() for name, cache in self._caches.items()}
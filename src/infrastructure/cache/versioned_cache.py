@@ -0,0 +1,90 @@
+"""
+Кэш, целиком сбрасываемый при изменении версии каталога в `catalog_versions`.
+Версия сверяется с БД не чаще одного раза в `check_interval_seconds`,
+поэтому устаревшие данные живут не дольше этого интервала.
+
+Промах `get` запоминает версию, при которой началась загрузка; если к `set` того же ключа
+версия уже сменилась, значение посчитано по старому каталогу и не сохраняется.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.common.cache import CacheBackend, CacheStats
+from src.infrastructure.db.catalog_versions import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Сколько незавершенных загрузок (промах без set) помнить; старые забываются первыми
+MAX_PENDING_LOADS = 10_000
+
+_NOT_LOADED = object()
+
+
+class CatalogVersionedCache(CacheBackend):
+    def __init__(
+        self,
+        backend: CacheBackend,
+        session_factory: async_sessionmaker[AsyncSession],
+        catalog: str,
+        check_interval_seconds: float = 5.0,
+    ):
+        self._backend = backend
+        self._session_factory = session_factory
+        self._catalog = catalog
+        self._check_interval = check_interval_seconds
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        # Ключ -> версия каталога на момент промаха
+        self._pending: OrderedDict[str, Optional[int]] = OrderedDict()
+        self.invalidations = 0
+        self.stale_writes = 0
+
+    async def _ensure_fresh(self) -> None:
+        if self._version is not None and time.monotonic() - self._checked_at < self._check_interval:
+            return
+        async with self._lock:
+            if self._version is not None and time.monotonic() - self._checked_at < self._check_interval:
+                return
+            async with self._session_factory() as session:
+                version = await get_catalog_version(session, self._catalog)
+            if version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                    logger.info("Catalog %r changed to version %s, cache cleared", self._catalog, version)
+                await self._backend.clear()
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    async def get(self, key: str) -> Optional[Any]:
+        await self._ensure_fresh()
+        value = await self._backend.get(key)
+        if value is None:
+            self._pending[key] = self._version
+            self._pending.move_to_end(key)
+            if len(self._pending) > MAX_PENDING_LOADS:
+                self._pending.popitem(last=False)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        # set без предшествующего промаха (прямая запись) пишется в текущую версию
+        loaded_at_version = self._pending.pop(key, _NOT_LOADED)
+        await self._ensure_fresh()
+        if loaded_at_version is not _NOT_LOADED and loaded_at_version != self._version:
+            self.stale_writes += 1
+            return
+        await self._backend.set(key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self._backend.delete(key)
+
+    async def clear(self) -> None:
+        await self._backend.clear()
+
+    def stats(self) -> CacheStats:
+        return self._backend.stats()
@@ -0,0 +1,20 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.db.models.catalog_version import CatalogVersion
+
+# Справочники в памяти (ReferenceDataRegistry)
+REFERENCE_DATA_CATALOG = "reference_data"
+# Содержимое каталога туров (tour_search_projection) - для инвалидации кэшей выдачи
+TOURS_CATALOG = "catalog"
+
+
+async def get_catalog_version(session: AsyncSession, name: str) -> int:
+    """
+    Текущая версия каталога из `catalog_versions`
+    :param session: Сессия БД
+    :param name:    Имя каталога
+    :return:        Версия; 0, если каталог еще ни разу не менялся
+    """
+    result = await session.execute(select(CatalogVersion.version).where(CatalogVersion.name == name))
+    return int(result.scalar_one_or_none() or 0)
@@ -12,6 +12,9 @@ from .flights import Flights, FlightDirection, FlightDirectionNodes
 from .enums import Availability, TourType, TourTarif, Currency
 from .users import Users, UserComparisons, UserFavorites
 from .auth import AuthIdentities, MagicLinkTokens, EmailChangeTokens, RefreshTokens
+from .search_projection import TourSearchProjection
+from .catalog_version import CatalogVersion
+from .price_calendar import TourPriceCalendarDaily
 
 __all__ = [
     "Base",
@@ -32,4 +35,7 @@ __all__ = [
     "MagicLinkTokens",
     "EmailChangeTokens",
     "RefreshTokens",
+    "TourSearchProjection",
+    "CatalogVersion",
+    "TourPriceCalendarDaily",
 ]
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
@@ -67,14 +67,20 @@ class EmailChangeTokens(Base):
 
 class RefreshTokens(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Уникальные ключи партиционированной таблицы обязаны включать ключ партиционирования
+        Index("ux_refresh_tokens_hash", "token_hash", "expires_at", unique=True),
+        # Месячные партиции refresh_tokens_pYYYY_MM создает и удаляет TokenJanitor
+        {"postgresql_partition_by": "RANGE (expires_at)"},
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
 
     user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
 
-    token_hash: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
+    token_hash: Mapped[str] = mapped_column(String, nullable=False)
 
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc), index=True)
     used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
 
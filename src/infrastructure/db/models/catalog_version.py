@@ -0,0 +1,16 @@
+"""
+Версии справочных данных.
+Значение `version` увеличивается триггером `bump_catalog_version` при любом изменении
+отслеживаемых таблиц; приложение сверяет его, чтобы понять, устарели ли in-memory копии.
+"""
+from sqlalchemy import String, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.db.models.base import Base
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
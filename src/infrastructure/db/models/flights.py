@@ -2,7 +2,7 @@ from uuid import UUID
 from typing import TYPE_CHECKING, List
 from datetime import datetime
 
-from sqlalchemy import String, Integer, ForeignKey, Numeric, DateTime, Column
+from sqlalchemy import String, Integer, ForeignKey, Numeric, DateTime, Column, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.ext.mutable import MutableList
@@ -19,13 +19,13 @@ class Flights(Base):
     __tablename__ = "flights"
     
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
-    tour_id: Mapped[int] = mapped_column(ForeignKey("tours.id"))
+    tour_id: Mapped[int] = mapped_column(ForeignKey("tours.id"), index=True)
     tour: Mapped["Tours"] = relationship(back_populates="flights")
 
     price: Mapped[float] = mapped_column(Numeric)
     directions: Mapped[List["FlightDirection"]] = relationship(back_populates="flight")
 
-    availability_status_id: Mapped[int] = mapped_column(ForeignKey("availability.id"), nullable=False)
+    availability_status_id: Mapped[int] = mapped_column(ForeignKey("availability.id"), nullable=False, index=True)
     availability_status: Mapped["Availability"] = relationship("Availability")
 
     favorited_by: Mapped[list["UserFavorites"]] = relationship(back_populates="tour", cascade="all, delete-orphan")
@@ -34,6 +34,9 @@ class Flights(Base):
 
 class FlightDirection(Base):
     __tablename__ = "flight_directions"
+    __table_args__ = (
+        Index("ix_flight_directions_flight_id_direction_departure_date", "flight_id", "direction", "departure_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     flight_id: Mapped[UUID] = mapped_column(ForeignKey("flights.id"))
@@ -50,6 +53,9 @@ class FlightDirection(Base):
 
 class FlightDirectionNodes(Base):
     __tablename__ = "flight_layovers"
+    __table_args__ = (
+        Index("ix_flight_layovers_flight_direction_id_city", "flight_direction_id", "city"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     # Связь с направлением перелета
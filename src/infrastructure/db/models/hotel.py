@@ -16,7 +16,7 @@ class Hotels(Base):
     __tablename__ = "hotels"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    tour_id: Mapped[int] = mapped_column(ForeignKey("tours.id"))
+    tour_id: Mapped[int] = mapped_column(ForeignKey("tours.id"), index=True)
     tour: Mapped["Tours"] = relationship(back_populates="hotels")
 
     city: Mapped[str] = mapped_column(String)
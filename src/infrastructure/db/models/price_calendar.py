@@ -0,0 +1,38 @@
+"""
+Дневной календарь цен для /tours/aggregates.
+Одна строка на день × тип тура × тариф × туроператор × город вылета (NULL хранится как '');
+поддерживается statement-level триггерами на tour_search_projection (см. миграцию),
+проданные вылеты (`sold_out`) не учитываются.
+"""
+from datetime import date
+
+from sqlalchemy import Date, DateTime, Index, Integer, Numeric, String, cast, func, literal_column
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.db.models.base import Base
+
+
+class TourPriceCalendarDaily(Base):
+    __tablename__ = "tour_price_calendar_daily"
+    __table_args__ = (
+        # Группировка по неделям и месяцам (granularity в /tours/aggregates)
+        Index(
+            "ix_tour_price_calendar_daily_week",
+            func.date_trunc(literal_column("'week'"), cast(literal_column("day"), DateTime)),
+        ),
+        Index(
+            "ix_tour_price_calendar_daily_month",
+            func.date_trunc(literal_column("'month'"), cast(literal_column("day"), DateTime)),
+        ),
+    )
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    type_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tarif_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    operator_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    departure_city: Mapped[str] = mapped_column(String, primary_key=True, default="", server_default="")
+
+    # avg = sum_price / flights_count; суммы, а не средние, чтобы строки можно было сворачивать дальше
+    min_price: Mapped[float] = mapped_column(Numeric, nullable=False)
+    sum_price: Mapped[float] = mapped_column(Numeric, nullable=False)
+    flights_count: Mapped[int] = mapped_column(Integer, nullable=False)
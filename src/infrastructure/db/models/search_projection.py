@@ -0,0 +1,45 @@
+"""
+Денормализованная проекция для поиска туров (POST /tours).
+Одна строка на опубликованный вылет, поддерживается триггерами
+и функцией `tour_search_projection_refresh` (см. миграцию).
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import String, Integer, Numeric, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+
+from src.infrastructure.db.models.base import Base
+
+
+class TourSearchProjection(Base):
+    __tablename__ = "tour_search_projection"
+    __table_args__ = (
+        # Порядок выдачи поиска и keyset-пагинация
+        Index("ix_tour_search_projection_departure_date_flight_id", "departure_date", "flight_id"),
+    )
+
+    flight_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    tour_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operator_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+    type_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    type_value: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    tarif_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    tarif_value: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    tarif_label: Mapped[str] = mapped_column(String, nullable=False)
+    availability_status_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    availability_value: Mapped[str] = mapped_column(String, nullable=False)
+
+    price: Mapped[float] = mapped_column(Numeric, nullable=False)
+
+    # Дата и город вылета по направлению outbound
+    departure_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    departure_city: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+
+    # Готовая карточка: оператор, описание тура, перелеты и отели
+    card = mapped_column(JSONB, nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
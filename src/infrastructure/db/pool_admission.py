@@ -0,0 +1,242 @@
+"""
+Допуск запросов к пулу соединений БД.
+
+Сессия запроса (REQUEST scope, AdmittedSession) занимает слот при первом обращении к БД
+и отдает его при закрытии, так что запросы, обслуженные из кэша, в очередь не встают. Слотов
+столько, сколько соединений есть у пула воркера (за вычетом резерва под фоновые задачи),
+поэтому допущенный запрос не упирается в pool_timeout. Остальные ждут в очереди по приоритету группы
+маршрутов (auth раньше каталога), но не дольше `max_wait_seconds` группы - затем
+PoolSaturatedError, который HTTP-слой отдает как 503 с Retry-After.
+
+Группа текущего запроса берется из `current_route_group` (ее выставляет HTTP middleware).
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+current_route_group: ContextVar[Optional[str]] = ContextVar("current_route_group", default=None)
+
+
+class PoolSaturatedError(Exception):
+    """Слот пула не освободился за допустимое время ожидания."""
+
+    def __init__(self, group: str, retry_after_seconds: int) -> None:
+        super().__init__(f"DB pool is saturated (group {group!r})")
+        self.group = group
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(frozen=True)
+class AdmissionGroup:
+    # Меньше - раньше в очереди
+    priority: int
+    max_wait_seconds: float
+
+
+@dataclass
+class AdmissionGroupStats:
+    admitted: int = 0
+    rejected: int = 0
+    queued: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+@dataclass(frozen=True)
+class PoolAdmissionStats:
+    capacity: int
+    in_use: int
+    waiting: int
+    groups: Dict[str, AdmissionGroupStats]
+
+
+class PoolAdmission:
+    def __init__(
+        self,
+        capacity: int,
+        groups: Mapping[str, AdmissionGroup],
+        *,
+        default_group: str,
+        retry_after_seconds: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if default_group not in groups:
+            raise ValueError(f"Unknown default admission group {default_group!r}")
+        self.capacity = max(1, capacity)
+        self.groups = dict(groups)
+        self.default_group = default_group
+        self.retry_after_seconds = retry_after_seconds
+        self._clock = clock
+        self._in_use = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats = {name: AdmissionGroupStats() for name in self.groups}
+
+    @asynccontextmanager
+    async def acquire(self, group: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Занять слот на время блока.
+        :raises PoolSaturatedError: слот не освободился за max_wait_seconds группы
+        """
+        await self.admit(group)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def admit(self, group: Optional[str] = None) -> None:
+        """
+        Занять слот; парный вызов - release().
+        :raises PoolSaturatedError: слот не освободился за max_wait_seconds группы
+        """
+        name = group or current_route_group.get()
+        if name not in self.groups:
+            name = self.default_group
+        await self._acquire(name)
+
+    def release(self) -> None:
+        self._release()
+
+    async def _acquire(self, name: str) -> None:
+        stats = self._stats[name]
+        if self._in_use < self.capacity:
+            self._in_use += 1
+            stats.admitted += 1
+            return
+
+        settings = self.groups[name]
+        started = self._clock()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (settings.priority, next(self._sequence), waiter))
+        stats.queued += 1
+        try:
+            await asyncio.wait((waiter,), timeout=settings.max_wait_seconds)
+        except asyncio.CancelledError:
+            # Запрос отменили (клиент ушел); если слот уже успели передать - отдаем следующему
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            waiter.cancel()
+            raise
+        # Проверка и отмена без await между ними: слот не может быть выдан "в пустоту"
+        if not waiter.done():
+            waiter.cancel()
+        waited = self._clock() - started
+        stats.wait_seconds_total += waited
+        stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+        if waiter.cancelled():
+            stats.rejected += 1
+            raise PoolSaturatedError(name, self.retry_after_seconds)
+        stats.admitted += 1
+
+    def _release(self) -> None:
+        # Слот переходит первому живому ожидающему напрямую, счетчик занятых не меняется
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_use -= 1
+
+    def stats(self) -> PoolAdmissionStats:
+        return PoolAdmissionStats(
+            capacity=self.capacity,
+            in_use=self._in_use,
+            waiting=sum(1 for _, _, waiter in self._waiters if not waiter.done()),
+            groups={name: AdmissionGroupStats(**vars(stats)) for name, stats in self._stats.items()},
+        )
+
+
+class AdmittedSession(AsyncSession):
+    """
+    Сессия запроса, которая занимает слот PoolAdmission перед первым обращением к БД
+    (соединение из пула берется только внутри этих методов) и освобождает его в close().
+    commit/rollback/close без начатой транзакции соединение не берут и слот не занимают.
+    """
+
+    def __init__(self, *args: Any, admission: PoolAdmission, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._admission = admission
+        self._admitted = False
+
+    @property
+    def admitted(self) -> bool:
+        return self._admitted
+
+    async def _admit(self) -> None:
+        if not self._admitted:
+            await self._admission.admit()
+            self._admitted = True
+
+    async def connection(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().connection(*args, **kwargs)
+
+    async def execute(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().scalars(*args, **kwargs)
+
+    async def stream(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().stream_scalars(*args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().get(*args, **kwargs)
+
+    async def get_one(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().get_one(*args, **kwargs)
+
+    async def merge(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().merge(*args, **kwargs)
+
+    async def refresh(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().refresh(*args, **kwargs)
+
+    async def delete(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().delete(*args, **kwargs)
+
+    async def flush(self, *args: Any, **kwargs: Any):
+        if self.new or self.dirty or self.deleted:
+            await self._admit()
+        return await super().flush(*args, **kwargs)
+
+    async def commit(self) -> None:
+        # autoflush выключен: незаписанные изменения уйдут в БД прямо в commit
+        if self.new or self.dirty or self.deleted:
+            await self._admit()
+        return await super().commit()
+
+    async def run_sync(self, *args: Any, **kwargs: Any):
+        await self._admit()
+        return await super().run_sync(*args, **kwargs)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            if self._admitted:
+                self._admitted = False
+                self._admission.release()
@@ -0,0 +1,87 @@
+"""
+Метрики SQL-запросов в разрезе методов репозиториев.
+
+`instrumented_repository` помечает публичные async-методы класса: на время вызова в
+`current_db_operation` лежит "Класс.метод". События движка (before/after_cursor_execute)
+читают эту метку и пишут длительность каждого запроса в гистограмму, так что число
+и время запросов видны по каждому методу. Запросы вне репозиториев попадают в "other".
+
+Замер длительности - одна пара событий на движок (`add_query_observer`): гистограмма и учет
+запросов из query_tracking получают одно и то же измерение.
+"""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, List
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.observability.metrics import MetricsRegistry
+
+current_db_operation: ContextVar[str] = ContextVar("current_db_operation", default="other")
+
+# Наблюдатель получает текст statement и длительность его выполнения в секундах
+QueryObserver = Callable[[str, float], None]
+
+_observers: "WeakKeyDictionary[Engine, List[QueryObserver]]" = WeakKeyDictionary()
+
+
+def instrumented_repository(cls: type) -> type:
+    """Декоратор класса репозитория: метит запросы его публичных async-методов."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _labeled(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _labeled(operation: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_db_operation.set(operation)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_db_operation.reset(token)
+
+    return wrapper
+
+
+def install_query_metrics(engine: Engine, registry: MetricsRegistry) -> None:
+    """Подписать гистограмму длительности запросов на события движка (для AsyncEngine - sync_engine)."""
+    durations = registry.histogram(
+        "db_query_duration_seconds",
+        "SQL statement execution time by repository method",
+        ("operation",),
+    )
+
+    def _observe(statement: str, seconds: float) -> None:
+        durations.observe(seconds, (current_db_operation.get(),))
+
+    add_query_observer(engine, _observe)
+
+
+def add_query_observer(engine: Engine, observer: QueryObserver) -> None:
+    """Передавать наблюдателю длительность каждого запроса; события движка подписываются один раз."""
+    observers = _observers.get(engine)
+    if observers is not None:
+        observers.append(observer)
+        return
+    observers = _observers[engine] = [observer]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        for observe in observers:
+            observe(statement, seconds)
@@ -0,0 +1,101 @@
+"""
+Учет SQL-запросов в пределах одного HTTP-запроса (или блока кода) и журнал медленных запросов.
+
+`track_queries()` кладет в контекст QueryStats; события движка добавляют в него каждый
+выполненный statement: число, суммарное время и счетчик по отпечаткам (fingerprint - текст
+запроса без литералов и с IN (...) вместо списков), чтобы N+1 был виден как один отпечаток,
+повторенный много раз. Вложенные блоки учитываются и во внешних (тестовый хелпер поверх middleware).
+
+Statement дольше `slow_query_seconds` пишется в логгер `src.db.slow_queries` вместе с отпечатком
+и методом репозитория.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.db.query_metrics import add_query_observer, current_db_operation
+
+slow_query_logger = logging.getLogger("src.db.slow_queries")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+# $1::UUID (asyncpg), %(name)s, :name, ?; приведение типа к параметру тоже убираем
+_PARAM_RE = re.compile(r"(?:\$\d+|%\(\w+\)s|(?<!:):\w+|\?)(?:::\w+(?:\[\])?)?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Нормализованный текст запроса: литералы и параметры -> ?, списки IN -> IN (...), пробелы схлопнуты."""
+    text = _STRING_RE.sub("?", statement)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    return _IN_LIST_RE.sub("IN (...)", text)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    parent: Optional["QueryStats"] = None
+
+    def record(self, statement_fingerprint: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.fingerprints[statement_fingerprint] += 1
+            stats = stats.parent
+
+    def most_repeated(self, limit: int = 3) -> List[Tuple[str, int]]:
+        return self.fingerprints.most_common(limit)
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Считать запросы, выполненные внутри блока (в том числе в вызванных из него корутинах)."""
+    stats = QueryStats(parent=current_query_stats.get())
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def install_query_tracking(engine: Engine, *, slow_query_seconds: float = 0.5) -> None:
+    """Подписать учет запросов и журнал медленных запросов на события движка (для AsyncEngine - sync_engine)."""
+
+    def _observe(statement: str, seconds: float) -> None:
+        stats = current_query_stats.get()
+        if stats is None and seconds < slow_query_seconds:
+            return
+        statement_fingerprint = fingerprint(statement)
+        if stats is not None:
+            stats.record(statement_fingerprint, seconds)
+        if seconds >= slow_query_seconds:
+            slow_query_logger.warning(
+                "Slow query %.1fms in %s: %s",
+                seconds * 1000,
+                current_db_operation.get(),
+                statement_fingerprint,
+                extra={
+                    "duration_ms": round(seconds * 1000, 2),
+                    "operation": current_db_operation.get(),
+                    "fingerprint": statement_fingerprint,
+                },
+            )
+
+    add_query_observer(engine, _observe)
@@ -0,0 +1,143 @@
+"""
+In-memory реестр справочников (enum-like таблицы).
+
+Типы туров, тарифы, статусы доступности, валюты и города вылета меняются крайне редко,
+поэтому загружаются один раз при старте приложения и дальше отдаются из памяти:
+репозитории фильтруют по id и подставляют value/label без JOIN-ов.
+
+Реестр перечитывается явно (`reload`) или когда меняется версия `reference_data`
+в таблице `catalog_versions` (ее увеличивает триггер на справочных таблицах).
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.db.catalog_versions import REFERENCE_DATA_CATALOG, get_catalog_version
+from src.infrastructure.db.models.enums import Availability, Currency, DepartureCities, TourTarif, TourType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReferenceItem:
+    id: int
+    value: str
+    label: str
+
+
+@dataclass(frozen=True)
+class ReferenceCatalog:
+    """Один справочник: отображения value ↔ id ↔ label."""
+    items: List[ReferenceItem]
+    _by_id: Dict[int, ReferenceItem] = field(init=False, repr=False, compare=False)
+    _by_value: Dict[str, ReferenceItem] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_by_id", {item.id: item for item in self.items})
+        object.__setattr__(self, "_by_value", {item.value: item for item in self.items})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "ReferenceCatalog":
+        return cls(items=sorted((ReferenceItem(id=r.id, value=r.value, label=r.label) for r in rows), key=lambda i: i.id))
+
+    def id_of(self, value: str) -> Optional[int]:
+        item = self._by_value.get(value)
+        return item.id if item else None
+
+    def value_of(self, item_id: int) -> Optional[str]:
+        item = self._by_id.get(item_id)
+        return item.value if item else None
+
+    def label_of(self, item_id: int) -> Optional[str]:
+        item = self._by_id.get(item_id)
+        return item.label if item else None
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """Неизменяемый снимок всех справочников; заменяется целиком при перезагрузке."""
+    version: int
+    tour_types: ReferenceCatalog
+    tarifs: ReferenceCatalog
+    availability: ReferenceCatalog
+    currencies: ReferenceCatalog
+    departure_cities: ReferenceCatalog
+
+
+class ReferenceDataRegistry:
+    """
+    Реестр справочников уровня приложения (Scope.APP).
+    Читатели получают текущий снимок через `data`; перезагрузка подменяет его атомарно
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], refresh_interval_seconds: float = 30.0):
+        self._session_factory = session_factory
+        self._refresh_interval = refresh_interval_seconds
+        self._data: Optional[ReferenceData] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> ReferenceData:
+        if self._data is None:
+            raise RuntimeError("Reference data is not loaded")
+        return self._data
+
+    async def reload(self) -> ReferenceData:
+        """Явная перезагрузка всех справочников из БД."""
+        async with self._lock:
+            async with self._session_factory() as session:
+                self._data = await self._load(session)
+            self._checked_at = time.monotonic()
+            logger.info("Reference data loaded, version %s", self._data.version)
+            return self._data
+
+    async def refresh_if_stale(self) -> ReferenceData:
+        """
+        Перезагрузить справочники, если изменилась их версия в БД.
+        Версия сверяется не чаще одного раза в `refresh_interval_seconds`
+        """
+        if self._data is None:
+            return await self.reload()
+        if time.monotonic() - self._checked_at < self._refresh_interval:
+            return self._data
+
+        async with self._lock:
+            # Пока ждали блокировку, проверку мог выполнить другой запрос
+            if time.monotonic() - self._checked_at < self._refresh_interval:
+                return self._data
+            async with self._session_factory() as session:
+                version = await self._fetch_version(session)
+                if version != self._data.version:
+                    self._data = await self._load(session)
+                    logger.info("Reference data reloaded, version %s", self._data.version)
+            self._checked_at = time.monotonic()
+            return self._data
+
+    @staticmethod
+    async def _fetch_version(session: AsyncSession) -> int:
+        return await get_catalog_version(session, REFERENCE_DATA_CATALOG)
+
+    async def _load(self, session: AsyncSession) -> ReferenceData:
+        # Версию читаем первой: изменение, попавшее между запросами, приведет к лишней перезагрузке, а не к пропуску
+        version = await self._fetch_version(session)
+        catalogs = {}
+        for name, model in (
+            ("tour_types", TourType),
+            ("tarifs", TourTarif),
+            ("availability", Availability),
+            ("currencies", Currency),
+            ("departure_cities", DepartureCities),
+        ):
+            result = await session.execute(select(model.id, model.value, model.label))
+            catalogs[name] = ReferenceCatalog.from_rows(result.all())
+        return ReferenceData(version=version, **catalogs)
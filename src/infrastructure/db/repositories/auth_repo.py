@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import uuid4, UUID
 
-from sqlalchemy import select, update, func, and_, delete
+from sqlalchemy import select, update, func, and_, delete, insert, literal, DateTime, String, Select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.auth.entities.auth_identity import AuthIdentity
@@ -12,8 +13,11 @@ from src.core.auth.entities.refresh_token import RefreshToken
 from src.core.auth.ports.auth_identity_repository import AuthIdentityRepository
 from src.core.auth.ports.magic_link_repository import MagicLinkRepository
 from src.core.auth.ports.refresh_token_repository import RefreshTokenRepository
+from src.core.user.entities.user import User
 from src.infrastructure.db.models.auth import AuthIdentities, MagicLinkTokens, RefreshTokens
+from src.infrastructure.db.models.users import Users, UserComparisons, UserFavorites
 from src.infrastructure.auth.magic_tokens import hash_token
+from src.infrastructure.db.query_metrics import instrumented_repository
 
 
 def _identity_to_entity(model: AuthIdentities) -> AuthIdentity:
@@ -41,6 +45,7 @@ def _magic_to_entity(model: MagicLinkTokens) -> MagicLinkToken:
     )
 
 
+@instrumented_repository
 class SqlAlchemyAuthIdentityRepository(AuthIdentityRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -72,6 +77,7 @@ class SqlAlchemyAuthIdentityRepository(AuthIdentityRepository):
         return _identity_to_entity(model)
 
 
+@instrumented_repository
 class SqlAlchemyMagicLinkRepository(MagicLinkRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -132,6 +138,7 @@ def _refresh_to_entity(model: RefreshTokens) -> RefreshToken:
     )
 
 
+@instrumented_repository
 class SqlAlchemyRefreshTokenRepository(RefreshTokenRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -176,6 +183,106 @@ class SqlAlchemyRefreshTokenRepository(RefreshTokenRepository):
         await self.session.flush()
         return _refresh_to_entity(model) if model else None
 
+    @staticmethod
+    def rotate_statement(
+        *,
+        old_token_hash: str,
+        user_id: UUID,
+        new_token_id: UUID,
+        new_token_hash: str,
+        expires_at: datetime,
+        now: datetime,
+        request_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> Select:
+        """
+        WITH consumed AS (UPDATE ... RETURNING), owner AS (SELECT users), inserted AS (INSERT ... SELECT)
+        SELECT owner + id избранного/сравнения.
+        Пустой результат - ротация не состоялась (новый токен при этом тоже не вставлен)
+        """
+        consumed = (
+            update(RefreshTokens)
+            .where(
+                and_(
+                    RefreshTokens.token_hash == old_token_hash,
+                    RefreshTokens.user_id == user_id,
+                    RefreshTokens.used_at.is_(None),
+                    RefreshTokens.expires_at >= now,
+                )
+            )
+            .values(used_at=now)
+            .returning(RefreshTokens.user_id)
+            .cte("consumed")
+        )
+        owner = (
+            select(
+                Users.id,
+                Users.email,
+                Users.email_verified_at,
+                Users.name,
+                Users.surname,
+                Users.phone,
+                Users.city,
+                Users.birth_date,
+                Users.email_notification,
+                Users.sms_notification,
+                Users.created_at,
+                Users.updated_at,
+            )
+            .join(consumed, consumed.c.user_id == Users.id)
+            .cte("owner")
+        )
+        inserted = (
+            insert(RefreshTokens)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at", "created_at", "request_ip", "user_agent"],
+                select(
+                    literal(new_token_id, PG_UUID(as_uuid=True)),
+                    owner.c.id,
+                    literal(new_token_hash, String),
+                    literal(expires_at, DateTime(timezone=True)),
+                    literal(now, DateTime(timezone=True)),
+                    literal(request_ip, String),
+                    literal(user_agent, String),
+                ),
+            )
+            .returning(RefreshTokens.user_id)
+            .cte("inserted")
+        )
+        favorites = select(UserFavorites.tour_id).where(UserFavorites.user_id == owner.c.id).scalar_subquery()
+        comparisons = select(UserComparisons.tour_id).where(UserComparisons.user_id == owner.c.id).scalar_subquery()
+        return select(
+            owner,
+            func.array(favorites, type_=ARRAY(PG_UUID(as_uuid=True))).label("favorite_tour_ids"),
+            func.array(comparisons, type_=ARRAY(PG_UUID(as_uuid=True))).label("comparison_tour_ids"),
+        ).join(inserted, inserted.c.user_id == owner.c.id)
+
+    async def rotate_token(
+        self,
+        *,
+        old_token_hash: str,
+        user_id: UUID,
+        new_token_hash: str,
+        expires_at: datetime,
+        now: datetime,
+        request_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> User | None:
+        res = await self.session.execute(
+            self.rotate_statement(
+                old_token_hash=old_token_hash,
+                user_id=user_id,
+                new_token_id=uuid4(),
+                new_token_hash=new_token_hash,
+                expires_at=expires_at,
+                now=now,
+                request_ip=request_ip,
+                user_agent=user_agent,
+            )
+        )
+        row = res.mappings().one_or_none()
+        return User(**row) if row is not None else None
+
     async def revoke_all_for_user(self, *, user_id: UUID, now: datetime) -> int:
         # Пометить все активные токены пользователя как использованные
         res = await self.session.execute(
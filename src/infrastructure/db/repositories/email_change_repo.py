@@ -8,8 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.user.ports.email_change_repository import EmailChangeRepository
 from src.infrastructure.db.models.auth import EmailChangeTokens
+from src.infrastructure.db.query_metrics import instrumented_repository
 
 
+@instrumented_repository
 class SqlAlchemyEmailChangeRepository(EmailChangeRepository):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -6,8 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.operator.read_models.operator_search_read_model import OperatorSearchReadModel
 from src.core.operator.ports.operator_repository import OperatorRepository
 from src.infrastructure.db.models.operator import Operators
+from src.infrastructure.db.query_metrics import instrumented_repository
 
 
+@instrumented_repository
 class SqlAlchemyOperatorRepository(OperatorRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -1,98 +1,179 @@
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from uuid import UUID
 from typing import Optional, Literal, List
 
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy import select, func, tuple_, cast, literal_column, null, Integer, DateTime, Select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.tours.read_models.get_tarifs_read_model import TourTarifReadModel
 from src.core.tours.read_models.tours_aggregates_read_model import ToursAggregatesReadModel
 from src.core.tours.ports.tour_repository import TourRepository
 from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor
 from src.core.tours.read_models.tours_departure_cities_read_model import ToursDepartureCitiesReadModel
 from src.infrastructure.db.models.flights import Flights, FlightDirection, FlightDirectionNodes
+from src.infrastructure.db.models.hotel import Hotels
 from src.infrastructure.db.models.tours import Tours
-from src.infrastructure.db.models.enums import TourType, TourTarif, Availability, DepartureCities
-
-
+from src.infrastructure.db.models.search_projection import TourSearchProjection
+from src.infrastructure.db.models.price_calendar import TourPriceCalendarDaily
+from src.infrastructure.db.reference_data import ReferenceData
+from src.infrastructure.db.query_metrics import instrumented_repository
+
+
+def _projection_to_read_model(row: TourSearchProjection) -> TourSearchReadModel:
+    card = row.card
+    return TourSearchReadModel(
+        id=row.flight_id,
+        operator_name=card["operator_name"],
+        operator_logo=card["operator_logo"],
+        operator_foundation_year=card["operator_foundation_year"],
+        operator_verified=card["operator_verified"],
+        operator_features=card["operator_features"],
+        title=card["title"],
+        type=row.type_value,
+        tarif=row.tarif_label,
+        price=int(row.price),
+        original_price=None,
+        duration=card["duration"],
+        location=card["location"],
+        visa_included=card["visa_included"],
+        availability=row.availability_value,
+        flights=card["flights"],
+        hotels=card["hotels"],
+        departure_date=row.departure_date,
+    )
+
+
+def _json_object(**fields):
+    """jsonb_build_object с ключами-литералами (без bind-параметров неизвестного типа)."""
+    args = []
+    for key, value in fields.items():
+        args.extend((literal_column(f"'{key}'"), value))
+    return func.jsonb_build_object(*args, type_=JSONB)
+
+
+def _json_array_agg(obj, order_by, *where):
+    """Отсортированный jsonb-массив; пустой массив вместо NULL при отсутствии строк."""
+    return (
+        select(func.coalesce(func.jsonb_agg(aggregate_order_by(obj, order_by)), literal_column("'[]'::jsonb")))
+        .where(*where)
+        .scalar_subquery()
+    )
+
+
+def _tour_cards_select() -> Select:
+    """
+    Запрос карточек вылетов: одна строка на вылет с полностью собранной карточкой (jsonb).
+    Справочные поля приходят как id и расшифровываются из ReferenceData
+    """
+    nodes = _json_array_agg(
+        _json_object(
+            id=FlightDirectionNodes.id,
+            iata=FlightDirectionNodes.iata,
+            city=FlightDirectionNodes.city,
+            layover_minutes=FlightDirectionNodes.layover_minutes,
+        ),
+        FlightDirectionNodes.id,
+        FlightDirectionNodes.flight_direction_id == FlightDirection.id,
+    )
+    directions = _json_array_agg(
+        _json_object(
+            id=FlightDirection.id,
+            direction=FlightDirection.direction,
+            departure_date=FlightDirection.departure_date,
+            inclusions=FlightDirection.inclusions,
+            nodes=nodes,
+        ),
+        FlightDirection.id,
+        FlightDirection.flight_id == Flights.id,
+    )
+    hotels = _json_array_agg(
+        _json_object(
+            id=Hotels.id,
+            city=Hotels.city,
+            name=Hotels.name,
+            stars=Hotels.stars,
+            rating=Hotels.rating,
+            reviews_count=Hotels.reviews_count,
+            distance_text=Hotels.distance_text,
+            maps_url=Hotels.maps_url,
+            amenities=Hotels.amenities,
+        ),
+        Hotels.id,
+        Hotels.tour_id == Tours.id,
+    )
+    card = _json_object(
+        id=Flights.id,
+        operator_name=Tours.operator_name,
+        operator_logo=Tours.operator_logo,
+        operator_foundation_year=Tours.operator_foundation_year,
+        operator_verified=Tours.operator_verified,
+        operator_features=Tours.operator_features,
+        title=Tours.title,
+        type_id=Tours.type_id,
+        tarif_id=Tours.tarif_id,
+        price=cast(func.trunc(Flights.price), Integer),
+        original_price=null(),
+        duration=Tours.duration,
+        location=Tours.location,
+        visa_included=Tours.visa_included,
+        availability_status_id=Flights.availability_status_id,
+        flights=directions,
+        hotels=hotels,
+    )
+    return (
+        select(card.label("card"))
+        .select_from(Flights)
+        .join(Tours, Tours.id == Flights.tour_id)
+    )
+
+
+def _calendar_bucket(granularity: Literal["week", "month"], day):
+    """
+    Начало недели/месяца для дня календаря. Единица - литерал, а аргумент приводится к timestamp
+    (date_trunc от timestamptz не IMMUTABLE): выражение совпадает с индексами
+    ix_tour_price_calendar_daily_week / _month
+    """
+    return func.date_trunc(literal_column(f"'{granularity}'"), cast(day, DateTime))
+
+
+def _card_to_read_model(card: dict, reference: ReferenceData) -> TourSearchReadModel:
+    card = dict(card)
+    flight_id = UUID(card.pop("id"))
+    type_id = card.pop("type_id")
+    tarif_id = card.pop("tarif_id")
+    availability_status_id = card.pop("availability_status_id")
+    return TourSearchReadModel(
+        **card,
+        id=flight_id,
+        type=reference.tour_types.value_of(type_id),
+        tarif=reference.tarifs.value_of(tarif_id),
+        availability=reference.availability.value_of(availability_status_id),
+    )
+
+
+@instrumented_repository
 class SqlAlchemyTourRepository(TourRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, reference: ReferenceData):
         self.session = session
+        self.reference = reference
 
     async def get_by_id(self, tour_ids: List[UUID]) -> List[TourSearchReadModel]:
         if not tour_ids:
             return []
 
-        # tour_id - это UUID для таблицы Flights, а не Tours
-        stmt = (
-            select(Flights)
-            .join(Flights.tour)
-            .where(Flights.id.in_(tour_ids))
-            .options(
-                selectinload(Flights.tour).selectinload(Tours.type),
-                selectinload(Flights.tour).selectinload(Tours.tarif),
-                selectinload(Flights.tour).selectinload(Tours.price_currency),
-                selectinload(Flights.tour).selectinload(Tours.hotels),
-                selectinload(Flights.availability_status),
-                selectinload(Flights.directions).selectinload(FlightDirection.flight_nodes),
-            )
-        )
-        result = await self.session.execute(stmt)
-        flights = result.scalars().unique().all()
+        # tour_id - это UUID для таблицы Flights, а не Tours.
+        # Неопубликованные туры не отдаются, даже если вылет остался в избранном.
+        # Вся вложенная карточка собирается в Postgres - один запрос вместо семи
+        result = await self.session.execute(self.cards_statement(tour_ids))
+        return [_card_to_read_model(card, self.reference) for card in result.scalars().all()]
 
-        # Используем ту же логику, что и в search для создания read model
-        return [
-            TourSearchReadModel(
-                id=flight.id,
-                operator_name=flight.tour.operator_name,
-                operator_logo=flight.tour.operator_logo,
-                operator_foundation_year=flight.tour.operator_foundation_year,
-                operator_verified=flight.tour.operator_verified,
-                operator_features=flight.tour.operator_features,
-                title=flight.tour.title,
-                type=flight.tour.type.value,  # Получаем значение через relationship
-                tarif=flight.tour.tarif.value,  # Получаем значение через relationship
-                price=int(flight.price),
-                original_price=None,
-                duration=flight.tour.duration,
-                location=flight.tour.location,
-                visa_included=flight.tour.visa_included,
-                availability=flight.availability_status.value,  # Получаем значение через relationship
-                flights=[
-                    {
-                        "id": direction.id,
-                        "direction": direction.direction,
-                        "departure_date": direction.departure_date,
-                        "inclusions": direction.inclusions,
-                        "nodes": [
-                            {
-                                "id": node.id,
-                                "iata": node.iata,
-                                "city": node.city,
-                                "layover_minutes": node.layover_minutes,
-                            }
-                            for node in direction.flight_nodes
-                        ],
-                    }
-                    for direction in flight.directions
-                ],
-                hotels=[
-                    {
-                        "id": hotel.id,
-                        "city": hotel.city,
-                        "name": hotel.name,
-                        "stars": hotel.stars,
-                        "rating": hotel.rating,
-                        "reviews_count": hotel.reviews_count,
-                        "distance_text": hotel.distance_text,
-                        "maps_url": hotel.maps_url,
-                        "amenities": hotel.amenities,
-                    }
-                    for hotel in flight.tour.hotels
-                ],
-            ) for flight in flights
-        ]
+    def cards_statement(self, tour_ids: List[UUID]) -> Select:
+        """
+        Запрос карточек вылетов без выполнения
+        """
+        return _tour_cards_select().where(Flights.id.in_(tour_ids), Tours.is_published)
 
     async def search(
         self,
@@ -107,47 +188,49 @@ class SqlAlchemyTourRepository(TourRepository):
         pilgrims: Optional[int],
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[TourSearchCursor] = None,
     ) -> List[TourSearchReadModel]:
-        stmt = select(Flights).join(Flights.tour)
+        stmt = self.search_statement(
+            tour_type, tarif, operator_id, departure_city, departure_date_mode, departure_date,
+            departure_date_start, departure_date_end, limit, offset, cursor,
+        )
+        result = await self.session.execute(stmt)
+        rows = result.scalars().all()
+
+        return [_projection_to_read_model(row) for row in rows]
+
+    def search_statement(
+        self,
+        tour_type: Optional[str],
+        tarif: Optional[str],
+        operator_id: Optional[int],
+        departure_city: Optional[str],
+        departure_date_mode: Literal["single", "range"],
+        departure_date: Optional[datetime],
+        departure_date_start: Optional[datetime],
+        departure_date_end: Optional[datetime],
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[TourSearchCursor] = None,
+    ) -> Select:
+        """
+        Запрос поиска без выполнения (используется также в src/interfaces/cli/check_catalog_indexes.py)
+        """
+        stmt = select(TourSearchProjection)
 
         if tour_type:
-            # JOIN с таблицей tour_types для сравнения по value
-            tour_type_alias = aliased(TourType)
-            stmt = stmt.join(tour_type_alias, Tours.type_id == tour_type_alias.id)
-            stmt = stmt.where(tour_type_alias.value == tour_type)
+            stmt = stmt.where(TourSearchProjection.type_value == tour_type)
 
         if tarif:
-            # JOIN с таблицей tour_tarifs для сравнения по value
-            tarif_alias = aliased(TourTarif)
-            stmt = stmt.join(tarif_alias, Tours.tarif_id == tarif_alias.id)
-            stmt = stmt.where(tarif_alias.value == tarif)
+            stmt = stmt.where(TourSearchProjection.tarif_value == tarif)
 
         if operator_id:
-            stmt = stmt.where(Tours.operator_id == operator_id)
-
-        # JOIN с таблицей availability для фильтрации по sold_out
-        availability_alias = aliased(Availability)
-        stmt = stmt.join(availability_alias, Flights.availability_status_id == availability_alias.id)
-        stmt = stmt.where(availability_alias.value != 'sold_out')
-
-        outbound_direction = aliased(FlightDirection)
-        outbound_nodes = aliased(FlightDirectionNodes)
-        need_outbound_join = departure_city or departure_date or departure_date_start or departure_date_end
-
-        if need_outbound_join:
-            stmt = stmt.join(
-                outbound_direction,
-                and_(
-                    outbound_direction.flight_id == Flights.id,
-                    outbound_direction.direction == "outbound",
-                ),
-            )
+            stmt = stmt.where(TourSearchProjection.operator_id == operator_id)
+
+        stmt = stmt.where(TourSearchProjection.availability_value != 'sold_out')
 
         if departure_city:
-            stmt = stmt.join(
-                outbound_nodes,
-                outbound_nodes.flight_direction_id == outbound_direction.id,
-            ).where(outbound_nodes.city == departure_city)
+            stmt = stmt.where(TourSearchProjection.departure_city == departure_city)
 
         if departure_date_mode == "single" and departure_date:
             # Сравниваем по дню, а не по точному времени
@@ -155,79 +238,23 @@ class SqlAlchemyTourRepository(TourRepository):
             start_of_day = departure_date.replace(hour=0, minute=0, second=0, microsecond=0)
             end_of_day = start_of_day + timedelta(days=1)
             stmt = stmt.where(
-                outbound_direction.departure_date >= start_of_day,
-                outbound_direction.departure_date < end_of_day
+                TourSearchProjection.departure_date >= start_of_day,
+                TourSearchProjection.departure_date < end_of_day
             )
 
         if departure_date_mode == "range" and departure_date_start and departure_date_end:
             stmt = stmt.where(
-                outbound_direction.departure_date.between(departure_date_start, departure_date_end)
+                TourSearchProjection.departure_date.between(departure_date_start, departure_date_end)
             )
 
-        stmt = stmt.distinct(Flights.id).limit(limit).offset(offset).options(
-            selectinload(Flights.tour).selectinload(Tours.hotels),
-            selectinload(Flights.tour).selectinload(Tours.type),
-            selectinload(Flights.tour).selectinload(Tours.tarif),
-            selectinload(Flights.tour).selectinload(Tours.price_currency),
-            selectinload(Flights.availability_status),
-            selectinload(Flights.directions).selectinload(FlightDirection.flight_nodes),
-        )
-
-        result = await self.session.execute(stmt)
-        models = result.scalars().unique().all()
+        sort_key = tuple_(TourSearchProjection.departure_date, TourSearchProjection.flight_id)
+        if cursor is not None:
+            # Keyset-пагинация: продолжаем сразу после последнего элемента предыдущей страницы
+            stmt = stmt.where(sort_key > tuple_(cursor.departure_date, cursor.flight_id))
+        else:
+            stmt = stmt.offset(offset)
 
-        return [
-            TourSearchReadModel(
-                id=flight.id,
-                operator_name=flight.tour.operator_name,
-                operator_logo=flight.tour.operator_logo,
-                operator_foundation_year=flight.tour.operator_foundation_year,
-                operator_verified=flight.tour.operator_verified,
-                operator_features=flight.tour.operator_features,
-                title=flight.tour.title,
-                type=flight.tour.type.value,  # Получаем значение через relationship
-                tarif=flight.tour.tarif.label,  # Получаем значение через relationship
-                price=int(flight.price),
-                original_price=None,
-                duration=flight.tour.duration,
-                location=flight.tour.location,
-                visa_included=flight.tour.visa_included,
-                availability=flight.availability_status.value,  # Получаем значение через relationship
-                flights=[
-                    {
-                        "id": direction.id,
-                        "direction": direction.direction,
-                        "departure_date": direction.departure_date,
-                        "inclusions": direction.inclusions,
-                        "nodes": [
-                            {
-                                "id": node.id,
-                                "iata": node.iata,
-                                "city": node.city,
-                                "layover_minutes": node.layover_minutes,
-                            }
-                            for node in direction.flight_nodes
-                        ],
-                    }
-                    for direction in flight.directions
-                ],
-                hotels=[
-                    {
-                        "id": hotel.id,
-                        "city": hotel.city,
-                        "name": hotel.name,
-                        "stars": hotel.stars,
-                        "rating": hotel.rating,
-                        "reviews_count": hotel.reviews_count,
-                        "distance_text": hotel.distance_text,
-                        "maps_url": hotel.maps_url,
-                        "amenities": hotel.amenities,
-                    }
-                    for hotel in flight.tour.hotels
-                ],
-            )
-            for flight in models
-        ]
+        return stmt.order_by(TourSearchProjection.departure_date, TourSearchProjection.flight_id).limit(limit)
 
     async def get_tours_aggregates(
         self,
@@ -236,72 +263,86 @@ class SqlAlchemyTourRepository(TourRepository):
         tour_type: Optional[str],
         tarif: Optional[str],
         operator_id: Optional[int],
+        departure_city: Optional[str] = None,
+        granularity: Literal["day", "week", "month"] = "day",
     ) -> List[ToursAggregatesReadModel]:
-        stmt = (
-            select(
-                FlightDirection.departure_date.label("date"),
-                func.avg(Flights.price).label("avg_price"),
-                func.min(Flights.price).label("min_price"),
-                func.count(func.distinct(Flights.id)).label("tours_count"),
-            )
-            .join(Flights, Flights.id == FlightDirection.flight_id)
-            .join(Tours, Tours.id == Flights.tour_id)
-            .where(
-                FlightDirection.direction == "outbound",
-                FlightDirection.departure_date.between(from_date, to_date),
-            )
-        )
-        
-        # JOIN с таблицей availability для фильтрации по sold_out
-        availability_alias = aliased(Availability)
-        stmt = stmt.join(availability_alias, Flights.availability_status_id == availability_alias.id)
-        stmt = stmt.where(availability_alias.value != 'sold_out')
-
-        if tour_type is not None:
-            # JOIN с таблицей tour_types для сравнения по value
-            tour_type_alias = aliased(TourType)
-            stmt = stmt.join(tour_type_alias, Tours.type_id == tour_type_alias.id)
-            stmt = stmt.where(tour_type_alias.value == tour_type)
-
-        if tarif is not None:
-            # JOIN с таблицей tour_tarifs для сравнения по value
-            tarif_alias = aliased(TourTarif)
-            stmt = stmt.join(tarif_alias, Tours.tarif_id == tarif_alias.id)
-            stmt = stmt.where(tarif_alias.value == tarif)
-
-        if operator_id is not None:
-            stmt = stmt.where(Tours.operator_id == operator_id)
-
-        stmt = (
-            stmt
-            .group_by(FlightDirection.departure_date)
-            .order_by(FlightDirection.departure_date)
+        stmt = self.aggregates_statement(
+            from_date, to_date, tour_type, tarif, operator_id, departure_city, granularity
         )
+        if stmt is None:
+            return []
 
         result = await self.session.execute(stmt)
         rows = result.all()
 
         return [
             ToursAggregatesReadModel(
-                date=row.date,
+                date=row.date if isinstance(row.date, datetime) else datetime.combine(row.date, time.min),
                 avg_price=int(row.avg_price) if row.avg_price else 0,
                 min_price=int(row.min_price) if row.min_price else 0,
                 tours_count=int(row.tours_count) if row.tours_count else 0,
             ) for row in rows
         ]
 
-    async def get_tour_tarifs(self) -> List[TourTarifReadModel]:
-        stmt = select(TourTarif)
+    def aggregates_statement(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        tour_type: Optional[str],
+        tarif: Optional[str],
+        operator_id: Optional[int],
+        departure_city: Optional[str] = None,
+        granularity: Literal["day", "week", "month"] = "day",
+    ) -> Optional[Select]:
+        """
+        Запрос сводки цен по дневному календарю (tour_price_calendar_daily) без выполнения;
+        None - если фильтр заведомо ничего не найдет.
+        Календарь строится по проекции поиска: только опубликованные и не проданные вылеты
+        """
+        calendar = TourPriceCalendarDaily
+        from_day, to_day = from_date.date(), to_date.date()
+        if granularity == "day":
+            bucket = calendar.day
+            stmt = select(bucket.label("date")).where(calendar.day.between(from_day, to_day))
+        else:
+            bucket = _calendar_bucket(granularity, calendar.day)
+            stmt = select(bucket.label("date")).where(
+                calendar.day.between(from_day, to_day),
+                # Следует из условия по day, но позволяет использовать индекс по выражению date_trunc
+                bucket.between(_calendar_bucket(granularity, from_day), _calendar_bucket(granularity, to_day)),
+            )
+        stmt = stmt.add_columns(
+            (func.sum(calendar.sum_price) / func.sum(calendar.flights_count)).label("avg_price"),
+            func.min(calendar.min_price).label("min_price"),
+            func.sum(calendar.flights_count).label("tours_count"),
+        )
 
-        result = await self.session.execute(stmt)
-        models = result.scalars().unique().all()
+        # Справочники берутся из памяти: фильтруем по id
+        if tour_type is not None:
+            type_id = self.reference.tour_types.id_of(tour_type)
+            if type_id is None:
+                return None
+            stmt = stmt.where(calendar.type_id == type_id)
 
-        return [TourTarifReadModel(id=tarif.id, label=tarif.label) for tarif in models]
+        if tarif is not None:
+            tarif_id = self.reference.tarifs.id_of(tarif)
+            if tarif_id is None:
+                return None
+            stmt = stmt.where(calendar.tarif_id == tarif_id)
 
-    async def get_tours_departure_cities(self) -> List[ToursDepartureCitiesReadModel]:
-        stmt = select(DepartureCities)
+        if operator_id is not None:
+            stmt = stmt.where(calendar.operator_id == operator_id)
 
-        result = await self.session.execute(stmt)
-        models = result.scalars().unique().all()
+        if departure_city:
+            stmt = stmt.where(calendar.departure_city == departure_city)
+
+        return stmt.group_by(bucket).order_by(bucket)
+
+    async def get_tour_tarifs(self) -> List[TourTarifReadModel]:
+        return [TourTarifReadModel(id=item.id, label=item.label) for item in self.reference.tarifs.items]
 
-        return [ToursDepartureCitiesReadModel(id=tarif.id, label=tarif.label) for tarif in models]
+    async def get_tours_departure_cities(self) -> List[ToursDepartureCitiesReadModel]:
+        return [
+            ToursDepartureCitiesReadModel(id=item.id, label=item.label)
+            for item in self.reference.departure_cities.items
+        ]
@@ -13,6 +13,7 @@ from sqlalchemy.orm import selectinload
 from src.core.user.entities.user import User
 from src.core.user.ports.user_repository import UserRepository
 from src.infrastructure.db.models.users import Users, UserComparisons, UserFavorites
+from src.infrastructure.db.query_metrics import instrumented_repository
 
 
 def _to_entity(model: Users) -> User:
@@ -34,6 +35,7 @@ def _to_entity(model: Users) -> User:
     )
 
 
+@instrumented_repository
 class SqlAlchemyUserRepository(UserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -0,0 +1,18 @@
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def refresh_tour_search_projection(session: AsyncSession, flight_ids: Optional[List[UUID]] = None) -> int:
+    """
+    Пересобрать проекцию поиска туров.
+    :param session:    Сессия БД (commit остается на вызывающей стороне)
+    :param flight_ids: Список ID вылетов; None - пересобрать проекцию целиком
+    :return:           Количество строк, записанных в проекцию
+    """
+    ids_param = bindparam("flight_ids", flight_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+    result = await session.execute(select(func.tour_search_projection_refresh(ids_param)))
+    return int(result.scalar_one() or 0)
@@ -0,0 +1,211 @@
+"""
+Фоновая очистка истекших и использованных auth-токенов (magic link, смена email, refresh).
+
+Удаление идет пачками по `batch_size` строк, каждая пачка - отдельная короткая транзакция;
+строки выбираются с FOR UPDATE SKIP LOCKED, поэтому очистка не ждет строки, которые сейчас
+обновляет запрос (consume_token), и несколько воркеров могут чистить параллельно.
+
+Токен удаляется только спустя `retention` после истечения или использования: лимиты
+magic-link и смены email считаются по строкам за последний час, и их нельзя удалять раньше.
+
+refresh_tokens партиционирована по месяцу expires_at: janitor заранее создает партиции
+на `partitions_ahead_months` вперед (первый раз - сразу при старте, до разброса по воркерам),
+а партиции, все токены которых истекли раньше now - retention, отсоединяет и удаляет целиком.
+DETACH ... CONCURRENTLY при наличии DEFAULT-партиции PostgreSQL не выполняет, поэтому
+отсоединение обычное, но под коротким lock_timeout: не дождались блокировки - попробуем
+в следующий проход, а не встаем в очередь перед запросами. Токены, для месяца которых партиции не нашлось,
+попадают в DEFAULT-партицию; это ошибка обслуживания, janitor пишет о ней предупреждение,
+а функция создания партиций переносит такие строки в партицию их месяца.
+"""
+import asyncio
+import logging
+import random
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Delete, delete, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.db.models.auth import EmailChangeTokens, MagicLinkTokens, RefreshTokens
+
+logger = logging.getLogger(__name__)
+
+TOKEN_MODELS = (MagicLinkTokens, EmailChangeTokens, RefreshTokens)
+
+REFRESH_DEFAULT_PARTITION = "refresh_tokens_default"
+
+REFRESH_PARTITION_RE = re.compile(r"^refresh_tokens_p(\d{4})_(\d{2})$")
+
+REFRESH_PARTITIONS_SQL = text(
+    """
+    SELECT c.relname, i.inhdetachpending
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'refresh_tokens'::regclass
+    """
+)
+
+REFRESH_DEFAULT_HAS_ROWS_SQL = text(f"SELECT EXISTS (SELECT 1 FROM {REFRESH_DEFAULT_PARTITION})")
+
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def purge_batch_statement(model, *, cutoff: datetime, batch_size: int) -> Delete:
+    """DELETE одной пачки токенов, истекших или использованных раньше `cutoff`."""
+    batch = (
+        select(model.id)
+        .where(or_(model.expires_at < cutoff, model.used_at < cutoff))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(model).where(model.id.in_(batch.scalar_subquery()))
+
+
+def detach_partition_sql(name: str, *, detach_pending: bool = False) -> str:
+    """
+    DETACH партиции refresh_tokens. Партицию, которую оставил недоделанный DETACH CONCURRENTLY
+    (до появления DEFAULT-партиции), можно только завершить через FINALIZE.
+    """
+    mode = " FINALIZE" if detach_pending else ""
+    return f'ALTER TABLE refresh_tokens DETACH PARTITION "{name}"{mode}'
+
+
+def expired_refresh_token_partitions(names: Iterable[str], cutoff: datetime) -> List[str]:
+    """Партиции refresh_tokens, верхняя граница которых (начало следующего месяца, UTC) не позже `cutoff`."""
+    expired = []
+    for name in names:
+        match = REFRESH_PARTITION_RE.match(name)
+        if match is None:
+            continue
+        upper = _add_months(date(int(match.group(1)), int(match.group(2)), 1), 1)
+        if datetime(upper.year, upper.month, 1, tzinfo=timezone.utc) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+class TokenJanitor:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval_seconds: float = 600.0,
+        batch_size: int = 1000,
+        max_batches_per_run: int = 100,
+        retention: timedelta = timedelta(minutes=60),
+        partitions_ahead_months: int = 3,
+        lock_timeout_ms: int = 5000,
+        start_jitter_seconds: float = 0.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches_per_run = max_batches_per_run
+        self.retention = retention
+        self.partitions_ahead_months = partitions_ahead_months
+        self.lock_timeout_ms = lock_timeout_ms
+        self.start_jitter_seconds = start_jitter_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, int] = {}
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Один проход по всем таблицам токенов; возвращает число удаленных строк по таблицам."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - self.retention
+        try:
+            await self.maintain_refresh_token_partitions(now)
+        except Exception:
+            # Очистка строк не зависит от партиций: сбой обслуживания не должен пропускать проход
+            logger.exception("Token janitor failed to maintain refresh_tokens partitions")
+        removed: Dict[str, int] = {}
+        for model in TOKEN_MODELS:
+            statement = purge_batch_statement(model, cutoff=cutoff, batch_size=self.batch_size)
+            total = 0
+            for _ in range(self.max_batches_per_run):
+                async with self._session_factory() as session:
+                    result = await session.execute(statement)
+                    await session.commit()
+                deleted = result.rowcount or 0
+                total += deleted
+                if deleted < self.batch_size:
+                    break
+            removed[model.__tablename__] = total
+        self.last_run = removed
+        logger.info("Token janitor removed %s", ", ".join(f"{table}={count}" for table, count in removed.items()))
+        return removed
+
+    async def ensure_refresh_token_partitions(self, now: datetime) -> int:
+        """Создать недостающие партиции refresh_tokens на `partitions_ahead_months` вперед; возвращает число созданных."""
+        month_start = now.astimezone(timezone.utc).date().replace(day=1)
+        async with self._session_factory() as session:
+            created = (await session.execute(
+                select(func.refresh_tokens_ensure_partitions(
+                    month_start, _add_months(month_start, self.partitions_ahead_months)
+                ))
+            )).scalar_one()
+            await session.commit()
+            default_has_rows = (await session.execute(REFRESH_DEFAULT_HAS_ROWS_SQL)).scalar_one()
+            await session.commit()
+        if created:
+            logger.info("Token janitor created %s refresh_tokens partitions", created)
+        if default_has_rows:
+            logger.warning(
+                "refresh_tokens has rows in the %s partition: monthly partitions are missing",
+                REFRESH_DEFAULT_PARTITION,
+            )
+        return created
+
+    async def maintain_refresh_token_partitions(self, now: datetime) -> List[str]:
+        """Создать недостающие партиции refresh_tokens и удалить полностью истекшие; возвращает удаленные."""
+        await self.ensure_refresh_token_partitions(now)
+        async with self._session_factory() as session:
+            partitions = (await session.execute(REFRESH_PARTITIONS_SQL)).all()
+            await session.commit()
+
+        pending = {name for name, detach_pending in partitions if detach_pending}
+        dropped = []
+        for name in expired_refresh_token_partitions((name for name, _ in partitions), now - self.retention):
+            # Каждый оператор - отдельная короткая транзакция; lock_timeout - чтобы не встать в очередь за долгими запросами
+            async with self._session_factory() as session:
+                connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+                await connection.exec_driver_sql(f"SET lock_timeout = {int(self.lock_timeout_ms)}")
+                try:
+                    await connection.exec_driver_sql(detach_partition_sql(name, detach_pending=name in pending))
+                    await connection.exec_driver_sql(f'DROP TABLE "{name}"')
+                    dropped.append(name)
+                except Exception:
+                    logger.exception("Token janitor failed to drop partition %s", name)
+                finally:
+                    await connection.exec_driver_sql("RESET lock_timeout")
+        if dropped:
+            logger.info("Token janitor dropped refresh_tokens partitions: %s", ", ".join(dropped))
+        return dropped
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="token-janitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        # Партиции нужны сразу, а не после разброса старта; одновременное создание из воркеров безопасно
+        try:
+            await self.ensure_refresh_token_partitions(datetime.now(timezone.utc))
+        except Exception:
+            logger.exception("Token janitor failed to ensure refresh_tokens partitions")
+        # Воркеры uvicorn стартуют одновременно: разносим их проходы, чтобы не чистить одно и то же разом
+        if self.start_jitter_seconds > 0:
+            await asyncio.sleep(random.uniform(0, self.start_jitter_seconds))
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Token janitor run failed")
+            await asyncio.sleep(self.interval_seconds)
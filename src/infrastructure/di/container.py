@@ -5,13 +5,19 @@ from dishka import Provider, make_async_container
 
 from src.infrastructure.di.providers.config import ConfigProvider
 from src.infrastructure.di.providers.db_provider import DBProvider
+from src.infrastructure.di.providers.cache import CacheProvider
 from src.infrastructure.di.providers.tour import TourProvider
 from src.infrastructure.di.providers.operator import OperatorProvider
 from src.infrastructure.di.providers.user import UserProvider
 from src.infrastructure.di.providers.auth import AuthProvider
+from src.infrastructure.di.providers.metrics import MetricsProvider
+from src.infrastructure.observability.metrics import MetricsRegistry
 
 
-def create_container(providers: Optional[Iterable[Provider]] = None):
+def create_container(
+    providers: Optional[Iterable[Provider]] = None,
+    metrics: Optional[MetricsRegistry] = None,
+):
     """Фабрика контейнера DI с дефолтным набором провайдеров."""
     provider_list = (
         list(providers)
@@ -19,10 +25,12 @@ def create_container(providers: Optional[Iterable[Provider]] = None):
         else [
             ConfigProvider(),
             DBProvider(),
+            CacheProvider(),
             TourProvider(),
             OperatorProvider(),
             UserProvider(),
             AuthProvider(),
+            MetricsProvider(metrics),
         ]
     )
     return make_async_container(*provider_list)
@@ -1,6 +1,10 @@
+from datetime import timedelta
+from typing import AsyncIterable
+
+import httpx
 from dishka import Provider, provide, Scope
 from dynaconf import Dynaconf
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.core.auth.ports.auth_identity_repository import AuthIdentityRepository
 from src.core.auth.ports.email_sender import EmailSender
@@ -15,15 +19,24 @@ from src.core.auth.use_cases.magic_verify import MagicVerifyUseCase
 from src.core.auth.use_cases.oauth_exchange import OAuthExchangeUseCase
 from src.core.auth.use_cases.refresh_tokens import RefreshTokensUseCase
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
+from src.core.common.rate_limiter import RateLimiter
 from src.core.common.unit_of_work import UnitOfWork
 from src.infrastructure.auth.jwt_token_service import JoseJWTTokenService
-from src.infrastructure.auth.oauth_validator import HttpxOAuthValidator
+from src.infrastructure.auth.oauth_validator import HttpxOAuthValidator, OAuthProviderLimits
+from src.infrastructure.cache.lru_cache import InMemoryCacheBackend, LRUCache
+from src.infrastructure.cache.registry import CacheRegistry
 from src.infrastructure.db.repositories.auth_repo import (
     SqlAlchemyAuthIdentityRepository,
     SqlAlchemyMagicLinkRepository,
     SqlAlchemyRefreshTokenRepository,
 )
+from src.infrastructure.db.token_janitor import TokenJanitor
+from src.infrastructure.email.email_queue import QueuedEmailSender
 from src.infrastructure.email.smtp_email_sender import SmtpEmailSender
+from src.infrastructure.rate_limit.sliding_window import SlidingWindowRateLimiter
+
+ACCESS_TOKENS_CACHE = "access_tokens"
 
 
 class AuthProvider(Provider):
@@ -40,27 +53,69 @@ class AuthProvider(Provider):
         return SqlAlchemyRefreshTokenRepository(session)
 
     @provide(scope=Scope.APP)
-    def provide_token_service(self, settings: Dynaconf) -> TokenService:
+    def provide_token_service(self, settings: Dynaconf, caches: CacheRegistry) -> TokenService:
+        verify_cache = LRUCache(max_size=int(settings.get("AUTH_TOKEN_CACHE_MAX_SIZE", 10000)))
+        # Кэш проверенных токенов синхронный; в реестр кладем обертку, чтобы он попал в /system/caches
+        caches.register(ACCESS_TOKENS_CACHE, InMemoryCacheBackend(verify_cache))
         return JoseJWTTokenService(
             secret=str(settings.AUTH_JWT_SECRET),
             issuer=str(settings.AUTH_JWT_ISSUER),
             access_ttl_minutes=int(settings.AUTH_ACCESS_TTL_MINUTES),
             refresh_ttl_days=int(settings.AUTH_REFRESH_TTL_DAYS),
+            verify_cache=verify_cache,
+        )
+
+    @provide(scope=Scope.APP)
+    async def provide_http_client(self, settings: Dynaconf) -> AsyncIterable[httpx.AsyncClient]:
+        """Общий HTTP-клиент для внешних API; закрывается при закрытии контейнера (shutdown в lifespan)."""
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(settings.get("HTTP_CLIENT_MAX_CONNECTIONS", 100)),
+                max_keepalive_connections=int(settings.get("HTTP_CLIENT_MAX_KEEPALIVE", 20)),
+                keepalive_expiry=float(settings.get("HTTP_CLIENT_KEEPALIVE_SECONDS", 60)),
+            ),
+            timeout=10.0,
         )
+        yield client
+        await client.aclose()
 
     @provide(scope=Scope.APP)
-    def provide_oauth_validator(self) -> OAuthValidator:
-        return HttpxOAuthValidator()
+    def provide_oauth_validator(self, settings: Dynaconf, client: httpx.AsyncClient) -> OAuthValidator:
+        providers = settings.get("OAUTH_PROVIDERS") or {}
+        return HttpxOAuthValidator(
+            client,
+            limits={
+                name: OAuthProviderLimits(
+                    timeout_seconds=float(conf.get("timeout_seconds", 10)),
+                    max_concurrency=int(conf.get("max_concurrency", 20)),
+                )
+                for name, conf in providers.items()
+            },
+            endpoints=settings.get("OAUTH_ENDPOINTS") or {},
+            google_client_id=str(settings.get("AUTH_GOOGLE_CLIENT_ID") or "") or None,
+        )
 
     @provide(scope=Scope.APP)
-    def provide_email_sender(self, settings: Dynaconf) -> EmailSender:
-        return SmtpEmailSender(
-            host=str(settings.SMTP_HOST),
-            port=int(settings.SMTP_PORT),
-            user=str(settings.SMTP_USER),
-            password=str(settings.SMTP_PASSWORD),
-            sender_from=str(settings.SMTP_FROM),
+    async def provide_email_sender(self, settings: Dynaconf) -> AsyncIterable[EmailSender]:
+        """Очередь писем с фоновыми воркерами; при закрытии контейнера дожидается отправки очереди."""
+        sender = QueuedEmailSender(
+            builder=SmtpEmailSender(
+                host=str(settings.SMTP_HOST),
+                port=int(settings.SMTP_PORT),
+                user=str(settings.SMTP_USER),
+                password=str(settings.SMTP_PASSWORD),
+                sender_from=str(settings.SMTP_FROM),
+            ),
+            workers=int(settings.get("EMAIL_QUEUE_WORKERS", 2)),
+            batch_size=int(settings.get("EMAIL_QUEUE_BATCH_SIZE", 20)),
+            max_queue_size=int(settings.get("EMAIL_QUEUE_MAX_SIZE", 1000)),
+            max_attempts=int(settings.get("EMAIL_SEND_MAX_ATTEMPTS", 5)),
+            backoff_seconds=float(settings.get("EMAIL_RETRY_BACKOFF_SECONDS", 2)),
+            idle_timeout_seconds=float(settings.get("SMTP_IDLE_TIMEOUT_SECONDS", 60)),
         )
+        sender.start()
+        yield sender
+        await sender.stop()
 
     @provide(scope=Scope.REQUEST)
     def provide_oauth_exchange_use_case(
@@ -71,6 +126,7 @@ class AuthProvider(Provider):
         token_service: TokenService,
         refresh_token_repo: RefreshTokenRepository,
         settings: Dynaconf,
+        user_cache: UserSnapshotCache,
     ) -> OAuthExchangeUseCase:
         return OAuthExchangeUseCase(
             oauth_validator=oauth_validator,
@@ -80,13 +136,39 @@ class AuthProvider(Provider):
             refresh_token_repo=refresh_token_repo,
             refresh_token_pepper=str(settings.AUTH_REFRESH_TOKEN_PEPPER),
             refresh_ttl_days=int(settings.AUTH_REFRESH_TTL_DAYS),
+            user_cache=user_cache,
         )
 
+    @provide(scope=Scope.APP)
+    async def provide_token_janitor(
+        self,
+        settings: Dynaconf,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> AsyncIterable[TokenJanitor]:
+        """Периодическая очистка истекших токенов; запускается из lifespan, останавливается с контейнером."""
+        interval_seconds = float(settings.get("AUTH_TOKEN_JANITOR_INTERVAL_SECONDS", 600))
+        janitor = TokenJanitor(
+            session_factory,
+            interval_seconds=interval_seconds,
+            batch_size=int(settings.get("AUTH_TOKEN_JANITOR_BATCH_SIZE", 1000)),
+            retention=timedelta(minutes=int(settings.get("AUTH_TOKEN_RETENTION_MINUTES", 60))),
+            partitions_ahead_months=int(settings.get("AUTH_REFRESH_PARTITIONS_AHEAD_MONTHS", 3)),
+            start_jitter_seconds=interval_seconds if int(settings.get("WORKERS", 1)) > 1 else 0.0,
+        )
+        janitor.start()
+        yield janitor
+        await janitor.stop()
+
+    @provide(scope=Scope.APP)
+    def provide_rate_limiter(self, settings: Dynaconf) -> RateLimiter:
+        return SlidingWindowRateLimiter(max_keys=int(settings.get("RATE_LIMIT_MAX_KEYS", 100_000)))
+
     @provide(scope=Scope.REQUEST)
     def provide_magic_start_use_case(
         self,
         magic_repo: MagicLinkRepository,
         email_sender: EmailSender,
+        rate_limiter: RateLimiter,
         settings: Dynaconf,
     ) -> MagicStartUseCase:
         return MagicStartUseCase(
@@ -95,6 +177,8 @@ class AuthProvider(Provider):
             token_ttl_minutes=int(settings.AUTH_MAGIC_TOKEN_TTL_MINUTES),
             rate_limit_per_hour=int(settings.AUTH_MAGIC_RATE_LIMIT_PER_HOUR),
             frontend_base_url=str(settings.FRONTEND_BASE_URL),
+            rate_limiter=rate_limiter,
+            ip_rate_limit_per_hour=int(settings.get("AUTH_MAGIC_RATE_LIMIT_PER_IP_PER_HOUR", 20)),
         )
 
     @provide(scope=Scope.REQUEST)
@@ -106,6 +190,7 @@ class AuthProvider(Provider):
         token_service: TokenService,
         refresh_token_repo: RefreshTokenRepository,
         settings: Dynaconf,
+        user_cache: UserSnapshotCache,
     ) -> MagicVerifyUseCase:
         return MagicVerifyUseCase(
             magic_repo=magic_repo,
@@ -115,19 +200,18 @@ class AuthProvider(Provider):
             refresh_token_repo=refresh_token_repo,
             refresh_token_pepper=str(settings.AUTH_REFRESH_TOKEN_PEPPER),
             refresh_ttl_days=int(settings.AUTH_REFRESH_TTL_DAYS),
+            user_cache=user_cache,
         )
 
     @provide(scope=Scope.REQUEST)
     def provide_refresh_tokens_use_case(
         self,
         token_service: TokenService,
-        user_repo: UserRepository,
         refresh_token_repo: RefreshTokenRepository,
         settings: Dynaconf,
     ) -> RefreshTokensUseCase:
         return RefreshTokensUseCase(
             token_service=token_service,
-            user_repo=user_repo,
             refresh_token_repo=refresh_token_repo,
             refresh_token_pepper=str(settings.AUTH_REFRESH_TOKEN_PEPPER),
             refresh_ttl_days=int(settings.AUTH_REFRESH_TTL_DAYS),
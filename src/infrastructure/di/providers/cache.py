@@ -0,0 +1,47 @@
+from dishka import Provider, provide, Scope
+from dynaconf import Dynaconf
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.cache.lru_cache import InMemoryCacheBackend, LRUCache
+from src.infrastructure.cache.registry import CacheRegistry
+from src.infrastructure.cache.versioned_cache import CatalogVersionedCache
+from src.infrastructure.db.catalog_versions import TOURS_CATALOG
+
+TOURS_SEARCH_CACHE = "tours_search"
+USERS_CACHE = "users"
+
+
+class CacheProvider(Provider):
+    """Провайдер in-process кэшей (общие на приложение)."""
+
+    @provide(scope=Scope.APP)
+    def provide_cache_registry(
+        self,
+        settings: Dynaconf,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> CacheRegistry:
+        registry = CacheRegistry()
+        registry.register(
+            TOURS_SEARCH_CACHE,
+            CatalogVersionedCache(
+                InMemoryCacheBackend(
+                    LRUCache(
+                        max_size=int(settings.get("SEARCH_CACHE_MAX_SIZE", 1024)),
+                        default_ttl_seconds=float(settings.get("SEARCH_CACHE_TTL_SECONDS", 60)),
+                    )
+                ),
+                session_factory,
+                catalog=TOURS_CATALOG,
+                check_interval_seconds=float(settings.get("CATALOG_VERSION_CHECK_SECONDS", 5)),
+            ),
+        )
+        registry.register(
+            USERS_CACHE,
+            InMemoryCacheBackend(
+                LRUCache(
+                    max_size=int(settings.get("USER_CACHE_MAX_SIZE", 10000)),
+                    default_ttl_seconds=float(settings.get("USER_CACHE_TTL_SECONDS", 15)),
+                )
+            ),
+        )
+        return registry
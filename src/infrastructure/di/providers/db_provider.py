@@ -7,6 +7,23 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from src.core.common.unit_of_work import UnitOfWork
 from src.infrastructure.common.db_unit_of_work import SqlAlchemyUnitOfWork
+from src.infrastructure.db.pool_admission import AdmissionGroup, AdmittedSession, PoolAdmission
+from src.infrastructure.db.query_tracking import install_query_tracking
+
+
+def worker_pool_limits(*, pool_size: int, max_overflow: int, workers: int, max_connections: int) -> tuple[int, int]:
+    """
+    pool_size и max_overflow одного процесса-воркера.
+    Бюджет соединений `max_connections` (на все воркеры) делится поровну, а внутри доли -
+    в той же пропорции, что DB_POOL_SIZE : DB_MAX_OVERFLOW. Без бюджета (0) настройки берутся как есть.
+    """
+    if max_connections <= 0:
+        return pool_size, max_overflow
+    per_worker = max(1, max_connections // max(1, workers))
+    if per_worker >= pool_size + max_overflow:
+        return pool_size, max_overflow
+    worker_pool_size = max(1, per_worker * pool_size // max(1, pool_size + max_overflow))
+    return worker_pool_size, per_worker - worker_pool_size
 
 
 class DBProvider(Provider):
@@ -27,17 +44,30 @@ class DBProvider(Provider):
             f"/{settings.DB_NAME}"
         )
 
+    def _pool_limits(self, settings: Dynaconf) -> tuple[int, int]:
+        return worker_pool_limits(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            workers=int(settings.get("WORKERS", 1)),
+            max_connections=int(settings.get("DB_MAX_CONNECTIONS", 0)),
+        )
+
     @provide(scope=Scope.APP)
     def engine(self, settings: Dynaconf) -> AsyncEngine:
         if self._engine is None:
+            pool_size, max_overflow = self._pool_limits(settings)
             self._engine = create_async_engine(
                 self._build_async_url(settings),
                 echo=settings.DB_ECHO,
-                pool_size=settings.DB_POOL_SIZE,
-                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
                 pool_timeout=settings.DB_POOL_TIMEOUT,
                 pool_pre_ping=settings.DB_POOL_PRE_PING,
             )
+            install_query_tracking(
+                self._engine.sync_engine,
+                slow_query_seconds=float(settings.get("DB_SLOW_QUERY_MS", 500)) / 1000,
+            )
         return self._engine
 
     @provide(scope=Scope.APP)
@@ -48,9 +78,33 @@ class DBProvider(Provider):
             )
         return self._session_factory
 
+    @provide(scope=Scope.APP)
+    def pool_admission(self, settings: Dynaconf) -> PoolAdmission:
+        """Слоты под сессии запросов: весь пул воркера, кроме резерва под фоновые задачи."""
+        pool_size, max_overflow = self._pool_limits(settings)
+        reserved = int(settings.get("DB_ADMISSION_RESERVED_CONNECTIONS", 2))
+        groups = settings.get("DB_ADMISSION_GROUPS") or {}
+        return PoolAdmission(
+            max(1, pool_size + max_overflow - reserved),
+            {
+                name: AdmissionGroup(
+                    priority=int(conf.get("priority", 1)),
+                    max_wait_seconds=float(conf.get("max_wait_seconds", 0.5)),
+                )
+                for name, conf in {"default": {}, **groups}.items()
+            },
+            default_group="default",
+            retry_after_seconds=int(settings.get("DB_ADMISSION_RETRY_AFTER_SECONDS", 1)),
+        )
+
     @provide(scope=Scope.REQUEST)
-    async def session(self, session_factory: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncSession, None]:
-        async with session_factory() as session:
+    async def session(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        admission: PoolAdmission,
+    ) -> AsyncGenerator[AsyncSession, None]:
+        # Слот пула занимается при первом обращении сессии к БД, а не при ее создании
+        async with AdmittedSession(admission=admission, **session_factory.kw) as session:
             yield session
 
     @provide(scope=Scope.REQUEST)
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from dishka import Provider, Scope, provide
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.cache.registry import CacheRegistry
+from src.infrastructure.db.pool_admission import PoolAdmission
+from src.infrastructure.db.query_metrics import install_query_metrics
+from src.infrastructure.observability.collectors import cache_collector, db_pool_collector
+from src.infrastructure.observability.metrics import MetricsRegistry
+
+
+class MetricsProvider(Provider):
+    """
+    Провайдер реестра метрик. Реестр создается заранее, потому что HTTP middleware
+    получает его при сборке приложения, до старта контейнера.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        super().__init__()
+        self._registry = registry or MetricsRegistry()
+
+    @provide(scope=Scope.APP)
+    def provide_metrics_registry(
+        self,
+        engine: AsyncEngine,
+        admission: PoolAdmission,
+        caches: CacheRegistry,
+    ) -> MetricsRegistry:
+        install_query_metrics(engine.sync_engine, self._registry)
+        self._registry.register_collector(db_pool_collector(admission, engine.sync_engine.pool))
+        self._registry.register_collector(cache_collector(caches))
+        return self._registry
@@ -1,30 +1,55 @@
 from dishka import Provider, provide, Scope
-from sqlalchemy.ext.asyncio import AsyncSession
+from dynaconf import Dynaconf
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.core.common.single_flight import SingleFlight
 from src.core.tours.ports.tour_repository import TourRepository
 from src.core.tours.use_cases.search_tours import SearchToursUseCase
 from src.core.tours.use_cases.get_tour_by_ids import GetTourByIdsUseCase
 from src.core.tours.use_cases.get_tarifs import GetTourTarifsUseCase
 from src.core.tours.use_cases.get_tours_aggregates import GetToursAggregatesUseCase
 from src.core.tours.use_cases.get_tours_departure_cities import GetToursDepartureCitiesUseCase
+from src.infrastructure.cache.registry import CacheRegistry
+from src.infrastructure.db.reference_data import ReferenceDataRegistry
+from src.infrastructure.di.providers.cache import TOURS_SEARCH_CACHE
 from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository
 
 
 class TourProvider(Provider):
 
+    @provide(scope=Scope.APP)
+    def provide_reference_data_registry(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: Dynaconf,
+    ) -> ReferenceDataRegistry:
+        return ReferenceDataRegistry(
+            session_factory,
+            refresh_interval_seconds=float(settings.get("REFERENCE_DATA_REFRESH_SECONDS", 30)),
+        )
+
+    @provide(scope=Scope.APP)
+    def provide_single_flight(self) -> SingleFlight:
+        return SingleFlight()
+
     @provide(scope=Scope.REQUEST)
-    def provide_tour_repo(
+    async def provide_tour_repo(
         self,
         session: AsyncSession,
+        reference_registry: ReferenceDataRegistry,
     ) -> TourRepository:
-        return SqlAlchemyTourRepository(session)
+        # Один снимок справочников на весь запрос
+        reference = await reference_registry.refresh_if_stale()
+        return SqlAlchemyTourRepository(session, reference)
     
     @provide(scope=Scope.REQUEST)
     def provide_search_tours_use_case(
         self,
         tour_repo: TourRepository,
+        caches: CacheRegistry,
+        single_flight: SingleFlight,
     ) -> SearchToursUseCase:
-        return SearchToursUseCase(tour_repo)
+        return SearchToursUseCase(tour_repo, cache=caches.get(TOURS_SEARCH_CACHE), single_flight=single_flight)
 
     @provide(scope=Scope.REQUEST)
     def provide_get_tours_by_ids(
@@ -37,8 +62,9 @@ class TourProvider(Provider):
     def provide_get_tours_aggregates_use_case(
         self,
         tour_repo: TourRepository,
+        single_flight: SingleFlight,
     ) -> GetToursAggregatesUseCase:
-        return GetToursAggregatesUseCase(tour_repo)
+        return GetToursAggregatesUseCase(tour_repo, single_flight=single_flight)
 
     @provide(scope=Scope.REQUEST)
     def provide_get_tours_tarifs_use_case(
@@ -3,8 +3,10 @@ from dynaconf import Dynaconf
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.auth.ports.email_sender import EmailSender
+from src.core.common.rate_limiter import RateLimiter
 from src.core.user.ports.email_change_repository import EmailChangeRepository
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 from src.core.user.use_cases.email_change_confirm import EmailChangeConfirmUseCase
 from src.core.user.use_cases.email_change_start import EmailChangeStartUseCase
 from src.core.user.use_cases.update_me import UpdateMeUseCase
@@ -14,11 +16,17 @@ from src.core.user.use_cases.add_to_favorites import AddToFavoritesUseCase
 from src.core.user.use_cases.delete_from_favorites import DeleteFromFavoritesUseCase
 from src.core.user.use_cases.merge_favorites import MergeFavoritesUseCase
 from src.core.user.use_cases.merge_comparison import MergeComparisonUseCase
+from src.infrastructure.cache.registry import CacheRegistry
 from src.infrastructure.db.repositories.email_change_repo import SqlAlchemyEmailChangeRepository
 from src.infrastructure.db.repositories.user_repo import SqlAlchemyUserRepository
+from src.infrastructure.di.providers.cache import USERS_CACHE
 
 
 class UserProvider(Provider):
+    @provide(scope=Scope.APP)
+    def provide_user_snapshot_cache(self, caches: CacheRegistry) -> UserSnapshotCache:
+        return UserSnapshotCache(caches.get(USERS_CACHE))
+
     @provide(scope=Scope.REQUEST)
     def provide_user_repo(self, session: AsyncSession) -> UserRepository:
         return SqlAlchemyUserRepository(session)
@@ -28,8 +36,12 @@ class UserProvider(Provider):
         return SqlAlchemyEmailChangeRepository(session)
 
     @provide(scope=Scope.REQUEST)
-    def provide_update_me_use_case(self, user_repo: UserRepository) -> UpdateMeUseCase:
-        return UpdateMeUseCase(user_repo)
+    def provide_update_me_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> UpdateMeUseCase:
+        return UpdateMeUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
     def provide_email_change_start_use_case(
@@ -37,6 +49,7 @@ class UserProvider(Provider):
         repo: EmailChangeRepository,
         user_repo: UserRepository,
         email_sender: EmailSender,
+        rate_limiter: RateLimiter,
         settings: Dynaconf,
     ) -> EmailChangeStartUseCase:
         return EmailChangeStartUseCase(
@@ -46,6 +59,8 @@ class UserProvider(Provider):
             frontend_base_url=str(settings.FRONTEND_BASE_URL),
             token_ttl_minutes=int(settings.AUTH_EMAIL_CHANGE_TOKEN_TTL_MINUTES),
             rate_limit_per_hour=int(settings.AUTH_EMAIL_CHANGE_RATE_LIMIT_PER_HOUR),
+            rate_limiter=rate_limiter,
+            ip_rate_limit_per_hour=int(settings.get("AUTH_EMAIL_CHANGE_RATE_LIMIT_PER_IP_PER_HOUR", 20)),
         )
 
     @provide(scope=Scope.REQUEST)
@@ -53,29 +68,54 @@ class UserProvider(Provider):
         self,
         repo: EmailChangeRepository,
         user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
     ) -> EmailChangeConfirmUseCase:
-        return EmailChangeConfirmUseCase(repo=repo, user_repo=user_repo)
+        return EmailChangeConfirmUseCase(repo=repo, user_repo=user_repo, user_cache=user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_add_to_comparison_use_case(self, user_repo: UserRepository) -> AddToComparisonUseCase:
-        return AddToComparisonUseCase(user_repo)
+    def provide_add_to_comparison_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> AddToComparisonUseCase:
+        return AddToComparisonUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_remove_from_comparison_use_case(self, user_repo: UserRepository) -> DeleteFromComparisonUseCase:
-        return DeleteFromComparisonUseCase(user_repo)
+    def provide_remove_from_comparison_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> DeleteFromComparisonUseCase:
+        return DeleteFromComparisonUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_add_to_favorites_use_case(self, user_repo: UserRepository) -> AddToFavoritesUseCase:
-        return AddToFavoritesUseCase(user_repo)
+    def provide_add_to_favorites_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> AddToFavoritesUseCase:
+        return AddToFavoritesUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_remove_from_favorites_use_case(self, user_repo: UserRepository) -> DeleteFromFavoritesUseCase:
-        return DeleteFromFavoritesUseCase(user_repo)
+    def provide_remove_from_favorites_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> DeleteFromFavoritesUseCase:
+        return DeleteFromFavoritesUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_merge_favorites_use_case(self, user_repo: UserRepository) -> MergeFavoritesUseCase:
-        return MergeFavoritesUseCase(user_repo)
+    def provide_merge_favorites_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> MergeFavoritesUseCase:
+        return MergeFavoritesUseCase(user_repo, user_cache)
 
     @provide(scope=Scope.REQUEST)
-    def provide_merge_comparisons_use_case(self, user_repo: UserRepository) -> MergeComparisonUseCase:
-        return MergeComparisonUseCase(user_repo)
+    def provide_merge_comparisons_use_case(
+        self,
+        user_repo: UserRepository,
+        user_cache: UserSnapshotCache,
+    ) -> MergeComparisonUseCase:
+        return MergeComparisonUseCase(user_repo, user_cache)
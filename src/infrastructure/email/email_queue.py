@@ -0,0 +1,163 @@
+"""
+Очередь исходящих писем.
+
+`send_*` только кладет письмо в очередь и сразу возвращает управление - запрос не ждет SMTP,
+даже если очередь переполнена: тогда письмо отбрасывается (лог и счетчик `dropped`).
+Фоновые воркеры забирают письма пачками и отправляют их по своей постоянной SMTP-сессии;
+при временной ошибке письмо возвращается в очередь с экспоненциальной задержкой.
+При остановке письма, ждущие повтора, возвращаются в очередь сразу и отправляются вместе с
+остальными. Очередь живет в памяти процесса: письма, не отправленные к остановке, теряются (пишем в лог).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import smtplib
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Callable, Dict, List
+
+from src.core.auth.ports.email_sender import EmailSender
+from src.infrastructure.email.smtp_email_sender import SmtpEmailSender, SmtpSession
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, при которых повторная отправка не поможет
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPNotSupportedError)
+
+
+@dataclass
+class OutgoingEmail:
+    message: EmailMessage
+    attempts: int = 0
+
+
+class QueuedEmailSender(EmailSender):
+    def __init__(
+        self,
+        *,
+        builder: SmtpEmailSender,
+        session_factory: Callable[[], SmtpSession] | None = None,
+        workers: int = 2,
+        batch_size: int = 20,
+        max_queue_size: int = 1000,
+        max_attempts: int = 5,
+        backoff_seconds: float = 2.0,
+        idle_timeout_seconds: float = 60.0,
+    ) -> None:
+        self.builder = builder
+        self.session_factory = session_factory or builder.new_session
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._queue: asyncio.Queue[OutgoingEmail] = asyncio.Queue(maxsize=max_queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Dict[asyncio.TimerHandle, OutgoingEmail] = {}
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    async def send_magic_link(self, *, to_email: str, magic_link_url: str) -> None:
+        await self._enqueue(self.builder.magic_link_message(to_email=to_email, magic_link_url=magic_link_url))
+
+    async def send_email_change_link(self, *, to_email: str, email_change_url: str) -> None:
+        await self._enqueue(self.builder.email_change_message(to_email=to_email, email_change_url=email_change_url))
+
+    async def _enqueue(self, message: EmailMessage) -> None:
+        self._put(OutgoingEmail(message))
+
+    def _put(self, email: OutgoingEmail) -> None:
+        # Переполненная очередь значит, что SMTP не успевает: запрос не должен ждать его вместе с ней
+        try:
+            self._queue.put_nowait(email)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error("Email to %s dropped: queue is full", email.message["To"])
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(i), name=f"email-worker-{i}") for i in range(self.workers)]
+        logger.info("Email queue started with %s workers", self.workers)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Дождаться отправки уже поставленных в очередь писем (не дольше `timeout`) и остановить воркеров.
+        Письма, ждущие повтора, не ждут своей задержки: они сразу возвращаются в очередь.
+        """
+        if self._tasks:
+            self._flush_retries()
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for handle in self._retries:
+            handle.cancel()
+        dropped = self._queue.qsize() + len(self._retries)
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if dropped:
+            logger.error("Email queue stopped, %s emails were not sent", dropped)
+
+    async def _worker(self, number: int) -> None:
+        session = self.session_factory()
+        try:
+            while True:
+                try:
+                    first = await asyncio.wait_for(self._queue.get(), self.idle_timeout_seconds)
+                except asyncio.TimeoutError:
+                    # Долго нет писем - отпускаем соединение, сервер все равно его закроет
+                    await asyncio.to_thread(session.close)
+                    continue
+                batch = [first]
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                try:
+                    failures = await asyncio.to_thread(self._send_batch, session, batch)
+                    for email, error in failures:
+                        self._schedule_retry(email, error)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            await asyncio.to_thread(session.close)
+
+    def _send_batch(self, session: SmtpSession, batch: List[OutgoingEmail]) -> List[tuple]:
+        failures = []
+        for email in batch:
+            try:
+                session.send(email.message)
+                self.sent += 1
+            except Exception as e:
+                # Состояние соединения после ошибки неизвестно - следующее письмо пойдет по новому
+                session.close()
+                failures.append((email, e))
+        return failures
+
+    def _schedule_retry(self, email: OutgoingEmail, error: Exception) -> None:
+        email.attempts += 1
+        if isinstance(error, PERMANENT_ERRORS) or email.attempts >= self.max_attempts:
+            self.failed += 1
+            logger.error("Email to %s dropped after %s attempts: %s", email.message["To"], email.attempts, error)
+            return
+        delay = self.backoff_seconds * 2 ** (email.attempts - 1)
+        logger.warning("Email to %s failed (%s), retry in %.1fs", email.message["To"], error, delay)
+        loop = asyncio.get_running_loop()
+
+        def requeue() -> None:
+            self._retries.pop(handle, None)
+            self._put(email)
+
+        handle = loop.call_later(delay, requeue)
+        self._retries[handle] = email
+
+    def _flush_retries(self) -> None:
+        retries, self._retries = self._retries, {}
+        for handle, email in retries.items():
+            handle.cancel()
+            self._put(email)
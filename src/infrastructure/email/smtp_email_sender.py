@@ -7,6 +7,65 @@ from email.message import EmailMessage
 from src.core.auth.ports.email_sender import EmailSender
 
 
+class SmtpSession:
+    """
+    Постоянное SMTP-соединение: подключение, STARTTLS и логин выполняются один раз,
+    дальше письма отправляются по уже открытой сессии. Не потокобезопасно - одна сессия на воркер
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        use_tls: bool = True,
+        timeout: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp: smtplib.SMTP | None = None
+        self.connects = 0
+
+    def send(self, msg: EmailMessage) -> None:
+        if self._smtp is None:
+            self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Сервер закрыл простаивающее соединение - переподключаемся один раз
+            self.close()
+            self._connect()
+            self._smtp.send_message(msg)
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def _connect(self) -> None:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self.connects += 1
+
+
 class SmtpEmailSender(EmailSender):
     def __init__(
         self,
@@ -25,30 +84,40 @@ class SmtpEmailSender(EmailSender):
         self.sender_from = sender_from
         self.use_tls = use_tls
 
-    async def send_magic_link(self, *, to_email: str, magic_link_url: str) -> None:
+    def magic_link_message(self, *, to_email: str, magic_link_url: str) -> EmailMessage:
         msg = EmailMessage()
         msg["Subject"] = "Ваш вход в сервис"
         msg["From"] = self.sender_from
         msg["To"] = to_email
         msg.set_content(f"Ссылка для входа (действует ограниченное время):\n\n{magic_link_url}\n")
+        return msg
 
-        await asyncio.to_thread(self._send, msg)
-
-    async def send_email_change_link(self, *, to_email: str, email_change_url: str) -> None:
+    def email_change_message(self, *, to_email: str, email_change_url: str) -> EmailMessage:
         msg = EmailMessage()
         msg["Subject"] = "Подтверждение смены email"
         msg["From"] = self.sender_from
         msg["To"] = to_email
         msg.set_content(f"Подтвердите смену email по ссылке (действует ограниченное время):\n\n{email_change_url}\n")
+        return msg
 
+    def new_session(self) -> SmtpSession:
+        return SmtpSession(
+            host=self.host, port=self.port, user=self.user, password=self.password, use_tls=self.use_tls
+        )
+
+    async def send_magic_link(self, *, to_email: str, magic_link_url: str) -> None:
+        msg = self.magic_link_message(to_email=to_email, magic_link_url=magic_link_url)
+        await asyncio.to_thread(self._send, msg)
+
+    async def send_email_change_link(self, *, to_email: str, email_change_url: str) -> None:
+        msg = self.email_change_message(to_email=to_email, email_change_url=email_change_url)
         await asyncio.to_thread(self._send, msg)
 
     def _send(self, msg: EmailMessage) -> None:
-        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
-            if self.use_tls:
-                smtp.starttls()
-            if self.user:
-                smtp.login(self.user, self.password)
-            smtp.send_message(msg)
+        session = self.new_session()
+        try:
+            session.send(msg)
+        finally:
+            session.close()
 
 
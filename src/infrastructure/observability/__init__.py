@@ -0,0 +1 @@
+"""Observability helpers (structured log formatting, queued log shipping)."""
@@ -0,0 +1,61 @@
+"""
+Коллекторы метрик для значений, которые уже считают другие компоненты:
+статистика in-process кэшей и пула соединений с БД. Вызываются только при выдаче /metrics.
+"""
+from typing import List
+
+from sqlalchemy.pool import Pool
+
+from src.infrastructure.cache.registry import CacheRegistry
+from src.infrastructure.db.pool_admission import PoolAdmission
+from src.infrastructure.observability.metrics import Collector, Counter, Gauge, Metric
+
+
+def cache_collector(caches: CacheRegistry) -> Collector:
+    def collect() -> List[Metric]:
+        hits = Counter("cache_hits_total", "In-process cache hits", ("cache",))
+        misses = Counter("cache_misses_total", "In-process cache misses", ("cache",))
+        evictions = Counter("cache_evictions_total", "In-process cache evictions by size", ("cache",))
+        entries = Gauge("cache_entries", "In-process cache entries", ("cache",))
+        hit_ratio = Gauge("cache_hit_ratio", "In-process cache hit ratio since start", ("cache",))
+        for name, stats in caches.stats().items():
+            labels = (name,)
+            hits.inc(labels, stats.hits)
+            misses.inc(labels, stats.misses)
+            evictions.inc(labels, stats.evictions)
+            entries.set(stats.size, labels)
+            hit_ratio.set(stats.hit_ratio, labels)
+        return [hits, misses, evictions, entries, hit_ratio]
+
+    return collect
+
+
+def db_pool_collector(admission: PoolAdmission, pool: Pool) -> Collector:
+    def collect() -> List[Metric]:
+        stats = admission.stats()
+        capacity = Gauge("db_pool_admission_capacity", "Slots for request sessions")
+        in_use = Gauge("db_pool_admission_in_use", "Request sessions holding a slot")
+        waiting = Gauge("db_pool_admission_waiting", "Requests waiting for a slot")
+        checked_out = Gauge("db_pool_checked_out", "Connections checked out of the SQLAlchemy pool")
+        overflow = Gauge("db_pool_overflow", "Connections open above pool_size")
+        admitted = Counter("db_pool_admitted_total", "Requests admitted to the pool", ("group",))
+        rejected = Counter("db_pool_rejected_total", "Requests rejected with 503 after waiting", ("group",))
+        queued = Counter("db_pool_queued_total", "Requests that waited for a slot", ("group",))
+        wait = Counter("db_pool_wait_seconds_total", "Total time requests waited for a slot", ("group",))
+        wait_max = Gauge("db_pool_wait_seconds_max", "Longest wait for a slot since start", ("group",))
+
+        capacity.set(stats.capacity)
+        in_use.set(stats.in_use)
+        waiting.set(stats.waiting)
+        checked_out.set(pool.checkedout())
+        overflow.set(max(0, pool.overflow()))
+        for name, group in stats.groups.items():
+            labels = (name,)
+            admitted.inc(labels, group.admitted)
+            rejected.inc(labels, group.rejected)
+            queued.inc(labels, group.queued)
+            wait.inc(labels, group.wait_seconds_total)
+            wait_max.set(group.wait_seconds_max, labels)
+        return [capacity, in_use, waiting, checked_out, overflow, admitted, rejected, queued, wait, wait_max]
+
+    return collect
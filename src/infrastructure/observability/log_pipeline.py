@@ -0,0 +1,71 @@
+"""
+Асинхронная доставка логов: обработчики логгеров переносятся за QueueHandler,
+а реальную запись (форматирование, вывод в поток/файл) делает QueueListener в отдельном потоке.
+Event loop только кладет LogRecord в очередь и не ждет ввода-вывода.
+"""
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, List, Tuple
+
+# Атрибуты, которые есть у любого LogRecord; все остальное пришло через `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение и поля из `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _PassThroughQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Стандартный prepare форматирует сообщение в вызывающем потоке (то есть в event loop);
+        # оставляем это слушателю и кладем запись как есть
+        return record
+
+
+QueueLogging = List[Tuple[logging.Logger, QueueListener]]
+
+
+def start_queue_logging(logger_names: Iterable[str] = ("",)) -> QueueLogging:
+    """
+    Перенести обработчики указанных логгеров ("" - корневой) за очереди, по одной на логгер.
+    :return: Запущенные слушатели; при shutdown передать в stop_queue_logging
+    """
+    started: QueueLogging = []
+    for name in logger_names:
+        logger = logging.getLogger(name or None)
+        handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+        if not handlers:
+            continue
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(_PassThroughQueueHandler(records))
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        started.append((logger, listener))
+    return started
+
+
+def stop_queue_logging(started: QueueLogging) -> None:
+    """Дописать оставшиеся в очередях записи и вернуть логгерам исходные обработчики."""
+    for logger, listener in started:
+        listener.stop()
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+                logger.removeHandler(handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
@@ -0,0 +1 @@
+"""Rate limiter adapters (in-process sliding window)."""
@@ -0,0 +1,36 @@
+"""
+Скользящее окно в памяти процесса: для каждого ключа хранятся времена разрешенных попыток
+за последнее окно (не больше `limit` штук). Число ключей ограничено - давно не использованные
+вытесняются, поэтому перебор случайных email не раздувает память.
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque
+
+from src.core.common.rate_limiter import RateLimiter
+
+
+class SlidingWindowRateLimiter(RateLimiter):
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self.rejected = 0
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> bool:
+        now = self._clock()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+        self._hits.move_to_end(key)
+
+        while hits and hits[0] <= now - window_seconds:
+            hits.popleft()
+        if len(hits) >= limit:
+            self.rejected += 1
+            return False
+
+        hits.append(now)
+        while len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+        return True
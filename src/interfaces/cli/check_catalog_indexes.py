@@ -0,0 +1,231 @@
+"""
+Проверка планов запросов каталога: `search`, `get_tours_aggregates` и карточки by_ids
+должны использовать индексы из миграции b3f61d2e8a07, keyset-индекс проекции и ключ календаря цен.
+
+Запросы строятся тем же кодом, что и в репозитории, и прогоняются через EXPLAIN (FORMAT JSON).
+Пересборки витрин (tour_search_projection_refresh и триггеры синхронизации, календарь цен)
+выполняются внутри plpgsql-функций, поэтому их планы собираются через auto_explain
+(log_nested_statements, вывод в NOTICE клиенту) при реальном вызове в той же откатываемой
+транзакции - для этого тоже нужны права суперпользователя (LOAD 'auto_explain').
+С `--seed-copies N` каждый вылет временно размножается N раз со сдвигом дат, чтобы объем данных
+был похож на боевой; все изменения (включая ANALYZE) откатываются в конце. Для засева нужны
+права суперпользователя (триггеры проекции отключаются через session_replication_role).
+
+Запуск (БД с примененными миграциями и мок-данными):
+    python -m src.interfaces.cli.check_catalog_indexes --seed-copies 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import timedelta
+from typing import Iterator, List, Mapping, Set
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infrastructure.db.models.flights import Flights, FlightDirection
+from src.infrastructure.db.reference_data import ReferenceDataRegistry
+from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository
+from src.infrastructure.db.search_projection import refresh_tour_search_projection
+from src.infrastructure.di.container import create_container
+
+logger = logging.getLogger(__name__)
+
+SEED_SQL = (
+    """
+    CREATE TEMP TABLE _seed_flights ON COMMIT DROP AS
+    SELECT f.id AS src_id, gen_random_uuid() AS new_id, g AS shift
+    FROM flights f CROSS JOIN generate_series(1, :copies) AS g
+    """,
+    """
+    INSERT INTO flights (id, tour_id, price, availability_status_id)
+    SELECT s.new_id, f.tour_id, f.price, f.availability_status_id
+    FROM _seed_flights s JOIN flights f ON f.id = s.src_id
+    """,
+    """
+    INSERT INTO flight_directions (flight_id, direction, inclusions, departure_date)
+    SELECT s.new_id, d.direction, d.inclusions, d.departure_date + make_interval(days => s.shift)
+    FROM _seed_flights s JOIN flight_directions d ON d.flight_id = s.src_id
+    """,
+)
+
+# Планы вложенных операторов приходят клиенту как NOTICE "duration: ... plan:\n{json}"
+AUTO_EXPLAIN_SETTINGS = (
+    "SET LOCAL auto_explain.log_min_duration = 0",
+    "SET LOCAL auto_explain.log_nested_statements = on",
+    "SET LOCAL auto_explain.log_format = json",
+    "SET LOCAL auto_explain.log_level = notice",
+)
+
+ANALYZED_TABLES = (
+    "flights", "flight_directions", "flight_layovers", "hotels", "tour_search_projection", "tour_price_calendar_daily",
+)
+
+
+def _index_names(plan: dict) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from _index_names(child)
+
+
+async def _explain(session: AsyncSession, stmt: Select) -> Set[str]:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return set(_index_names(plan[0]["Plan"]))
+
+
+async def _explain_nested(session: AsyncSession, statement: str, params: Mapping) -> Set[str]:
+    """Выполнить statement и собрать индексы из планов всех операторов внутри него (функции, триггеры)."""
+    connection = await session.connection()
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    plans: List[dict] = []
+
+    def on_notice(_, message) -> None:
+        body = message.message
+        if "plan:" in body and "{" in body:
+            plans.append(json.loads(body[body.index("{"):]))
+
+    driver_connection.add_log_listener(on_notice)
+    try:
+        for setting in AUTO_EXPLAIN_SETTINGS:
+            await session.execute(text(setting))
+        await session.execute(text(statement), params)
+        await session.execute(text("SET LOCAL auto_explain.log_min_duration = -1"))
+        # asyncpg вызывает слушателей через call_soon
+        await asyncio.sleep(0)
+    finally:
+        driver_connection.remove_log_listener(on_notice)
+    return {name for plan in plans for name in _index_names(plan["Plan"])}
+
+
+async def _seed(session: AsyncSession, copies: int) -> None:
+    await session.execute(text("SET LOCAL session_replication_role = replica"))
+    for statement in SEED_SQL:
+        await session.execute(text(statement), {"copies": copies})
+    await session.execute(text("SET LOCAL session_replication_role = origin"))
+    rows = await refresh_tour_search_projection(session)
+    logger.info("Seeded x%s, projection rows: %s", copies, rows)
+
+
+async def check(seed_copies: int) -> List[str]:
+    container = create_container()
+    failures: List[str] = []
+    try:
+        session_factory = await container.get(async_sessionmaker[AsyncSession])
+        reference = await (await container.get(ReferenceDataRegistry)).reload()
+
+        async with session_factory() as session:
+            await session.begin()
+            try:
+                if seed_copies > 0:
+                    await _seed(session, seed_copies)
+                for table in ANALYZED_TABLES:
+                    await session.execute(text(f"ANALYZE {table}"))
+
+                repo = SqlAlchemyTourRepository(session, reference)
+                first_date = (await session.execute(
+                    select(func.min(FlightDirection.departure_date)).where(FlightDirection.direction == "outbound")
+                )).scalar_one()
+                if first_date is None:
+                    return ["no flights in the database, nothing to check"]
+                month_end = first_date + timedelta(days=31)
+                flight_ids = list((await session.execute(select(Flights.id).limit(20))).scalars().all())
+                tour_id = (await session.execute(select(Flights.tour_id).limit(1))).scalar_one()
+
+                cases = (
+                    (
+                        "search (single day)",
+                        repo.search_statement(None, None, None, None, "single", first_date, None, None),
+                        {"ix_tour_search_projection_departure_date_flight_id"},
+                    ),
+                    (
+                        "search (range)",
+                        repo.search_statement(None, None, None, None, "range", None, first_date, month_end),
+                        {"ix_tour_search_projection_departure_date_flight_id"},
+                    ),
+                    (
+                        "get_tours_aggregates",
+                        repo.aggregates_statement(first_date, month_end, None, None, None),
+                        {"tour_price_calendar_daily_pkey"},
+                    ),
+                    (
+                        "get_by_id (cards)",
+                        repo.cards_statement(flight_ids),
+                        {
+                            "ix_flight_directions_flight_id_direction_departure_date",
+                            "ix_flight_layovers_flight_direction_id_city",
+                            "ix_hotels_tour_id",
+                        },
+                    ),
+                )
+                # Пересборки витрин: реальный вызов (откатывается вместе с транзакцией)
+                refresh_cases = (
+                    (
+                        "projection refresh",
+                        "SELECT tour_search_projection_refresh(CAST(:flight_ids AS uuid[]))",
+                        {"flight_ids": flight_ids},
+                        {
+                            "ix_flight_directions_flight_id_direction_departure_date",
+                            "ix_flight_layovers_flight_direction_id_city",
+                            "ix_hotels_tour_id",
+                            "tour_price_calendar_daily_pkey",
+                        },
+                    ),
+                    (
+                        "projection sync (tour)",
+                        "UPDATE tours SET title = title WHERE id = :tour_id",
+                        {"tour_id": tour_id},
+                        {"ix_flights_tour_id", "ix_flight_directions_flight_id_direction_departure_date"},
+                    ),
+                )
+
+                results = [(title, await _explain(session, stmt), expected) for title, stmt, expected in cases]
+                try:
+                    await session.execute(text("LOAD 'auto_explain'"))
+                except Exception as e:
+                    print(f"auto_explain is not available ({e.__class__.__name__}), refresh plans are not checked")
+                    failures.extend(title for title, _, _, _ in refresh_cases)
+                else:
+                    for title, statement, params, expected in refresh_cases:
+                        results.append((title, await _explain_nested(session, statement, params), expected))
+
+                for title, used, expected in results:
+                    missing = expected - used
+                    status = "OK" if not missing else "MISSING " + ", ".join(sorted(missing))
+                    print(f"{title:<24} {status:<60} used: {', '.join(sorted(used)) or '-'}")
+                    if missing:
+                        failures.append(title)
+            finally:
+                await session.rollback()
+    finally:
+        await container.close()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--seed-copies",
+        type=int,
+        default=0,
+        help="Сколько раз временно размножить каждый вылет перед проверкой (0 - проверять на текущих данных)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    failures = asyncio.run(check(args.seed_copies))
+    if failures:
+        logger.error("Indexes are not used by: %s", ", ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
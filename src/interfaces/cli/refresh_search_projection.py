@@ -0,0 +1,50 @@
+"""
+Пересборка проекции поиска туров (tour_search_projection).
+
+Запуск:
+    python -m src.interfaces.cli.refresh_search_projection
+    python -m src.interfaces.cli.refresh_search_projection --flight-id <uuid> --flight-id <uuid>
+"""
+import argparse
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.db.search_projection import refresh_tour_search_projection
+from src.infrastructure.di.container import create_container
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh(flight_ids: list[UUID] | None) -> int:
+    container = create_container()
+    try:
+        async with container() as request_container:
+            session = await request_container.get(AsyncSession)
+            rows = await refresh_tour_search_projection(session, flight_ids)
+            await session.commit()
+    finally:
+        await container.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пересборка проекции поиска туров")
+    parser.add_argument(
+        "--flight-id",
+        dest="flight_ids",
+        action="append",
+        type=UUID,
+        help="ID вылета для точечной пересборки (можно указать несколько раз)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    rows = asyncio.run(refresh(args.flight_ids))
+    logger.info("tour_search_projection refreshed: %s rows", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,74 @@
 from __future__ import annotations
 
+from uuid import UUID
+
 from fastapi import Header, HTTPException
 from dishka.integrations.fastapi import FromDishka, inject
 
+from src.core.auth.entities.principal import Principal
 from src.core.auth.ports.token_service import TokenService
 from src.core.user.entities.user import User
 from src.core.user.ports.user_repository import UserRepository
+from src.core.user.snapshot_cache import UserSnapshotCache
 from src.infrastructure.auth.jwt_token_service import TokenError
 
 
-@inject
-async def get_current_user(
-    token_service: FromDishka[TokenService],
-    user_repo: FromDishka[UserRepository],
-    authorization: str | None = Header(default=None, alias="Authorization"),
-) -> User:
+def _verify_bearer(token_service: TokenService, authorization: str | None) -> UUID:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing Bearer token")
     token = authorization.removeprefix("Bearer ").strip()
     try:
-        user_id = token_service.verify_access_token(token)
+        return token_service.verify_access_token(token)
     except TokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+@inject
+async def get_current_principal(
+    token_service: FromDishka[TokenService],
+    authorization: str | None = Header(default=None, alias="Authorization"),
+) -> Principal:
+    """
+    Пользователь только по claims access-токена, без запроса в БД.
+    Для эндпоинтов, которым нужен лишь user_id (изменение избранного, сравнения)
+    """
+    return Principal(user_id=_verify_bearer(token_service, authorization))
+
+
+@inject
+async def get_current_user(
+    token_service: FromDishka[TokenService],
+    user_repo: FromDishka[UserRepository],
+    user_cache: FromDishka[UserSnapshotCache],
+    authorization: str | None = Header(default=None, alias="Authorization"),
+) -> User:
+    """
+    Полный профиль пользователя (с избранным и сравнением) - для эндпоинтов, которым он действительно нужен.
+    Снимок берется из короткоживущего кэша; use case-ы, меняющие пользователя, сбрасывают его
+    """
+    user_id = _verify_bearer(token_service, authorization)
+    user = await user_cache.get(user_id)
+    if user is not None:
+        return user
     user = await user_repo.get_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    await user_cache.set(user)
     return user
 
 
+@inject
+async def get_current_user_for_update(
+    token_service: FromDishka[TokenService],
+    user_repo: FromDishka[UserRepository],
+    authorization: str | None = Header(default=None, alias="Authorization"),
+) -> User:
+    """
+    Профиль пользователя прямо из БД, без кэша снимков - основа для записи.
+    Снимок мог устареть (другой воркер успел изменить пользователя), а update пишет все поля строки
+    """
+    user_id = _verify_bearer(token_service, authorization)
+    user = await user_repo.get_by_id(user_id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
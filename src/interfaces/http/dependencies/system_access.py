@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import hmac
+
+from dynaconf import Dynaconf
+from fastapi import Header, HTTPException
+from dishka.integrations.fastapi import FromDishka, inject
+
+
+@inject
+async def require_system_access(
+    settings: FromDishka[Dynaconf],
+    authorization: str | None = Header(default=None, alias="Authorization"),
+) -> None:
+    """
+    Доступ к служебным эндпоинтам (/system/*, /metrics) только по SYSTEM_ACCESS_TOKEN.
+    Без настроенного токена эндпоинты не видны (404), чтобы их нельзя было открыть случайно
+    """
+    expected = str(settings.get("SYSTEM_ACCESS_TOKEN", "") or "")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = (authorization or "").removeprefix("Bearer ").strip()
+    if not token or not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid system access token")
@@ -0,0 +1,41 @@
+from sqlalchemy.pool import Pool
+
+from src.core.common.cache import CacheStats
+from src.infrastructure.db.pool_admission import PoolAdmissionStats
+from src.interfaces.http.models.system_model import (
+    AdmissionGroupStatsResponse,
+    CacheStatsResponse,
+    DBPoolStatsResponse,
+)
+
+
+def map_cache_stats_to_response(stats: CacheStats) -> CacheStatsResponse:
+    return CacheStatsResponse(
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_size=stats.max_size,
+        hit_ratio=round(stats.hit_ratio, 4),
+    )
+
+
+def map_db_pool_stats_to_response(stats: PoolAdmissionStats, pool: Pool) -> DBPoolStatsResponse:
+    return DBPoolStatsResponse(
+        capacity=stats.capacity,
+        in_use=stats.in_use,
+        waiting=stats.waiting,
+        pool_size=pool.size(),
+        pool_checked_out=pool.checkedout(),
+        pool_overflow=max(0, pool.overflow()),
+        groups={
+            name: AdmissionGroupStatsResponse(
+                admitted=group.admitted,
+                rejected=group.rejected,
+                queued=group.queued,
+                wait_seconds_avg=round(group.wait_seconds_total / group.queued, 4) if group.queued else 0.0,
+                wait_seconds_max=round(group.wait_seconds_max, 4),
+            )
+            for name, group in stats.groups.items()
+        },
+    )
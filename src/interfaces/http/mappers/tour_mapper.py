@@ -1,11 +1,17 @@
+import base64
+import json
+from datetime import datetime
 from typing import List, Optional
+from uuid import UUID
 
 from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor, TourSearchPageReadModel
 from src.core.tours.read_models.tours_aggregates_read_model import ToursAggregatesReadModel
 from src.core.tours.read_models.get_tarifs_read_model import TourTarifReadModel
 from src.core.tours.read_models.tours_departure_cities_read_model import ToursDepartureCitiesReadModel
 from src.interfaces.http.models.tour_model import (
     ToursResponse,
+    ToursPageResponse,
     TourOperator,
     FlightNode,
     FlightDirection,
@@ -65,6 +71,36 @@ def map_search_tours_model_to_response(item: TourSearchReadModel) -> ToursRespon
     )
 
 
+def map_search_tours_page_to_response(page: TourSearchPageReadModel) -> ToursPageResponse:
+    return ToursPageResponse(
+        items=[map_search_tours_model_to_response(item) for item in page.items],
+        next_cursor=encode_search_cursor(page.next_cursor) if page.next_cursor else None,
+    )
+
+
+def encode_search_cursor(cursor: TourSearchCursor) -> str:
+    """Непрозрачный курсор: base64url от ключа сортировки и ID вылета."""
+    payload = json.dumps(
+        {"d": cursor.departure_date.isoformat(), "id": str(cursor.flight_id)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(value: str) -> TourSearchCursor:
+    """Разобрать курсор, полученный от клиента. Бросает ValueError для некорректного значения."""
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        departure_date = datetime.fromisoformat(payload["d"])
+        # departure_date в БД без часового пояса: сравнение с aware-значением упадет уже в запросе
+        if departure_date.tzinfo is not None:
+            raise ValueError("cursor date must be naive")
+        return TourSearchCursor(departure_date=departure_date, flight_id=UUID(payload["id"]))
+    except (ValueError, TypeError, KeyError, UnicodeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
 def _find_direction(flights: List[dict], direction: str) -> Optional[dict]:
     for f in flights:
         if f.get("direction") == direction:
@@ -0,0 +1,86 @@
+"""
+Журнал HTTP-запросов в виде чистого ASGI middleware.
+
+Тело запроса и ответа не читается и не буферизуется: middleware только подменяет `send`,
+чтобы узнать статус ответа. На каждый запрос пишется одна запись с полями
+method / path / status / duration_ms / client в `extra` (для JsonFormatter и подобных);
+если запросы к БД учитываются (QueryBudgetMiddleware снаружи), добавляются db_queries / db_ms.
+Успешные (2xx) ответы можно сэмплировать; ошибки и 3xx/4xx/5xx пишутся всегда.
+"""
+import logging
+import random
+import time
+from typing import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.db.query_tracking import current_query_stats
+
+access_logger = logging.getLogger("src.access")
+
+
+class AccessLogMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        sample_2xx: float = 1.0,
+        logger: logging.Logger = access_logger,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.app = app
+        self.sample_2xx = sample_2xx
+        self.logger = logger
+        self._rand = rand
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, status, (time.perf_counter() - started) * 1000)
+
+    def _log(self, scope: Scope, status: int, duration_ms: float) -> None:
+        if 200 <= status < 300 and self.sample_2xx < 1.0 and self._rand() >= self.sample_2xx:
+            return
+        level = logging.ERROR if status >= 500 else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
+        client = scope.get("client")
+        extra = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "status": status,
+            "duration_ms": round(duration_ms, 2),
+            "client": client[0] if client else None,
+        }
+        queries = current_query_stats.get()
+        if queries is None:
+            self.logger.log(level, "%s %s %s %.1fms", scope["method"], scope["path"], status, duration_ms, extra=extra)
+            return
+        extra["db_queries"] = queries.count
+        extra["db_ms"] = round(queries.total_seconds * 1000, 2)
+        self.logger.log(
+            level,
+            "%s %s %s %.1fms db=%s/%.1fms",
+            scope["method"],
+            scope["path"],
+            status,
+            duration_ms,
+            queries.count,
+            queries.total_seconds * 1000,
+            extra=extra,
+        )
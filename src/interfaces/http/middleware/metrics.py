@@ -0,0 +1,53 @@
+"""
+HTTP-метрики в виде чистого ASGI middleware: запросы в обработке, длительность по маршрутам
+и число ответов по статусам.
+
+Маршрут берется из шаблона пути (`/tours/{tour_id}`), который роутер Starlette кладет в scope;
+запросы, не совпавшие ни с одним маршрутом, идут под меткой "unmatched", чтобы произвольные
+пути не раздували число рядов.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.observability.metrics import MetricsRegistry
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, *, registry: MetricsRegistry) -> None:
+        self.app = app
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being processed")
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route",
+            ("method", "route"),
+        )
+        self.responses = registry.counter(
+            "http_responses_total",
+            "HTTP responses by route and status code",
+            ("method", "route", "status"),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            self.duration.observe(time.perf_counter() - started, labels)
+            self.responses.inc(labels + (str(status),))
@@ -0,0 +1,48 @@
+"""
+Учет SQL-запросов на HTTP-запрос.
+
+Число и суммарное время запросов к БД уходят клиенту в заголовке
+`Server-Timing: db;dur=<мс>;desc="<N> queries"` (видно во вкладке Network браузера) и в журнал
+запросов (AccessLogMiddleware читает ту же статистику). Если запрос выполнил больше `budget`
+statement-ов, пишется предупреждение с самыми частыми отпечатками - типичный след N+1.
+"""
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.db.query_tracking import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp, *, budget: int = 20) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and stats.count:
+                    timing = f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+                    message = {**message, "headers": [*message.get("headers", ()), (b"server-timing", timing.encode())]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        if stats.count > self.budget:
+            repeated = "; ".join(f"{count}x {statement}" for statement, count in stats.most_repeated())
+            logger.warning(
+                "%s %s issued %s queries (budget %s): %s",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                self.budget,
+                repeated,
+                extra={"db_queries": stats.count, "db_budget": self.budget, "path": scope["path"]},
+            )
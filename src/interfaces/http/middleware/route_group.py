@@ -0,0 +1,38 @@
+"""
+Определение группы маршрутов (auth, catalog, ...) по префиксу пути.
+
+Группа кладется в `current_route_group` на время запроса; по ней PoolAdmission выбирает
+приоритет и допустимое ожидание соединения с БД.
+"""
+from typing import Mapping, Sequence
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.infrastructure.db.pool_admission import current_route_group
+
+
+class RouteGroupMiddleware:
+    def __init__(self, app: ASGIApp, *, prefixes: Mapping[str, Sequence[str]]) -> None:
+        self.app = app
+        # Самый длинный префикс проверяется первым
+        self._prefixes = sorted(
+            ((prefix.rstrip("/"), group) for group, group_prefixes in prefixes.items() for prefix in group_prefixes),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def group_for(self, path: str) -> str | None:
+        for prefix, group in self._prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return group
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_route_group.set(self.group_for(scope["path"]))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route_group.reset(token)
@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int = Field(description="Попадания")
+    misses: int = Field(description="Промахи")
+    evictions: int = Field(description="Вытеснения по размеру")
+    size: int = Field(description="Текущее количество записей")
+    max_size: Optional[int] = Field(default=None, description="Максимальное количество записей")
+    hit_ratio: float = Field(description="Доля попаданий")
+
+
+class AdmissionGroupStatsResponse(BaseModel):
+    admitted: int = Field(description="Получили соединение")
+    rejected: int = Field(description="Не дождались соединения (ответ 503)")
+    queued: int = Field(description="Ждали в очереди")
+    wait_seconds_avg: float = Field(description="Среднее ожидание в очереди, сек")
+    wait_seconds_max: float = Field(description="Максимальное ожидание в очереди, сек")
+
+
+class DBPoolStatsResponse(BaseModel):
+    capacity: int = Field(description="Слотов для сессий запросов")
+    in_use: int = Field(description="Занято слотов")
+    waiting: int = Field(description="Запросов в очереди")
+    pool_size: int = Field(description="Постоянных соединений пула")
+    pool_checked_out: int = Field(description="Соединений выдано из пула (включая фоновые задачи)")
+    pool_overflow: int = Field(description="Соединений сверх pool_size")
+    groups: Dict[str, AdmissionGroupStatsResponse] = Field(description="Статистика по группам маршрутов")
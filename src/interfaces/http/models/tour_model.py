@@ -23,7 +23,11 @@ class ToursAggregatesRequest(BaseModel):
     tour_type: Optional[str] = Field(default=None, description="Тип тура")
     tarif: Optional[str] = Field(default=None, description="Тариф")
     operator_id: Optional[int] = Field(default=None, description="ID туроператора")
+    departure_city: Optional[str] = Field(default=None, description="Город вылета")
     pilgrims: Optional[int] = Field(default=1, description="Количество паломников")
+    granularity: Literal["day", "week", "month"] = Field(
+        default="day", description="Шаг календаря [`day`, `week`, `month`]"
+    )
 
 
 class TourOperator(BaseModel):
@@ -83,6 +87,11 @@ class ToursResponse(BaseModel):
     hotels: List[TourHotels]
 
 
+class ToursPageResponse(BaseModel):
+    items: List[ToursResponse]
+    next_cursor: Optional[str] = Field(default=None, description="Курсор следующей страницы (`null` - страница последняя)")
+
+
 class ToursAggregatesResponse(BaseModel):
     date: datetime
     avg_price: int
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from dishka.integrations.fastapi import FromDishka, inject
+
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.interfaces.http.dependencies.system_access import require_system_access
+
+metrics_router = APIRouter(tags=["system"], dependencies=[Depends(require_system_access)])
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = "text/plain; version=0.0.4"
+
+
+@metrics_router.get("/metrics", response_class=PrometheusResponse)
+@inject
+async def get_metrics(
+    registry: FromDishka[MetricsRegistry],
+) -> PrometheusResponse:
+    """
+    Метрики процесса в текстовом формате Prometheus
+    """
+    return PrometheusResponse(registry.render())
@@ -0,0 +1,36 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+from dishka.integrations.fastapi import FromDishka, inject
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infrastructure.cache.registry import CacheRegistry
+from src.infrastructure.db.pool_admission import PoolAdmission
+from src.interfaces.http.dependencies.system_access import require_system_access
+from src.interfaces.http.mappers.system_mapper import map_cache_stats_to_response, map_db_pool_stats_to_response
+from src.interfaces.http.models.system_model import CacheStatsResponse, DBPoolStatsResponse
+
+system_router = APIRouter(prefix="/system", tags=["system"], dependencies=[Depends(require_system_access)])
+
+
+@system_router.get("/caches")
+@inject
+async def get_caches_stats(
+    caches: FromDishka[CacheRegistry],
+) -> Dict[str, CacheStatsResponse]:
+    """
+    Статистика in-process кэшей: попадания, промахи, вытеснения
+    """
+    return {name: map_cache_stats_to_response(stats) for name, stats in caches.stats().items()}
+
+
+@system_router.get("/db-pool")
+@inject
+async def get_db_pool_stats(
+    admission: FromDishka[PoolAdmission],
+    engine: FromDishka[AsyncEngine],
+) -> DBPoolStatsResponse:
+    """
+    Пул соединений с БД: занятые слоты, очередь запросов, ожидание и отказы по группам маршрутов
+    """
+    return map_db_pool_stats_to_response(admission.stats(), engine.sync_engine.pool)
@@ -6,7 +6,7 @@ from dishka.integrations.fastapi import FromDishka, inject
 
 from src.interfaces.http.models.tour_model import (
     SearchToursRequest, ToursResponse, ToursAggregatesRequest, ToursAggregatesResponse, TourTarifsResponse,
-    TourDepartureCitiesResponse, ToursIdsRequest
+    TourDepartureCitiesResponse, ToursIdsRequest, ToursPageResponse
 )
 from src.core.tours.use_cases.search_tours import SearchToursUseCase
 from src.core.tours.use_cases.get_tour_by_ids import GetTourByIdsUseCase
@@ -15,7 +15,7 @@ from src.core.tours.use_cases.get_tarifs import GetTourTarifsUseCase
 from src.core.tours.use_cases.get_tours_departure_cities import GetToursDepartureCitiesUseCase
 from src.interfaces.http.mappers.tour_mapper import (
     map_search_tours_model_to_response, map_aggregates_tour_model_to_response, map_tour_tarif_model_to_response,
-    map_tours_departure_cities_model_to_response
+    map_tours_departure_cities_model_to_response, map_search_tours_page_to_response, decode_search_cursor
 )
 
 tour_router = APIRouter(prefix="/tours", tags=["tours"])
@@ -30,15 +30,40 @@ async def get_tours_by_filters(
     offset: Optional[int] = Query(default=0, ge=0),
 ) -> List[ToursResponse]:
     """
-    Поиск туров по фильтрам
+    Поиск туров по фильтрам (постраничная выдача через limit/offset)
     """
+    _validate_search_request(search_request)
+    params = search_request.model_dump()
+    items = await search_tours_use_case.execute(**params, limit=limit, offset=offset)
+    return [map_search_tours_model_to_response(item) for item in items]
+
+
+@tour_router.post("/page")
+@inject
+async def get_tours_page_by_filters(
+    search_request: SearchToursRequest,
+    search_tours_use_case: FromDishka[SearchToursUseCase],
+    limit: int = Query(default=20, ge=1),
+    cursor: Optional[str] = Query(default=None, description="Курсор из `next_cursor` предыдущей страницы"),
+) -> ToursPageResponse:
+    """
+    Поиск туров по фильтрам с курсорной (keyset) пагинацией
+    """
+    _validate_search_request(search_request)
+    try:
+        page_cursor = decode_search_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+    params = search_request.model_dump()
+    page = await search_tours_use_case.execute_page(**params, limit=limit, cursor=page_cursor)
+    return map_search_tours_page_to_response(page)
+
+
+def _validate_search_request(search_request: SearchToursRequest) -> None:
     if search_request.departure_date_mode == "single" and search_request.departure_date is None:
         raise HTTPException(status_code=400, detail="Дата вылета обязательна для режима `single`")
     if search_request.departure_date_mode == "range" and (search_request.departure_date_start is None or search_request.departure_date_end is None):
         raise HTTPException(status_code=400, detail="Дата начала и окончания обязательны для режима `range`")
-    params = search_request.model_dump()
-    items = await search_tours_use_case.execute(**params, limit=limit, offset=offset)
-    return [map_search_tours_model_to_response(item) for item in items]
 
 
 @tour_router.post("/by_ids")
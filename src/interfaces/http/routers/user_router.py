@@ -8,6 +8,7 @@ from dynaconf import Dynaconf
 from fastapi import APIRouter, Depends, Request
 from dishka.integrations.fastapi import FromDishka, inject
 
+from src.core.auth.entities.principal import Principal
 from src.core.user.entities.user import User
 from src.core.tours.use_cases.get_tour_by_ids import GetTourByIdsUseCase
 from src.core.tours.read_models.tour_search_read_model import TourSearchReadModel
@@ -21,7 +22,11 @@ from src.core.user.use_cases.delete_from_favorites import DeleteFromFavoritesUse
 from src.core.user.use_cases.merge_comparison import MergeComparisonUseCase
 from src.core.user.use_cases.merge_favorites import MergeFavoritesUseCase
 from src.infrastructure.auth.magic_tokens import hash_token
-from src.interfaces.http.dependencies.current_user import get_current_user
+from src.interfaces.http.dependencies.current_user import (
+    get_current_principal,
+    get_current_user,
+    get_current_user_for_update,
+)
 from src.interfaces.http.mappers.user_mapper import map_user_to_response
 from src.interfaces.http.mappers.tour_mapper import map_search_tours_model_to_response
 from src.interfaces.http.models.user_model import (
@@ -45,7 +50,7 @@ user_router = APIRouter(prefix="/users", tags=["users"])
 async def update_me(
     body: UpdateMeRequest,
     use_case: FromDishka[UpdateMeUseCase],
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
 ) -> UserResponse:
     updated = await use_case.execute(
         current_user,
@@ -66,7 +71,7 @@ async def email_change_start(
     body: EmailChangeStartRequest,
     use_case: FromDishka[EmailChangeStartUseCase],
     settings: FromDishka[Dynaconf],
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
 ) -> OkResponse:
     raw_token = secrets.token_urlsafe(32)
     token_hash = hash_token(token=raw_token, pepper=str(settings.AUTH_EMAIL_CHANGE_TOKEN_PEPPER))
@@ -86,7 +91,7 @@ async def email_change_confirm(
     request: Request,
     use_case: FromDishka[EmailChangeConfirmUseCase],
     settings: FromDishka[Dynaconf],
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
 ) -> UserResponse:
     token_hash = hash_token(token=body.token, pepper=str(settings.AUTH_EMAIL_CHANGE_TOKEN_PEPPER))
     result = await use_case.execute(
@@ -103,9 +108,9 @@ async def email_change_confirm(
 async def add_tour_to_favorites(
     body: AddToUserListRequest,
     use_case: FromDishka[AddToFavoritesUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(user_id=current_user.id, tour_id=body.tour_id)
+    result = await use_case.execute(user_id=principal.user_id, tour_id=body.tour_id)
     return OkResponse(ok=result)
 
 
@@ -114,9 +119,9 @@ async def add_tour_to_favorites(
 async def delete_tour_from_favorites(
     body: RemoveFromUserListRequest,
     use_case: FromDishka[DeleteFromFavoritesUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(user_id=current_user.id, tour_id=body.tour_id)
+    result = await use_case.execute(user_id=principal.user_id, tour_id=body.tour_id)
     return OkResponse(ok=result)
 
 
@@ -125,9 +130,9 @@ async def delete_tour_from_favorites(
 async def merge_tour_from_favorites(
     body: MergeUserListRequest,
     use_case: FromDishka[MergeFavoritesUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(tour_ids=body.tour_ids, user_id=current_user.id)
+    result = await use_case.execute(tour_ids=body.tour_ids, user_id=principal.user_id)
     return OkResponse(ok=result)
 
 
@@ -136,9 +141,9 @@ async def merge_tour_from_favorites(
 async def add_tour_to_comparison(
     body: AddToUserListRequest,
     use_case: FromDishka[AddToComparisonUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(user_id=current_user.id, tour_id=body.tour_id)
+    result = await use_case.execute(user_id=principal.user_id, tour_id=body.tour_id)
     return OkResponse(ok=result)
 
 
@@ -147,9 +152,9 @@ async def add_tour_to_comparison(
 async def delete_tour_from_comparison(
     body: RemoveFromUserListRequest,
     use_case: FromDishka[DeleteFromComparisonUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(user_id=current_user.id, tour_id=body.tour_id)
+    result = await use_case.execute(user_id=principal.user_id, tour_id=body.tour_id)
     return OkResponse(ok=result)
 
 
@@ -158,9 +163,9 @@ async def delete_tour_from_comparison(
 async def merge_tour_from_comparison(
     body: MergeUserListRequest,
     use_case: FromDishka[MergeComparisonUseCase],
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ) -> OkResponse:
-    result = await use_case.execute(tour_ids=body.tour_ids, user_id=current_user.id)
+    result = await use_case.execute(tour_ids=body.tour_ids, user_id=principal.user_id)
     return OkResponse(ok=result)
 
 
@@ -1,34 +1,80 @@
+import copy
+import inspect
 import logging
 import logging.config
 import uvicorn
 
-from src.app import app
 from src.infrastructure.di.providers.config import get_settings
 
-if __name__ == "__main__":
-    settings = get_settings()
-    
-    # Настройка логирования из конфига
-    if hasattr(settings, "LOGGING") and settings.LOGGING:
-        logging.config.dictConfig(settings.LOGGING)
-    else:
-        # Базовая настройка логирования
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-    
-    # Настройка uvicorn для логирования запросов
-    log_config = uvicorn.config.LOGGING_CONFIG
+
+def build_log_config(settings) -> dict:
+    """
+    Конфиг логирования для uvicorn: LOGGING из настроек плюс логгеры самого uvicorn.
+    uvicorn применяет его в каждом процессе-воркере, поэтому настраивать logging только
+    в родительском процессе недостаточно.
+    """
+    log_config = copy.deepcopy(uvicorn.config.LOGGING_CONFIG)
     log_config["formatters"]["default"]["fmt"] = "%(asctime)s [%(levelname)s] %(message)s"
     log_config["formatters"]["access"]["fmt"] = "%(asctime)s [%(levelname)s] %(client_addr)s - \"%(request_line)s\" %(status_code)s"
-    
+
+    app_logging = settings.get("LOGGING")
+    if not app_logging:
+        # Базовая настройка логирования
+        log_config["root"] = {"level": "INFO", "handlers": ["default"]}
+        return log_config
+
+    app_logging = dict(app_logging)
+    for section in ("formatters", "handlers", "loggers"):
+        log_config[section] = {**app_logging.get(section, {}), **log_config[section]}
+    for key in ("root", "disable_existing_loggers"):
+        if key in app_logging:
+            log_config[key] = app_logging[key]
+    return log_config
+
+
+def worker_recycling_options(*, workers: int, max_requests: int, max_requests_jitter: int) -> dict:
+    """
+    Параметры uvicorn для перезапуска воркеров после `max_requests` запросов.
+    Перезапускает воркеры только супервизор (WORKERS > 1); один процесс после лимита просто
+    завершился бы, поэтому в этом случае лимит не передается.
+    """
+    if max_requests <= 0:
+        return {}
+    if workers <= 1:
+        logging.getLogger(__name__).warning(
+            "WORKER_MAX_REQUESTS=%s ignored: workers are recycled only when WORKERS > 1", max_requests
+        )
+        return {}
+    options = {"limit_max_requests": max_requests}
+    # Разброс есть не во всех версиях uvicorn; без него воркеры, запущенные вместе, и перезапускаются почти одновременно
+    if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+        options["limit_max_requests_jitter"] = max_requests_jitter
+    return options
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    log_config = build_log_config(settings)
+    logging.config.dictConfig(log_config)
+
+    options = worker_recycling_options(
+        workers=int(settings.workers),
+        max_requests=int(settings.get("WORKER_MAX_REQUESTS", 0)),
+        max_requests_jitter=int(settings.get("WORKER_MAX_REQUESTS_JITTER", 0)),
+    )
+
+    # Приложение передается строкой и собирается фабрикой в каждом воркере: с готовым объектом
+    # uvicorn не может запустить несколько процессов и игнорирует workers
     uvicorn.run(
-        app,
+        "src.app:create_app",
+        factory=True,
         host=settings.host,
         port=settings.port,
         workers=settings.workers,
         log_config=log_config,
         log_level="info",
+        # Запросы пишет AccessLogMiddleware
+        access_log=False,
+        timeout_graceful_shutdown=int(settings.get("WORKER_GRACEFUL_TIMEOUT_SECONDS", 30)),
+        **options,
     )
@@ -0,0 +1,88 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+
+from src.infrastructure.observability.log_pipeline import JsonFormatter, start_queue_logging, stop_queue_logging
+from src.interfaces.http.middleware.access_log import AccessLogMiddleware
+
+
+class _Records(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _app(logger: logging.Logger, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="nope")
+
+    app.add_middleware(AccessLogMiddleware, logger=logger, **options)
+    return app
+
+
+@pytest.fixture
+def access_log():
+    logger = logging.getLogger("tests.access")
+    handler = _Records()
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    yield logger, handler.records
+    logger.handlers = []
+
+
+@pytest.mark.asyncio
+async def test_logs_status_and_leaves_body_to_endpoint(access_log):
+    logger, records = access_log
+    transport = httpx.ASGITransport(app=_app(logger))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/echo?x=1", content=b"a" * 1000)
+
+    assert resp.json() == {"size": 1000}
+    [record] = records
+    assert (record.method, record.path, record.query, record.status) == ("POST", "/echo", "x=1", 200)
+    assert record.duration_ms >= 0
+    assert "aaaa" not in record.getMessage()
+
+
+@pytest.mark.asyncio
+async def test_samples_only_successful_responses(access_log):
+    logger, records = access_log
+    transport = httpx.ASGITransport(app=_app(logger, sample_2xx=0.5, rand=lambda: 0.9))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post("/echo", content=b"")
+        await client.get("/missing")
+
+    assert [record.status for record in records] == [404]
+
+
+def test_queue_logging_formats_extra_fields_as_json():
+    logger = logging.getLogger("tests.queued")
+    handler = _Records()
+    handler.setFormatter(JsonFormatter())
+    logger.handlers = [handler]
+    logger.propagate = False
+
+    started = start_queue_logging((logger.name,))
+    assert handler not in logger.handlers
+    logger.warning("GET %s", "/tours", extra={"status": 200})
+    stop_queue_logging(started)
+
+    assert logger.handlers == [handler]
+    [record] = handler.records
+    formatted = handler.format(record)
+    assert '"message": "GET /tours"' in formatted
+    assert '"status": 200' in formatted
+    logger.handlers = []
@@ -0,0 +1,49 @@
+from uuid import uuid4
+
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.auth.entities.principal import Principal
+from src.core.auth.ports.token_service import TokenService
+from src.infrastructure.auth.jwt_token_service import JoseJWTTokenService
+from src.interfaces.http.dependencies.current_user import get_current_principal
+
+TOKEN_SERVICE = JoseJWTTokenService(secret="test", issuer="test", access_ttl_minutes=5, refresh_ttl_days=1)
+
+
+class _TokenProvider(Provider):
+    @provide(scope=Scope.APP)
+    def token_service(self) -> TokenService:
+        return TOKEN_SERVICE
+
+
+def _client() -> TestClient:
+    # В контейнере нет ни БД, ни UserRepository: principal обязан обходиться без них
+    app = FastAPI()
+    setup_dishka(make_async_container(_TokenProvider()), app)
+
+    @app.get("/whoami")
+    async def whoami(principal: Principal = Depends(get_current_principal)):
+        return {"user_id": str(principal.user_id)}
+
+    return TestClient(app)
+
+
+def test_principal_is_built_from_token_claims():
+    user_id = uuid4()
+    token = TOKEN_SERVICE.issue_access_token(user_id=user_id)
+
+    response = _client().get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": str(user_id)}
+
+
+def test_principal_rejects_refresh_and_missing_tokens():
+    client = _client()
+    refresh = TOKEN_SERVICE.issue_refresh_token(user_id=uuid4())
+
+    assert client.get("/whoami").status_code == 401
+    assert client.get("/whoami", headers={"Authorization": f"Bearer {refresh}"}).status_code == 401
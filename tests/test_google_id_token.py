@@ -0,0 +1,102 @@
+import base64
+import time
+
+import httpx
+import pytest
+import rsa
+from jose import jwt
+
+from src.infrastructure.auth.oauth_validator import HttpxOAuthValidator, OAuthValidationError
+
+CLIENT_ID = "client.apps.googleusercontent.com"
+
+
+def _b64(number: int) -> str:
+    raw = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class _Key:
+    def __init__(self, kid: str):
+        self.kid = kid
+        public, self._private = rsa.newkeys(512)
+        self.jwk = {"kty": "RSA", "alg": "RS256", "use": "sig", "kid": kid, "n": _b64(public.n), "e": _b64(public.e)}
+
+    def sign(self, **claims) -> str:
+        now = int(time.time())
+        payload = {"iss": "https://accounts.google.com", "aud": CLIENT_ID, "sub": "google-1", "iat": now, "exp": now + 600}
+        payload.update(claims)
+        return jwt.encode(payload, self._private.save_pkcs1().decode(), algorithm="RS256", headers={"kid": self.kid})
+
+
+class _Google:
+    """Подмена эндпоинтов Google: JWKS из локально сгенерированных ключей и tokeninfo."""
+
+    def __init__(self, *keys: _Key):
+        self.keys = list(keys)
+        self.jwks_available = True
+        self.calls = {"jwks": 0, "tokeninfo": 0}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/certs":
+            self.calls["jwks"] += 1
+            if not self.jwks_available:
+                return httpx.Response(503)
+            return httpx.Response(
+                200, json={"keys": [key.jwk for key in self.keys]}, headers={"Cache-Control": "public, max-age=3600"}
+            )
+        self.calls["tokeninfo"] += 1
+        return httpx.Response(200, json={"sub": "google-1", "aud": CLIENT_ID})
+
+
+def _validator(google: _Google) -> HttpxOAuthValidator:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(google))
+    return HttpxOAuthValidator(
+        client,
+        endpoints={"google_jwks": "https://google.test/certs", "google_tokeninfo": "https://google.test/tokeninfo"},
+        google_client_id=CLIENT_ID,
+    )
+
+
+@pytest.mark.asyncio
+async def test_id_token_is_verified_locally_with_cached_keys():
+    key = _Key("k1")
+    google = _Google(key)
+    validator = _validator(google)
+
+    for _ in range(3):
+        profile = await validator.validate(provider="google", access_token="", id_token=key.sign(email="a@example.com"))
+        assert profile.provider_account_id == "google-1"
+
+    assert google.calls == {"jwks": 1, "tokeninfo": 0}
+    with pytest.raises(OAuthValidationError):
+        await validator.validate(provider="google", access_token="", id_token=key.sign(aud="someone-else"))
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refreshes_keys():
+    old, new = _Key("old"), _Key("new")
+    google = _Google(old)
+    validator = _validator(google)
+    # Внеочередное обновление по неизвестному kid по умолчанию не чаще раза в 30 секунд
+    validator.google_jwks.min_refresh_interval_seconds = 0
+    await validator.validate(provider="google", access_token="", id_token=old.sign())
+
+    google.keys = [new]
+    profile = await validator.validate(provider="google", access_token="", id_token=new.sign())
+
+    assert profile.provider_account_id == "google-1"
+    assert google.calls["jwks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tokeninfo_is_used_only_when_keys_are_unavailable():
+    key = _Key("k1")
+    google = _Google(key)
+    google.jwks_available = False
+    validator = _validator(google)
+
+    profile = await validator.validate(provider="google", access_token="", id_token=key.sign())
+
+    assert profile.provider_account_id == "google-1"
+    assert google.calls == {"jwks": 1, "tokeninfo": 1}
@@ -0,0 +1,52 @@
+import hashlib
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.auth import jwt_token_service
+from src.infrastructure.auth.jwt_token_service import JoseJWTTokenService, TokenError
+from src.infrastructure.cache.lru_cache import LRUCache
+from tests.utils import FakeClock
+
+
+def _service(lru_clock=None):
+    cache = LRUCache(max_size=16, clock=lru_clock) if lru_clock else LRUCache(max_size=16)
+    return JoseJWTTokenService(
+        secret="test", issuer="test", access_ttl_minutes=5, refresh_ttl_days=1, verify_cache=cache
+    )
+
+
+def test_repeated_token_is_decoded_once(monkeypatch):
+    service = _service()
+    user_id = uuid4()
+    token = service.issue_access_token(user_id=user_id)
+    decode = jwt_token_service.jwt.decode
+    calls = []
+    monkeypatch.setattr(jwt_token_service.jwt, "decode", lambda *a, **kw: calls.append(1) or decode(*a, **kw))
+
+    assert [service.verify_access_token(token) for _ in range(3)] == [user_id] * 3
+    assert len(calls) == 1
+    assert service.verify_cache.stats().hits == 2
+
+
+def test_cached_entry_does_not_outlive_token():
+    lru_clock = FakeClock()
+    service = _service(lru_clock)
+    token = service.issue_access_token(user_id=uuid4())
+    service.verify_access_token(token)
+    assert len(service.verify_cache) == 1
+
+    # access-токен живет 5 минут - запись в кэше должна истечь вместе с ним
+    lru_clock.now = 5 * 60 + 1
+    key = hashlib.sha256(token.encode()).hexdigest()
+    assert service.verify_cache.get(key) is None
+
+
+def test_rejected_tokens_are_not_cached():
+    service = _service()
+    refresh = service.issue_refresh_token(user_id=uuid4())
+
+    for _ in range(2):
+        with pytest.raises(TokenError):
+            service.verify_access_token(refresh)
+    assert len(service.verify_cache) == 0
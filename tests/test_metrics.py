@@ -0,0 +1,119 @@
+import httpx
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from dynaconf import Dynaconf
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.infrastructure.db.query_metrics import install_query_metrics, instrumented_repository
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.interfaces.http.middleware.metrics import MetricsMiddleware
+from src.interfaces.http.routers.metrics_router import metrics_router
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, ("/tours",))
+    registry.counter("hits_total", "Hits", ("route",)).inc(("/a\"b",), 2)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/tours",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/tours",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/tours",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/tours"} 4' in lines
+    assert 'latency_seconds_sum{route="/tours"} 4.25' in lines
+    assert 'hits_total{route="/a\\"b"} 2' in lines
+
+
+def test_const_labels_are_added_to_every_series():
+    registry = MetricsRegistry(const_labels={"worker": "42"})
+    registry.counter("hits_total", "Hits", ("route",)).inc(("/tours",))
+    registry.gauge("in_flight", "In flight").set(3)
+
+    lines = registry.render().splitlines()
+
+    assert 'hits_total{worker="42",route="/tours"} 1' in lines
+    assert 'in_flight{worker="42"} 3' in lines
+
+
+def test_registering_same_metric_twice_returns_existing():
+    registry = MetricsRegistry()
+    assert registry.counter("c_total", "C") is registry.counter("c_total", "C")
+    with pytest.raises(ValueError):
+        registry.gauge("c_total", "C")
+
+
+@pytest.mark.asyncio
+async def test_queries_are_labeled_with_repository_method():
+    registry = MetricsRegistry()
+    engine = create_engine("sqlite://")
+    install_query_metrics(engine, registry)
+
+    @instrumented_repository
+    class SqlAlchemyThingRepository:
+        async def count(self) -> int:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                return connection.execute(text("SELECT 2")).scalar_one()
+
+    assert await SqlAlchemyThingRepository().count() == 2
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 3"))
+
+    durations = registry.histogram("db_query_duration_seconds", "", ("operation",))
+    assert durations.count(("SqlAlchemyThingRepository.count",)) == 2
+    assert durations.count(("other",)) == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+
+    @app.get("/tours/{tour_id}")
+    async def tour(tour_id: int):
+        return {"id": tour_id}
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/tours/1")
+        await client.get("/tours/2")
+        await client.get("/unknown")
+
+    responses = registry.counter("http_responses_total", "", ("method", "route", "status"))
+    assert responses.value(("GET", "/tours/{tour_id}", "200")) == 2
+    assert responses.value(("GET", "unmatched", "404")) == 1
+    assert registry.gauge("http_requests_in_flight", "").value() == 0
+
+
+def _metrics_client(token: str) -> TestClient:
+    class _SettingsProvider(Provider):
+        @provide(scope=Scope.APP)
+        def settings(self) -> Dynaconf:
+            return Dynaconf(SYSTEM_ACCESS_TOKEN=token)
+
+        @provide(scope=Scope.APP)
+        def registry(self) -> MetricsRegistry:
+            return MetricsRegistry()
+
+    app = FastAPI()
+    setup_dishka(make_async_container(_SettingsProvider()), app)
+    app.include_router(metrics_router)
+    return TestClient(app)
+
+
+def test_metrics_endpoint_requires_system_token():
+    client = _metrics_client("secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
+    # Без настроенного токена служебные эндпоинты закрыты
+    assert _metrics_client("").get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.infrastructure.auth.oauth_validator import HttpxOAuthValidator, OAuthProviderLimits
+
+
+class _StubServer:
+    """Минимальный HTTP/1.1 сервер с keep-alive: считает TCP-соединения и запросы."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                body = json.dumps({"sub": "google-1", "email": "a@example.com", "email_verified": True}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.asyncio
+async def test_logins_reuse_pooled_connection():
+    async with _StubServer() as server, httpx.AsyncClient() as client:
+        validator = HttpxOAuthValidator(client, endpoints={"google_userinfo": f"{server.base_url}/userinfo"})
+
+        for _ in range(5):
+            profile = await validator.validate(provider="google", access_token="token")
+            assert profile.provider_account_id == "google-1"
+
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_timeout_and_concurrency_limit():
+    async with _StubServer(delay=0.2) as server, httpx.AsyncClient() as client:
+        validator = HttpxOAuthValidator(
+            client,
+            limits={"google": OAuthProviderLimits(timeout_seconds=0.05, max_concurrency=1)},
+            endpoints={"google_userinfo": f"{server.base_url}/userinfo"},
+        )
+
+        with pytest.raises(httpx.TimeoutException):
+            await validator.validate(provider="google", access_token="token")
+
+        # Семафоры строятся в конструкторе: для новых лимитов нужен новый валидатор
+        validator = HttpxOAuthValidator(
+            client,
+            limits={"google": OAuthProviderLimits(timeout_seconds=1.0, max_concurrency=1)},
+            endpoints={"google_userinfo": f"{server.base_url}/userinfo"},
+        )
+        before = server.connections
+        await asyncio.gather(*(validator.validate(provider="google", access_token="token") for _ in range(3)))
+        # Семафор пропускает запросы к провайдеру по одному - хватает одного соединения
+        assert server.connections - before == 1
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from sqlalchemy.exc import UnboundExecutionError
+
+from src.infrastructure.db.pool_admission import (
+    AdmissionGroup,
+    AdmittedSession,
+    PoolAdmission,
+    PoolSaturatedError,
+    current_route_group,
+)
+from src.interfaces.http.middleware.route_group import RouteGroupMiddleware
+
+GROUPS = {
+    "auth": AdmissionGroup(priority=0, max_wait_seconds=1.0),
+    "catalog": AdmissionGroup(priority=1, max_wait_seconds=1.0),
+    "default": AdmissionGroup(priority=1, max_wait_seconds=0.05),
+}
+
+
+async def _hold(admission: PoolAdmission, group: str, release: asyncio.Event, order: list) -> None:
+    async with admission.acquire(group):
+        order.append(group)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority():
+    admission = PoolAdmission(1, GROUPS, default_group="default")
+    release = asyncio.Event()
+    order = []
+    holder = asyncio.create_task(_hold(admission, "catalog", release, order))
+    await asyncio.sleep(0)
+    catalog = asyncio.create_task(_hold(admission, "catalog", release, order))
+    await asyncio.sleep(0)
+    auth = asyncio.create_task(_hold(admission, "auth", release, order))
+    await asyncio.sleep(0)
+    assert admission.stats().waiting == 2
+
+    release.set()
+    await asyncio.gather(holder, catalog, auth)
+
+    assert order == ["catalog", "auth", "catalog"]
+    stats = admission.stats()
+    assert (stats.in_use, stats.waiting) == (0, 0)
+    assert stats.groups["auth"].queued == 1
+
+
+@pytest.mark.asyncio
+async def test_saturation_raises_after_group_wait():
+    admission = PoolAdmission(1, GROUPS, default_group="default", retry_after_seconds=3)
+    async with admission.acquire("catalog"):
+        token = current_route_group.set("unknown")
+        try:
+            with pytest.raises(PoolSaturatedError) as exc_info:
+                async with admission.acquire():
+                    pass
+        finally:
+            current_route_group.reset(token)
+
+    assert exc_info.value.retry_after_seconds == 3
+    assert admission.stats().groups["default"].rejected == 1
+    assert admission.stats().in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    admission = PoolAdmission(1, GROUPS, default_group="default")
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(admission, "catalog", release, []))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_hold(admission, "auth", release, []))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    release.set()
+    await holder
+    assert admission.stats().in_use == 0
+    async with admission.acquire("auth"):
+        assert admission.stats().in_use == 1
+
+
+@pytest.mark.asyncio
+async def test_session_takes_slot_on_first_db_access_only():
+    admission = PoolAdmission(1, GROUPS, default_group="default")
+    async with admission.acquire("catalog"):
+        # Сессия, которая так и не обратилась к БД (ответ из кэша), не ждет слот
+        async with AdmittedSession(admission=admission) as session:
+            await session.commit()
+        assert admission.stats().groups["default"].queued == 0
+
+        async with AdmittedSession(admission=admission) as session:
+            with pytest.raises(PoolSaturatedError):
+                await session.execute("SELECT 1")
+
+    async with AdmittedSession(admission=admission) as session:
+        # Без bind соединение не выдается, но слот уже занят - до закрытия сессии
+        with pytest.raises(UnboundExecutionError):
+            await session.connection()
+        assert session.admitted
+        assert admission.stats().in_use == 1
+    assert admission.stats().in_use == 0
+
+
+def test_route_group_uses_longest_prefix():
+    middleware = RouteGroupMiddleware(None, prefixes={"auth": ["/auth", "/users"], "catalog": ["/tours"], "tours_admin": ["/tours/admin/"]})
+    assert middleware.group_for("/auth/refresh") == "auth"
+    assert middleware.group_for("/users") == "auth"
+    assert middleware.group_for("/tours/admin/sync") == "tours_admin"
+    assert middleware.group_for("/toursearch") is None
@@ -0,0 +1,98 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from src.infrastructure.db.query_metrics import install_query_metrics
+from src.infrastructure.db.query_tracking import fingerprint, install_query_tracking, track_queries
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.interfaces.http.middleware.query_budget import QueryBudgetMiddleware
+from tests.utils import assert_max_queries
+
+
+def test_fingerprint_strips_literals_and_collapses_in_lists():
+    statement = (
+        "SELECT users.id FROM users\n  WHERE users.id IN ($1::UUID, $2::UUID, $3::UUID)"
+        " AND users.email = 'a@b.c' AND users.age > 18 LIMIT $4::INTEGER"
+    )
+    assert fingerprint(statement) == "SELECT users.id FROM users WHERE users.id IN (...) AND users.email = ? AND users.age > ? LIMIT ?"
+    assert fingerprint("SELECT 1 FROM t WHERE id = :id_1") == fingerprint("SELECT 2 FROM t WHERE id = :id_2")
+
+
+def _engine(**options):
+    engine = create_engine("sqlite://")
+    install_query_tracking(engine, **options)
+    return engine
+
+
+def test_nested_blocks_count_into_outer_ones():
+    engine = _engine()
+    with engine.connect() as connection, track_queries() as outer:
+        connection.execute(text("SELECT 1"))
+        with track_queries() as inner:
+            connection.execute(text("SELECT 2"))
+            connection.execute(text("SELECT 3"))
+
+    assert (outer.count, inner.count) == (3, 2)
+    assert outer.most_repeated(1) == [("SELECT ?", 3)]
+
+
+def test_slow_queries_are_logged_outside_of_tracking(caplog):
+    engine = _engine(slow_query_seconds=0)
+    with caplog.at_level(logging.WARNING, logger="src.db.slow_queries"), engine.connect() as connection:
+        connection.execute(text("SELECT 42"))
+
+    [record] = caplog.records
+    assert record.fingerprint == "SELECT ?"
+    assert record.operation == "other"
+
+
+def _app(engine, budget: int = 20) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tours")
+    async def tours(n: int = 1):
+        with engine.connect() as connection:
+            return [connection.execute(text("SELECT :id"), {"id": i}).scalar_one() for i in range(n)]
+
+    app.add_middleware(QueryBudgetMiddleware, budget=budget)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header_and_budget_warning(caplog):
+    transport = httpx.ASGITransport(app=_app(_engine(), budget=2))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING, logger="src.interfaces.http.middleware.query_budget"):
+            resp = await client.get("/tours", params={"n": 3})
+
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert resp.headers["server-timing"].endswith('desc="3 queries"')
+    assert "issued 3 queries (budget 2): 3x SELECT ?" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_assert_max_queries_catches_n_plus_one():
+    transport = httpx.ASGITransport(app=_app(_engine()))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with assert_max_queries(2):
+            await client.get("/tours", params={"n": 2})
+        with pytest.raises(AssertionError, match="Expected at most 2 queries, got 5"):
+            with assert_max_queries(2):
+                await client.get("/tours", params={"n": 5})
+
+
+def test_tracking_and_metrics_share_one_timing_listener_pair():
+    registry = MetricsRegistry()
+    engine = _engine()
+    install_query_metrics(engine, registry)
+
+    with engine.connect() as connection, track_queries() as stats:
+        connection.execute(text("SELECT 1"))
+
+    assert len(engine.dispatch.before_cursor_execute) == 1
+    assert len(engine.dispatch.after_cursor_execute) == 1
+    durations = registry.histogram("db_query_duration_seconds", "", ("operation",))
+    assert stats.count == durations.count(("other",)) == 1
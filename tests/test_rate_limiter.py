@@ -0,0 +1,75 @@
+import pytest
+
+from src.core.auth.use_cases.magic_start import MagicStartUseCase
+from src.infrastructure.rate_limit.sliding_window import SlidingWindowRateLimiter
+from tests.utils import FakeClock
+
+
+class _NoDbRepo:
+    async def count_recent_requests(self, **kwargs):
+        raise AssertionError("rate limiter must reject before the DB is queried")
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_limits_per_key():
+    clock = FakeClock()
+    limiter = SlidingWindowRateLimiter(clock=clock)
+
+    assert [await limiter.hit("a", 2, 60) for _ in range(3)] == [True, True, False]
+    assert await limiter.hit("b", 2, 60)
+
+    clock.now = 60.5
+    assert await limiter.hit("a", 2, 60)
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_evicts_least_recent_keys():
+    limiter = SlidingWindowRateLimiter(max_keys=2)
+    for key in ("a", "b", "c"):
+        await limiter.hit(key, 1, 60)
+
+    # "a" вытеснен - лимит для него начинается заново
+    assert await limiter.hit("a", 1, 60)
+    assert not await limiter.hit("c", 1, 60)
+
+
+@pytest.mark.asyncio
+async def test_magic_start_rejects_before_db_access():
+    limiter = SlidingWindowRateLimiter()
+    await limiter.hit("magic_start:a@example.com", 1, 3600)
+    use_case = MagicStartUseCase(
+        magic_repo=_NoDbRepo(),
+        email_sender=None,
+        token_ttl_minutes=15,
+        rate_limit_per_hour=1,
+        frontend_base_url="http://front",
+        rate_limiter=limiter,
+    )
+
+    result = await use_case.execute(email="a@example.com", raw_token="raw", token_hash="hash")
+
+    assert result.ok
+
+
+@pytest.mark.asyncio
+async def test_magic_start_limits_requests_per_ip_across_emails():
+    limiter = SlidingWindowRateLimiter()
+    await limiter.hit("magic_start_ip:10.0.0.1", 1, 3600)
+    use_case = MagicStartUseCase(
+        magic_repo=_NoDbRepo(),
+        email_sender=None,
+        token_ttl_minutes=15,
+        rate_limit_per_hour=5,
+        frontend_base_url="http://front",
+        rate_limiter=limiter,
+        ip_rate_limit_per_hour=1,
+    )
+
+    result = await use_case.execute(
+        email="fresh@example.com", raw_token="raw", token_hash="hash", request_ip="10.0.0.1"
+    )
+
+    assert result.ok
+    # Отказ по IP не расходует лимит адреса
+    assert await limiter.hit("magic_start:fresh@example.com", 1, 3600)
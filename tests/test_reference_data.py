@@ -0,0 +1,40 @@
+import pytest
+
+from src.infrastructure.db.reference_data import ReferenceDataRegistry
+from tests.utils import FakeSessionFactory, reference_data
+
+
+def test_reference_catalog_lookups():
+    tarifs = reference_data(1).tarifs
+
+    assert [item.id for item in tarifs.items] == [1, 2]
+    assert tarifs.id_of("comfort") == 2
+    assert tarifs.value_of(1) == "budget"
+    assert tarifs.label_of(2) == "Комфорт"
+    assert tarifs.id_of("unknown") is None
+    assert tarifs.label_of(42) is None
+
+
+@pytest.mark.asyncio
+async def test_registry_reloads_only_when_version_changes(monkeypatch):
+    registry = ReferenceDataRegistry(FakeSessionFactory(), refresh_interval_seconds=0)
+    db_version = {"value": 1}
+    loads = []
+
+    async def fetch_version(session):
+        return db_version["value"]
+
+    async def load(session):
+        loads.append(db_version["value"])
+        return reference_data(db_version["value"])
+
+    monkeypatch.setattr(registry, "_fetch_version", fetch_version)
+    monkeypatch.setattr(registry, "_load", load)
+
+    first = await registry.refresh_if_stale()
+    assert await registry.refresh_if_stale() is first
+    assert loads == [1]
+
+    db_version["value"] = 2
+    assert (await registry.refresh_if_stale()).version == 2
+    assert loads == [1, 2]
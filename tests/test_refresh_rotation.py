@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.core.auth.use_cases.refresh_tokens import RefreshTokensUseCase
+from src.core.user.entities.user import User
+from src.infrastructure.auth.jwt_token_service import JoseJWTTokenService
+from src.infrastructure.db.repositories.auth_repo import SqlAlchemyRefreshTokenRepository
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TOKEN_SERVICE = JoseJWTTokenService(secret="test", issuer="test", access_ttl_minutes=5, refresh_ttl_days=1)
+
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+
+class _Repo:
+    def __init__(self, user):
+        self.user = user
+        self.session = _Session()
+        self.rotations = []
+
+    async def rotate_token(self, **kwargs):
+        self.rotations.append(kwargs)
+        return self.user if self.user and kwargs["user_id"] == self.user.id else None
+
+
+def _use_case(repo):
+    return RefreshTokensUseCase(
+        token_service=TOKEN_SERVICE, refresh_token_repo=repo, refresh_token_pepper="pepper", refresh_ttl_days=1
+    )
+
+
+def test_rotate_statement_is_a_single_cte():
+    stmt = SqlAlchemyRefreshTokenRepository.rotate_statement(
+        old_token_hash="old",
+        user_id=uuid4(),
+        new_token_id=uuid4(),
+        new_token_hash="new",
+        expires_at=NOW,
+        now=NOW,
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert sql.startswith("WITH consumed AS \n(UPDATE refresh_tokens SET used_at=")
+    assert "inserted AS \n(INSERT INTO refresh_tokens" in sql
+    assert "refresh_tokens.used_at IS NULL AND refresh_tokens.expires_at >= '2026-01-01 00:00:00+00:00'" in sql
+    assert "FROM owner JOIN inserted ON inserted.user_id = owner.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_in_one_repository_call():
+    user = User(id=uuid4(), email="a@example.com")
+    repo = _Repo(user)
+    refresh = TOKEN_SERVICE.issue_refresh_token(user_id=user.id)
+
+    result = await _use_case(repo).execute(refresh_token=refresh, now=NOW)
+
+    assert result.user is user
+    assert TOKEN_SERVICE.verify_refresh_token(result.tokens.refresh) == user.id
+    assert len(repo.rotations) == 1
+    assert repo.rotations[0]["new_token_hash"] != repo.rotations[0]["old_token_hash"]
+    assert repo.session.calls == ["commit"]
+
+
+@pytest.mark.asyncio
+async def test_failed_rotation_rolls_back():
+    repo = _Repo(None)
+    refresh = TOKEN_SERVICE.issue_refresh_token(user_id=uuid4())
+
+    with pytest.raises(ValueError):
+        await _use_case(repo).execute(refresh_token=refresh, now=NOW)
+    assert repo.session.calls == ["rollback"]
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+
+from src.core.tours.use_cases.search_tours import SearchToursUseCase
+from src.infrastructure.cache import versioned_cache
+from src.infrastructure.cache.lru_cache import InMemoryCacheBackend, LRUCache
+from src.infrastructure.cache.versioned_cache import CatalogVersionedCache
+from tests.utils import FakeClock, FakeSessionFactory
+
+
+class _CountingRepo:
+    def __init__(self):
+        self.calls = 0
+
+    async def search(self, *args):
+        self.calls += 1
+        return [self.calls]
+
+
+def test_lru_cache_ttl_and_eviction():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, default_ttl_seconds=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # вытесняет "b" - он дольше всех не использовался
+
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_search_use_case_caches_normalized_requests():
+    repo = _CountingRepo()
+    use_case = SearchToursUseCase(repo, cache=InMemoryCacheBackend(LRUCache(max_size=16)))
+    params = dict(
+        tour_type="umrah",
+        tarif=None,
+        operator_id=None,
+        departure_city="Москва",
+        departure_date_mode="single",
+        departure_date_start=None,
+        departure_date_end=None,
+    )
+
+    first = await use_case.execute(**params, departure_date=datetime(2026, 3, 1, 9), pilgrims=1)
+    # Другое время того же дня и другое число паломников на выдачу не влияют
+    second = await use_case.execute(**params, departure_date=datetime(2026, 3, 1, 18), pilgrims=3)
+    other_page = await use_case.execute(**params, departure_date=datetime(2026, 3, 1), pilgrims=1, offset=20)
+
+    assert first == second == [1]
+    assert other_page == [2]
+    assert repo.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_clears_on_catalog_version_change(monkeypatch):
+    version = {"value": 1}
+
+    async def get_catalog_version(session, name):
+        return version["value"]
+
+    monkeypatch.setattr(versioned_cache, "get_catalog_version", get_catalog_version)
+    cache = CatalogVersionedCache(
+        InMemoryCacheBackend(LRUCache(max_size=16)), FakeSessionFactory(), catalog="catalog", check_interval_seconds=0
+    )
+
+    await cache.set("key", "value")
+    assert await cache.get("key") == "value"
+
+    version["value"] = 2
+    assert await cache.get("key") is None
+    assert cache.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_versioned_cache_drops_result_loaded_before_version_change(monkeypatch):
+    version = {"value": 1}
+
+    async def get_catalog_version(session, name):
+        return version["value"]
+
+    monkeypatch.setattr(versioned_cache, "get_catalog_version", get_catalog_version)
+    cache = CatalogVersionedCache(
+        InMemoryCacheBackend(LRUCache(max_size=16)), FakeSessionFactory(), catalog="catalog", check_interval_seconds=0
+    )
+
+    assert await cache.get("key") is None
+    # Пока результат грузился по старому каталогу, версия сменилась
+    version["value"] = 2
+    await cache.set("key", "stale")
+
+    assert await cache.get("key") is None
+    assert cache.stale_writes == 1
+
+    await cache.set("key", "fresh")
+    assert await cache.get("key") == "fresh"
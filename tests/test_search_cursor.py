@@ -0,0 +1,32 @@
+import base64
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor
+from src.interfaces.http.mappers.tour_mapper import encode_search_cursor, decode_search_cursor
+
+
+def test_search_cursor_roundtrip():
+    cursor = TourSearchCursor(departure_date=datetime(2026, 3, 14, 9, 30), flight_id=uuid4())
+
+    token = encode_search_cursor(cursor)
+
+    assert "=" not in token
+    assert decode_search_cursor(token) == cursor
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "eyJkIjoxfQ", "W10"])
+def test_decode_search_cursor_rejects_garbage(token):
+    with pytest.raises(ValueError):
+        decode_search_cursor(token)
+
+
+def test_decode_search_cursor_rejects_timezone_aware_date():
+    payload = {"d": datetime(2026, 3, 14, 9, 30, tzinfo=timezone.utc).isoformat(), "id": str(uuid4())}
+    token = base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+    with pytest.raises(ValueError):
+        decode_search_cursor(token)
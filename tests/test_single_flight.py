@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.core.common.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["result"]
+
+    tasks = [asyncio.create_task(single_flight.do("key", query)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*tasks)
+    assert calls == 1
+    assert all(result == ["result"] for result in results)
+    assert single_flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    single_flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("db is down")
+
+    results = await asyncio.gather(*(single_flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def ok():
+        return 42
+
+    assert await single_flight.do("key", ok) == 42
+
+
+@pytest.mark.asyncio
+async def test_follower_retries_when_leader_is_cancelled():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    leader = asyncio.create_task(single_flight.do("key", query))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.do("key", query))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_is_not_retried_with_leader():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    leader = asyncio.create_task(single_flight.do("key", query))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.do("key", query))
+    await asyncio.sleep(0)
+    # Клиент ушел одновременно с ведущим: ожидающий не должен запускать вызов заново
+    leader.cancel()
+    follower.cancel()
+
+    for task in (leader, follower):
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert calls == 1
+    assert single_flight.in_flight() == 0
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.infrastructure.db.models.auth import MagicLinkTokens
+from src.infrastructure.db.token_janitor import (
+    REFRESH_DEFAULT_HAS_ROWS_SQL,
+    REFRESH_PARTITIONS_SQL,
+    TokenJanitor,
+    expired_refresh_token_partitions,
+    purge_batch_statement,
+)
+from tests.utils import compile_sql
+
+
+class _Result:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class _Session:
+    def __init__(self, factory):
+        self.factory = factory
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        table = stmt.table.name
+        self.factory.statements.append(table)
+        return _Result(self.factory.rowcounts[table].pop(0) if self.factory.rowcounts.get(table) else 0)
+
+    async def commit(self):
+        self.factory.commits += 1
+
+
+class _SessionFactory:
+    def __init__(self, rowcounts):
+        self.rowcounts = rowcounts
+        self.statements = []
+        self.commits = 0
+
+    def __call__(self):
+        return _Session(self)
+
+
+def test_purge_statement_is_bounded_and_skips_locked_rows():
+    cutoff = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    sql = compile_sql(purge_batch_statement(MagicLinkTokens, cutoff=cutoff, batch_size=500))
+
+    assert sql.startswith("DELETE FROM magic_link_tokens WHERE magic_link_tokens.id IN (SELECT")
+    assert "LIMIT 500 FOR UPDATE SKIP LOCKED" in sql
+    assert "magic_link_tokens.expires_at < '2026-01-01 00:00:00+00:00'" in sql
+    assert "magic_link_tokens.used_at < '2026-01-01 00:00:00+00:00'" in sql
+
+
+@pytest.mark.asyncio
+async def test_run_once_deletes_in_batches_and_reports_per_table():
+    factory = _SessionFactory({"magic_link_tokens": [2, 2, 1], "refresh_tokens": [2, 0]})
+    janitor = TokenJanitor(factory, batch_size=2, retention=timedelta(minutes=60))
+
+    async def no_partitions(now):
+        return []
+
+    janitor.maintain_refresh_token_partitions = no_partitions
+    removed = await janitor.run_once()
+
+    assert removed == {"magic_link_tokens": 5, "email_change_tokens": 0, "refresh_tokens": 2}
+    # Каждая пачка - отдельная транзакция
+    assert factory.commits == len(factory.statements) == 3 + 1 + 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_purges_even_if_partition_maintenance_fails():
+    factory = _SessionFactory({"refresh_tokens": [1]})
+    janitor = TokenJanitor(factory, batch_size=2)
+
+    async def failing_partitions(now):
+        raise RuntimeError("relation already exists")
+
+    janitor.maintain_refresh_token_partitions = failing_partitions
+    removed = await janitor.run_once()
+
+    assert removed["refresh_tokens"] == 1
+    assert factory.statements == ["magic_link_tokens", "email_change_tokens", "refresh_tokens"]
+
+
+def test_only_fully_expired_refresh_partitions_are_dropped():
+    names = [
+        "refresh_tokens_p2025_12",
+        "refresh_tokens_p2026_01",
+        "refresh_tokens_p2026_02",
+        "refresh_tokens_default",
+        "refresh_tokens",
+    ]
+
+    # Январская партиция содержит токены до 2026-02-01 00:00 UTC - ее можно удалить только после этого момента
+    assert expired_refresh_token_partitions(names, datetime(2026, 1, 31, 23, tzinfo=timezone.utc)) == [
+        "refresh_tokens_p2025_12"
+    ]
+    assert expired_refresh_token_partitions(names, datetime(2026, 2, 1, tzinfo=timezone.utc)) == [
+        "refresh_tokens_p2025_12",
+        "refresh_tokens_p2026_01",
+    ]
+
+
+class _PartitionsResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class _PartitionsSession:
+    """Сессия для обслуживания партиций: отвечает на запросы janitor и пишет DDL, выполненный через connection."""
+
+    def __init__(self, partitions, ddl):
+        self.partitions = partitions
+        self.ddl = ddl
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        if stmt is REFRESH_PARTITIONS_SQL:
+            return _PartitionsResult(self.partitions)
+        if stmt is REFRESH_DEFAULT_HAS_ROWS_SQL:
+            return _PartitionsResult(False)
+        return _PartitionsResult(0)  # refresh_tokens_ensure_partitions
+
+    async def commit(self):
+        pass
+
+    async def connection(self, execution_options=None):
+        assert execution_options == {"isolation_level": "AUTOCOMMIT"}
+        return self
+
+    async def exec_driver_sql(self, sql):
+        self.ddl.append(sql)
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_are_detached_without_concurrently_and_dropped():
+    ddl = []
+    partitions = [
+        ("refresh_tokens_p2025_11", True),
+        ("refresh_tokens_p2025_12", False),
+        ("refresh_tokens_p2026_03", False),
+        ("refresh_tokens_default", False),
+    ]
+    janitor = TokenJanitor(_PartitionsSession(partitions, ddl), retention=timedelta(minutes=60), lock_timeout_ms=3000)
+
+    dropped = await janitor.maintain_refresh_token_partitions(datetime(2026, 2, 10, tzinfo=timezone.utc))
+
+    assert dropped == ["refresh_tokens_p2025_11", "refresh_tokens_p2025_12"]
+    # С DEFAULT-партицией DETACH CONCURRENTLY невозможен; зависший DETACH прошлых версий завершается FINALIZE
+    assert ddl == [
+        "SET lock_timeout = 3000",
+        'ALTER TABLE refresh_tokens DETACH PARTITION "refresh_tokens_p2025_11" FINALIZE',
+        'DROP TABLE "refresh_tokens_p2025_11"',
+        "RESET lock_timeout",
+        "SET lock_timeout = 3000",
+        'ALTER TABLE refresh_tokens DETACH PARTITION "refresh_tokens_p2025_12"',
+        'DROP TABLE "refresh_tokens_p2025_12"',
+        "RESET lock_timeout",
+    ]
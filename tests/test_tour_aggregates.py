@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository
+from tests.utils import compile_sql, reference_data
+
+
+def test_aggregates_group_by_month_bucket():
+    repo = SqlAlchemyTourRepository(session=None, reference=reference_data(1))
+
+    sql = compile_sql(repo.aggregates_statement(
+        datetime(2026, 1, 1), datetime(2026, 12, 31), None, "comfort", None, granularity="month",
+    ))
+
+    # Выражение должно совпадать с индексом ix_tour_price_calendar_daily_month
+    bucket = "date_trunc('month', CAST(tour_price_calendar_daily.day AS TIMESTAMP WITHOUT TIME ZONE))"
+    assert f"GROUP BY {bucket}" in sql
+    assert "tour_price_calendar_daily.tarif_id = 2" in sql
+
+
+def test_aggregates_unknown_filter_value_short_circuits():
+    repo = SqlAlchemyTourRepository(session=None, reference=reference_data(1))
+
+    assert repo.aggregates_statement(datetime(2026, 1, 1), datetime(2026, 2, 1), None, "vip", None) is None
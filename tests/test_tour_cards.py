@@ -0,0 +1,59 @@
+from uuid import UUID
+
+from src.infrastructure.db.reference_data import ReferenceData
+from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository, _card_to_read_model
+from tests.utils import compile_sql, reference_catalog, reference_data
+
+FLIGHT_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+
+def test_cards_are_built_in_one_statement():
+    repo = SqlAlchemyTourRepository(session=None, reference=reference_data(1))
+
+    sql = compile_sql(repo.cards_statement([FLIGHT_ID]))
+
+    # Карточка целиком собирается в Postgres: вложенные списки - коррелированные подзапросы
+    assert sql.startswith("SELECT jsonb_build_object(")
+    assert "FROM flights JOIN tours ON tours.id = flights.tour_id" in sql
+    assert "ORDER BY flight_directions.id" in sql
+    assert "ORDER BY flight_layovers.id" in sql
+    assert "ORDER BY hotels.id" in sql
+    assert "WHERE flights.id IN ('00000000-0000-0000-0000-000000000001')" in sql
+
+
+def test_card_to_read_model_resolves_reference_ids():
+    reference = ReferenceData(
+        version=1,
+        tour_types=reference_catalog((3, "beach", "Пляжный")),
+        tarifs=reference_catalog((2, "comfort", "Комфорт")),
+        availability=reference_catalog((5, "few_left", "Мало мест")),
+        currencies=reference_catalog(),
+        departure_cities=reference_catalog(),
+    )
+    card = {
+        "id": str(FLIGHT_ID),
+        "operator_name": "Оператор",
+        "operator_logo": "logo.png",
+        "operator_foundation_year": 2001,
+        "operator_verified": True,
+        "operator_features": ["24/7"],
+        "title": "Тур",
+        "type_id": 3,
+        "tarif_id": 2,
+        "price": 100000,
+        "original_price": None,
+        "duration": 7,
+        "location": "Анталья",
+        "visa_included": False,
+        "availability_status_id": 5,
+        "flights": [{"id": 1, "direction": "outbound", "nodes": []}],
+        "hotels": [],
+    }
+
+    model = _card_to_read_model(card, reference)
+
+    assert model.id == FLIGHT_ID
+    assert (model.type, model.tarif, model.availability) == ("beach", "comfort", "few_left")
+    assert model.flights == [{"id": 1, "direction": "outbound", "nodes": []}]
+    # Исходная строка результата не изменяется
+    assert card["id"] == str(FLIGHT_ID)
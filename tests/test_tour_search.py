@@ -0,0 +1,87 @@
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+from src.core.tours.read_models.tour_search_page_read_model import TourSearchCursor
+from src.infrastructure.db.repositories.tour_repo import SqlAlchemyTourRepository
+from tests.utils import compile_sql, reference_data
+
+
+def _search_sql(**overrides) -> str:
+    params = dict(
+        tour_type=None,
+        tarif=None,
+        operator_id=None,
+        departure_city=None,
+        departure_date_mode="single",
+        departure_date=None,
+        departure_date_start=None,
+        departure_date_end=None,
+    )
+    params.update(overrides)
+    repo = SqlAlchemyTourRepository(session=None, reference=reference_data(1))
+    return compile_sql(repo.search_statement(**params))
+
+
+def test_search_reads_only_projection():
+    sql = _search_sql(tour_type="beach", tarif="comfort", departure_city="Москва")
+
+    assert "FROM tour_search_projection" in sql
+    assert "JOIN" not in sql
+    assert "FROM tours" not in sql
+    assert "FROM flights" not in sql
+
+
+def test_search_drafts_are_excluded_by_projection_rebuild():
+    # Поиск не смотрит на tours.is_published: черновики не попадают в проекцию при пересборке
+    path = Path(__file__).parents[1] / "migrations" / "versions" / "c71e0a9d2f34_tour_search_projection.py"
+    spec = importlib.util.spec_from_file_location("tour_search_projection_migration", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    assert "is_published" not in _search_sql()
+    assert "WHERE t.is_published" in migration.REFRESH_FUNCTION_SQL
+
+
+def test_cards_exclude_drafts():
+    repo = SqlAlchemyTourRepository(session=None, reference=reference_data(1))
+
+    sql = compile_sql(repo.cards_statement([UUID("00000000-0000-0000-0000-000000000001")]))
+
+    assert "WHERE flights.id IN ('00000000-0000-0000-0000-000000000001') AND tours.is_published" in sql
+
+
+def test_search_excludes_sold_out():
+    sql = _search_sql()
+
+    assert "tour_search_projection.availability_value != 'sold_out'" in sql
+
+
+def test_search_orders_by_departure_date_and_flight_id():
+    sql = _search_sql()
+
+    assert "ORDER BY tour_search_projection.departure_date, tour_search_projection.flight_id" in sql
+    assert "OFFSET 0" in sql
+
+
+def test_search_single_day_uses_day_bounds():
+    sql = _search_sql(departure_date=datetime(2026, 3, 1, 15, 45))
+
+    assert "tour_search_projection.departure_date >= '2026-03-01 00:00:00'" in sql
+    assert "tour_search_projection.departure_date < '2026-03-02 00:00:00'" in sql
+
+
+def test_search_cursor_continues_after_sort_key():
+    cursor = TourSearchCursor(
+        departure_date=datetime(2026, 3, 1, 9, 30),
+        flight_id=UUID("00000000-0000-0000-0000-000000000001"),
+    )
+
+    sql = _search_sql(cursor=cursor)
+
+    assert (
+        "(tour_search_projection.departure_date, tour_search_projection.flight_id) > "
+        "('2026-03-01 09:30:00', '00000000-0000-0000-0000-000000000001')"
+    ) in sql
+    assert "OFFSET" not in sql
@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.core.auth.use_cases.magic_verify import MagicVerifyUseCase
+from src.core.user.entities.user import User
+from src.core.user.snapshot_cache import UserSnapshotCache
+from src.core.user.use_cases.merge_favorites import MergeFavoritesUseCase
+from src.core.user.use_cases.update_me import UpdateMeUseCase
+from src.infrastructure.cache.lru_cache import InMemoryCacheBackend, LRUCache
+
+
+class _Session:
+    """Запоминает, был ли снимок в кэше в момент фиксации."""
+
+    def __init__(self, cache: UserSnapshotCache, user_id):
+        self.cache = cache
+        self.user_id = user_id
+        self.cached_at_commit = None
+
+    async def commit(self):
+        self.cached_at_commit = await self.cache.get(self.user_id)
+
+    async def rollback(self):
+        pass
+
+
+class _Repo:
+    def __init__(self, session: _Session):
+        self.session = session
+
+    async def merge_favorite_tours(self, tour_ids, user_id):
+        return True
+
+    async def update(self, user):
+        return user
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_copied_on_set_and_get():
+    cache = UserSnapshotCache(InMemoryCacheBackend(LRUCache(max_size=16)))
+    user = User(id=uuid4(), email="a@example.com")
+
+    await cache.set(user)
+    user.email = "changed@example.com"
+    user.favorite_tour_ids.append(uuid4())
+
+    cached = await cache.get(user.id)
+    assert cached.email == "a@example.com"
+    assert cached.favorite_tour_ids == []
+
+    cached.comparison_tour_ids.append(uuid4())
+    assert (await cache.get(user.id)).comparison_tour_ids == []
+
+
+@pytest.mark.asyncio
+async def test_write_use_case_invalidates_snapshot():
+    backend = InMemoryCacheBackend(LRUCache(max_size=16))
+    cache = UserSnapshotCache(backend)
+    user = User(id=uuid4())
+    await cache.set(user)
+
+    session = _Session(cache, user.id)
+
+    assert await MergeFavoritesUseCase(_Repo(session), cache).execute([uuid4()], user.id)
+    # До фиксации снимок не трогаем: иначе параллельное чтение закэширует старое состояние
+    assert session.cached_at_commit is not None
+    assert await cache.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_update_me_invalidates_snapshot_after_commit():
+    cache = UserSnapshotCache(InMemoryCacheBackend(LRUCache(max_size=16)))
+    user = User(id=uuid4(), name="Old")
+    await cache.set(user)
+    session = _Session(cache, user.id)
+
+    updated = await UpdateMeUseCase(_Repo(session), cache).execute(user, name="New")
+
+    assert updated.name == "New"
+    assert session.cached_at_commit is not None
+    assert await cache.get(user.id) is None
+
+
+class _Stub:
+    def __init__(self, **methods):
+        for name, result in methods.items():
+            setattr(self, name, self._returning(result))
+
+    @staticmethod
+    def _returning(result):
+        async def method(*args, **kwargs):
+            return result
+        return method
+
+
+@pytest.mark.asyncio
+async def test_magic_verify_invalidates_snapshot_after_verifying_email():
+    cache = UserSnapshotCache(InMemoryCacheBackend(LRUCache(max_size=16)))
+    user = User(id=uuid4(), email="a@example.com")
+    await cache.set(user)
+
+    use_case = MagicVerifyUseCase(
+        magic_repo=_Stub(consume_token=object()),
+        identity_repo=_Stub(get_by_provider_account=SimpleNamespace(user_id=user.id)),
+        user_repo=_Stub(get_by_id=user, update=user),
+        token_service=SimpleNamespace(issue_access_token=lambda user_id: "a", issue_refresh_token=lambda user_id: "r"),
+        refresh_token_repo=SimpleNamespace(
+            create_from_raw_token=_Stub._returning(None),
+            session=_Stub(commit=None, rollback=None),
+        ),
+        refresh_token_pepper="p",
+        refresh_ttl_days=30,
+        user_cache=cache,
+    )
+    await use_case.execute(email="a@example.com", token_hash="h")
+
+    assert await cache.get(user.id) is None
@@ -0,0 +1,24 @@
+from src.infrastructure.di.providers.db_provider import worker_pool_limits
+from start import worker_recycling_options
+
+
+def test_single_worker_keeps_configured_pool():
+    assert worker_pool_limits(pool_size=30, max_overflow=60, workers=1, max_connections=90) == (30, 60)
+    assert worker_pool_limits(pool_size=30, max_overflow=60, workers=4, max_connections=0) == (30, 60)
+
+
+def test_budget_is_split_between_workers_in_pool_to_overflow_ratio():
+    pool_size, max_overflow = worker_pool_limits(pool_size=30, max_overflow=60, workers=4, max_connections=90)
+    assert (pool_size, max_overflow) == (7, 15)
+    assert 4 * (pool_size + max_overflow) <= 90
+
+
+def test_every_worker_gets_at_least_one_connection():
+    assert worker_pool_limits(pool_size=30, max_overflow=60, workers=8, max_connections=4) == (1, 0)
+
+
+def test_worker_recycling_needs_a_supervisor():
+    # Один процесс uvicorn без супервизора после лимита просто завершится
+    assert worker_recycling_options(workers=1, max_requests=1000, max_requests_jitter=100) == {}
+    assert worker_recycling_options(workers=4, max_requests=0, max_requests_jitter=100) == {}
+    assert worker_recycling_options(workers=4, max_requests=1000, max_requests_jitter=100)["limit_max_requests"] == 1000
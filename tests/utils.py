@@ -1,5 +1,13 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Iterator
 from uuid import uuid4
 
+from sqlalchemy.dialects import postgresql
+
+from src.infrastructure.db.query_tracking import QueryStats, track_queries
+from src.infrastructure.db.reference_data import ReferenceCatalog, ReferenceData
+
 
 class TestDBHelper:
     """Вспомогательный класс для работы с тестовыми базами данных."""
@@ -8,3 +16,63 @@ class TestDBHelper:
     def create_test_db_name(postfix: str = "") -> str:
         """Создать уникальное имя для тестовой БД."""
         return f"{str(uuid4())[:6]}_{postfix}"
+
+
+class FakeClock:
+    """Управляемые часы для кэшей и ограничителей: время двигается только присвоением `now`."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSessionFactory:
+    """Заглушка async_sessionmaker: `async with factory() as session` без БД (сессия - сама фабрика)."""
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def compile_sql(stmt) -> str:
+    """SQL запроса для PostgreSQL с подставленными значениями - для проверок построения запросов."""
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def reference_catalog(*rows) -> ReferenceCatalog:
+    """Справочник из кортежей (id, value, label)."""
+    return ReferenceCatalog.from_rows(SimpleNamespace(id=i, value=v, label=lb) for i, v, lb in rows)
+
+
+def reference_data(version: int) -> ReferenceData:
+    """Снимок справочников для тестов без БД: тарифы заполнены, остальные пустые."""
+    empty = reference_catalog()
+    return ReferenceData(
+        version=version,
+        tour_types=empty,
+        tarifs=reference_catalog((2, "comfort", "Комфорт"), (1, "budget", "Эконом")),
+        availability=empty,
+        currencies=empty,
+        departure_cities=empty,
+    )
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Проверить, что код внутри блока (например, запрос к эндпоинту через httpx.ASGITransport)
+    выполнил не больше `max_queries` SQL-запросов. Движок должен быть подписан install_query_tracking
+    (DBProvider делает это сам). При превышении в сообщении - самые частые отпечатки запросов.
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        repeated = "\n".join(f"  {count}x {statement}" for statement, count in stats.most_repeated(5))
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{repeated}")